@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+"""Micro-benchmark of the JSON codec backends on real-sized payloads.
+
+Run: uv run python scripts/bench_codec.py [--repeat N]
+
+Payloads are synthetic but shaped and sized like real API responses:
+a multi-megabyte property rule tree, a network-list listing with elements
+and a client-list listing with items.
+"""
+
+import argparse
+import random
+import time
+
+from akamai_wrappy import codec
+
+
+def make_rule_tree(children: int = 4000, depth: int = 3) -> dict:
+    """Build a PAPI-style rule tree of a few megabytes."""
+    rng = random.Random(1)
+
+    def rule(name: str, level: int) -> dict:
+        return {
+            "name": name,
+            "comments": "Generated rule " * 3,
+            "criteria": [
+                {"name": "path", "options": {"matchOperator": "MATCHES_ONE_OF", "values": [f"/p{rng.randint(0, 9999)}/*"] * 4}},
+            ],
+            "behaviors": [
+                {"name": "caching", "options": {"behavior": "MAX_AGE", "ttl": f"{rng.randint(1, 30)}d", "mustRevalidate": False}},
+                {"name": "modifyOutgoingResponseHeader", "options": {"action": "ADD", "customHeaderName": "X-Test", "newHeaderValue": "é" * 8}},
+            ],
+            "children": [rule(f"{name}.{i}", level + 1) for i in range(4)] if level < depth else [],
+            "criteriaMustSatisfy": "all",
+        }
+
+    return {
+        "accountId": "act_1-ABCDE",
+        "propertyId": "prp_123456",
+        "propertyVersion": 42,
+        "etag": "a" * 40,
+        "ruleFormat": "v2024-01-09",
+        "rules": {
+            "name": "default",
+            "behaviors": [{"name": "origin", "options": {"hostname": "origin.example.com"}}],
+            "children": [rule(f"rule{i}", 1) for i in range(children // 20)],
+        },
+    }
+
+
+def make_network_lists(lists: int = 50, elements: int = 20000) -> dict:
+    """Build a network-list listing with elements."""
+    return {
+        "networkLists": [
+            {
+                "uniqueId": f"{i}_LIST",
+                "name": f"List {i}",
+                "type": "IP",
+                "syncPoint": i,
+                "elementCount": elements,
+                "list": [f"10.{i}.{j // 256 % 256}.{j % 256}/32" for j in range(elements)],
+            }
+            for i in range(lists)
+        ]
+    }
+
+
+def make_client_lists(lists: int = 20, items: int = 10000) -> dict:
+    """Build a client-list listing with items."""
+    return {
+        "content": [
+            {
+                "listId": f"{i}_CL",
+                "name": f"Client list {i}",
+                "type": "IP",
+                "version": 3,
+                "items": [
+                    {"value": f"192.0.{j // 256 % 256}.{j % 256}", "description": "bulk", "tags": ["a", "b"], "expirationDate": None}
+                    for j in range(items)
+                ],
+            }
+            for i in range(lists)
+        ]
+    }
+
+
+def bench(func, repeat: int) -> float:
+    """Return the best wall time in milliseconds over repeats."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark JSON codec backends")
+    parser.add_argument("--repeat", type=int, default=5, help="Repeats per measurement (default: 5)")
+    options = parser.parse_args()
+
+    payloads = {
+        "rule tree": make_rule_tree(),
+        "network lists": make_network_lists(),
+        "client lists": make_client_lists(),
+    }
+    backends = codec.available_backends()
+    print(f"Backends: {', '.join(backends)} (default: {codec.backend()})\n")
+
+    header = f"{'payload':<15}{'size':>9}  {'backend':<8}{'loads ms':>10}{'dumps ms':>10}{'indent ms':>11}"
+    print(header)
+    print("-" * len(header))
+
+    original = codec.backend()
+    for name, payload in payloads.items():
+        codec.set_backend("stdlib")
+        raw = codec.dumps(payload)
+        for backend in backends:
+            codec.set_backend(backend)
+            loads_ms = bench(lambda: codec.loads(raw), options.repeat)
+            dumps_ms = bench(lambda: codec.dumps(payload), options.repeat)
+            indent_ms = bench(lambda: codec.dumps(payload, indent=True), options.repeat)
+            size = f"{len(raw) / 1e6:.1f}MB"
+            print(f"{name:<15}{size:>9}  {backend:<8}{loads_ms:>10.1f}{dumps_ms:>10.1f}{indent_ms:>11.1f}")
+    codec.set_backend(original)
+
+
+if __name__ == "__main__":
+    main()
@@ -24,12 +24,23 @@ $AWP --help > /dev/null && echo "✓ awp --help"
 $AWP search-asw --help > /dev/null && echo "✓ awp search-asw --help"
 $AWP search-group --help > /dev/null && echo "✓ awp search-group --help"
 $AWP list-properties --help > /dev/null && echo "✓ awp list-properties --help"
+$AWP find-property --help > /dev/null && echo "✓ awp find-property --help"
+$AWP search-rules --help > /dev/null && echo "✓ awp search-rules --help"
 $AWP download-property --help > /dev/null && echo "✓ awp download-property --help"
 $AWP download-properties --help > /dev/null && echo "✓ awp download-properties --help"
+$AWP download-property-history --help > /dev/null && echo "✓ awp download-property-history --help"
+$AWP queue-properties --help > /dev/null && echo "✓ awp queue-properties --help"
+$AWP worker --help > /dev/null && echo "✓ awp worker --help"
+$AWP patch-properties --help > /dev/null && echo "✓ awp patch-properties --help"
 $AWP list-networklists --help > /dev/null && echo "✓ awp list-networklists --help"
 $AWP download-networklists --help > /dev/null && echo "✓ awp download-networklists --help"
+$AWP sync-networklists --help > /dev/null && echo "✓ awp sync-networklists --help"
+$AWP activate-networklists --help > /dev/null && echo "✓ awp activate-networklists --help"
+$AWP compact-networklist --help > /dev/null && echo "✓ awp compact-networklist --help"
 $AWP list-clientlists --help > /dev/null && echo "✓ awp list-clientlists --help"
 $AWP download-clientlists --help > /dev/null && echo "✓ awp download-clientlists --help"
+$AWP sync-clientlists --help > /dev/null && echo "✓ awp sync-clientlists --help"
+$AWP activate-clientlists --help > /dev/null && echo "✓ awp activate-clientlists --help"
 
 echo ""
 echo "--- Testing Python import ---"
@@ -1,6 +1,7 @@
 """Shared Akamai utilities for Python projects."""
 
 from akamai_wrappy.api import Akamai
+from akamai_wrappy.client import Client
 
 __version__ = "0.9.2"
-__all__ = ["Akamai"]
+__all__ = ["Akamai", "Client"]
@@ -0,0 +1,195 @@
+"""Cached, indexed directory of account switch keys."""
+
+import re
+import sys
+from typing import Any, Dict, List, Optional, Set
+
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.cache import JsonCache
+
+DEFAULT_DIRECTORY_TTL = 24 * 3600  # seconds
+
+# Account switch keys look like 1-ABCDE, 1-ABCDE:1-12345 or F-AC-1234:1-2RBL
+_ACCOUNT_SWITCH_KEY = re.compile(r"^[A-Z0-9]+(?:-[A-Z0-9]+)+(?::[A-Z0-9]+(?:-[A-Z0-9]+)*)?$")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+# Minimum similarity for a fuzzy match to be returned or auto-resolved
+MIN_SEARCH_SCORE = 0.3
+MIN_RESOLVE_SCORE = 0.8
+MIN_RESOLVE_MARGIN = 0.15
+
+
+class AccountLookupError(LookupError):
+    """Raised when an account name does not resolve to exactly one key."""
+
+
+def looks_like_account_switch_key(value: str) -> bool:
+    """Return True if a value has the format of an account switch key."""
+    return bool(_ACCOUNT_SWITCH_KEY.match(value.strip()))
+
+
+def _normalize(text: str) -> str:
+    """Lowercase and collapse non-alphanumerics to single spaces."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Return the set of character trigrams of normalized text.
+
+    Each token is padded with spaces so short tokens and word boundaries
+    still produce trigrams.
+    """
+    grams: Set[str] = set()
+    for token in _normalize(text).split():
+        padded = f"  {token} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def build_index(entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the trigram index for a list of account switch keys.
+
+    Args:
+        entries: Entries with accountSwitchKey and accountName
+
+    Returns:
+        Index dict with trigram postings and per-entry trigram counts
+    """
+    postings: Dict[str, List[int]] = {}
+    sizes = []
+    for i, entry in enumerate(entries):
+        grams = trigrams(entry.get("accountName", ""))
+        sizes.append(len(grams))
+        for gram in grams:
+            postings.setdefault(gram, []).append(i)
+    return {"postings": postings, "sizes": sizes}
+
+
+class AccountDirectory:
+    """Local directory of all account switch keys available to the credentials.
+
+    The full key list is fetched once and cached on disk together with a
+    prebuilt trigram index, so searches and name resolution run locally
+    and make no API calls until the cache expires.
+    """
+
+    def __init__(self, akm_api: Akamai, ttl: float = DEFAULT_DIRECTORY_TTL):
+        """Initialize directory.
+
+        Args:
+            akm_api: Akamai API client (without an account switch key)
+            ttl: Cache lifetime in seconds
+        """
+        self.akm_api = akm_api
+        self.cache = JsonCache("account-switch-keys", ttl)
+        self.cache_key = akm_api.base_url
+        self._data: Optional[Dict[str, Any]] = None
+
+    def load(self, refresh: bool = False) -> Dict[str, Any]:
+        """Return the cached directory, fetching it if missing or expired.
+
+        Args:
+            refresh: Force a fetch from the API
+
+        Returns:
+            Dict with "entries" and "index"
+        """
+        if self._data is not None and not refresh:
+            return self._data
+
+        data = None if refresh else self.cache.get(self.cache_key)
+        if data is None:
+            print("Refreshing account switch key directory...", file=sys.stderr)
+            result = self.akm_api.get("/identity-management/v3/api-clients/self/account-switch-keys")
+            if isinstance(result, (dict, str)):
+                raise AccountLookupError(f"Unable to fetch account switch keys: {result}")
+            entries = sorted(result, key=lambda e: e.get("accountName", "").lower())
+            data = {"entries": entries, "index": build_index(entries)}
+            self.cache.set(self.cache_key, data)
+
+        self._data = data
+        return data
+
+    def search(self, query: str, limit: int = 50, refresh: bool = False) -> List[Dict[str, Any]]:
+        """Fuzzy search account names (and keys) in the local directory.
+
+        Scores are the Dice coefficient of name trigrams, with exact and
+        substring matches ranked first.
+
+        Args:
+            query: Account name (partial, misspelled) or key fragment
+            limit: Maximum number of results
+            refresh: Force a directory refresh first
+
+        Returns:
+            Matching entries, best first, each with a "score" key
+        """
+        data = self.load(refresh)
+        entries = data["entries"]
+        postings = data["index"]["postings"]
+        sizes = data["index"]["sizes"]
+
+        query_norm = _normalize(query)
+        query_grams = trigrams(query)
+
+        shared: Dict[int, int] = {}
+        for gram in query_grams:
+            for i in postings.get(gram, ()):
+                shared[i] = shared.get(i, 0) + 1
+
+        scores: Dict[int, float] = {}
+        for i, count in shared.items():
+            scores[i] = 2 * count / (len(query_grams) + sizes[i])
+
+        # Exact and substring matches (names or keys) always rank first
+        query_upper = query.strip().upper()
+        for i, entry in enumerate(entries):
+            name_norm = _normalize(entry.get("accountName", ""))
+            if query_norm and name_norm == query_norm:
+                scores[i] = 3.0
+            elif query_norm and query_norm in name_norm:
+                scores[i] = max(scores.get(i, 0.0), 1.0 + len(query_norm) / max(len(name_norm), 1))
+            elif query_upper and query_upper in entry.get("accountSwitchKey", ""):
+                scores[i] = max(scores.get(i, 0.0), 2.0)
+
+        ranked = sorted(
+            (i for i, score in scores.items() if score >= MIN_SEARCH_SCORE),
+            key=lambda i: (-scores[i], entries[i].get("accountName", "").lower()),
+        )
+        return [{**entries[i], "score": round(scores[i], 3)} for i in ranked[:limit]]
+
+    def resolve(self, name_or_key: str) -> str:
+        """Resolve an account name (or key) to a single account switch key.
+
+        Args:
+            name_or_key: Account switch key or account name
+
+        Returns:
+            Account switch key
+
+        Raises:
+            AccountLookupError: If no single account matches confidently
+        """
+        if looks_like_account_switch_key(name_or_key):
+            return name_or_key.strip()
+
+        matches = self.search(name_or_key, limit=10)
+        if not matches:
+            raise AccountLookupError(f"No account matches '{name_or_key}'")
+
+        exact = [m for m in matches if m["score"] >= 3.0]
+        if len(exact) == 1:
+            return exact[0]["accountSwitchKey"]
+
+        if not exact:
+            best = matches[0]
+            runner_up = matches[1]["score"] if len(matches) > 1 else 0.0
+            if best["score"] >= MIN_RESOLVE_SCORE and best["score"] - runner_up >= MIN_RESOLVE_MARGIN:
+                return best["accountSwitchKey"]
+
+        candidates = "\n".join(
+            f"  {m['accountSwitchKey']}  {m.get('accountName', '')}" for m in (exact or matches)[:10]
+        )
+        raise AccountLookupError(
+            f"'{name_or_key}' matches several accounts, use -k with a key:\n{candidates}"
+        )
@@ -0,0 +1,177 @@
+"""Concurrent activation submission and multiplexed status polling."""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+ACTIVATION_NETWORKS = ("staging", "production")
+
+# Statuses after which an activation no longer needs polling
+TERMINAL_STATUSES = {"ACTIVE", "FAILED", "INACTIVE", "DEACTIVATED", "ERROR"}
+
+
+@dataclass
+class Activation:
+    """State of one list activation."""
+
+    list_id: str
+    name: str
+    activation_id: Optional[Any] = None
+    status: str = "NOT_SUBMITTED"
+    error: Optional[str] = None
+
+    @property
+    def done(self) -> bool:
+        """Return True if the activation reached a terminal state."""
+        return self.error is not None or self.status in TERMINAL_STATUSES
+
+
+class AdaptiveBackoff:
+    """Polling interval that grows while nothing changes.
+
+    The interval starts at ``initial``, is multiplied by ``factor`` after
+    every quiet round up to ``maximum``, and drops back to ``initial`` when
+    a change is observed.
+    """
+
+    def __init__(self, initial: float = 5.0, maximum: float = 60.0, factor: float = 1.5):
+        """Initialize backoff.
+
+        Args:
+            initial: First polling interval in seconds
+            maximum: Upper bound for the interval in seconds
+            factor: Growth factor applied after a round without changes
+        """
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.interval = initial
+
+    def next(self, changed: bool) -> float:
+        """Return the next interval given whether the last round saw changes."""
+        if changed:
+            self.interval = self.initial
+        else:
+            self.interval = min(self.interval * self.factor, self.maximum)
+        return self.interval
+
+
+def print_status_change(activation: Activation, old_status: str) -> None:
+    """Default status-change callback printing one line to stderr."""
+    stamp = time.strftime("%H:%M:%S")
+    if activation.error:
+        print(f"[{stamp}] ✗ {activation.name}: {activation.error}", file=sys.stderr)
+    else:
+        print(
+            f"[{stamp}] {activation.name}: {old_status} -> {activation.status}",
+            file=sys.stderr,
+        )
+
+
+def submit_activations(
+    activations: Iterable[Activation],
+    submit: Callable[[Activation], Dict[str, Any]],
+    max_workers: int = 8,
+    on_change: Callable[[Activation, str], None] = print_status_change,
+) -> List[Activation]:
+    """Submit activations concurrently.
+
+    Args:
+        activations: Activations to submit
+        submit: Function making the activation request; returns the API response
+        max_workers: Maximum concurrent submissions
+        on_change: Callback invoked with (activation, old_status) on each change
+
+    Returns:
+        The submitted activations
+    """
+    activations = list(activations)
+
+    def _submit(activation: Activation) -> None:
+        old_status = activation.status
+        try:
+            response = submit(activation)
+        except Exception as e:
+            activation.error = str(e)
+        else:
+            if isinstance(response, dict) and "error" in response:
+                activation.error = str(response)
+            else:
+                activation.activation_id = response.get("activationId")
+                activation.status = response.get("activationStatus", "PENDING_ACTIVATION")
+        on_change(activation, old_status)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        list(executor.map(_submit, activations))
+
+    return activations
+
+
+def track_activations(
+    activations: List[Activation],
+    poll: Callable[[Activation], Dict[str, Any]],
+    backoff: Optional[AdaptiveBackoff] = None,
+    max_wait: float = 3600,
+    on_change: Callable[[Activation, str], None] = print_status_change,
+) -> bool:
+    """Poll all pending activations from a single loop until they finish.
+
+    Every round polls each pending activation once; the wait between
+    rounds adapts to how often statuses change.
+
+    Args:
+        activations: Submitted activations
+        poll: Function returning the current activation status response
+        backoff: Polling interval policy (default: AdaptiveBackoff())
+        max_wait: Give up after this many seconds
+        on_change: Callback invoked with (activation, old_status) on each change
+
+    Returns:
+        True if every activation reached a terminal state in time
+    """
+    backoff = backoff or AdaptiveBackoff()
+    deadline = time.monotonic() + max_wait
+    interval = backoff.initial
+
+    while True:
+        pending = [a for a in activations if not a.done]
+        if not pending:
+            return True
+        if time.monotonic() + interval > deadline:
+            print(
+                f"Gave up waiting for {len(pending)} activations after {max_wait:.0f}s",
+                file=sys.stderr,
+            )
+            return False
+
+        time.sleep(interval)
+
+        changed = False
+        for activation in pending:
+            old_status = activation.status
+            response = poll(activation)
+            if isinstance(response, dict) and "error" in response:
+                # Transient poll errors are retried on the next round
+                continue
+            status = response.get("activationStatus") or response.get("status")
+            if status and status != old_status:
+                activation.status = status
+                changed = True
+                on_change(activation, old_status)
+
+        interval = backoff.next(changed)
+
+
+def summarize(activations: List[Activation]) -> List[Dict[str, Any]]:
+    """Return table rows describing each activation's final state."""
+    return [
+        {
+            "name": a.name,
+            "listId": a.list_id,
+            "activationId": a.activation_id or "",
+            "status": "SUBMIT_FAILED" if a.error and not a.activation_id else a.status,
+        }
+        for a in activations
+    ]
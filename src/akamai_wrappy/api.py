@@ -2,17 +2,91 @@
 
 import os
 import sys
+import threading
 import time
-from typing import Any, Dict, Optional
-from urllib.parse import urljoin
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
 
 import requests
 from akamai.edgegrid import EdgeGridAuth, EdgeRc
 
+from akamai_wrappy import codec
+from akamai_wrappy.compression import (
+    STREAM_CHUNK_SIZE,
+    CountingChunks,
+    accept_encoding,
+    gzip_body,
+    wire_bytes_received,
+)
+from akamai_wrappy.files import atomic_write
+from akamai_wrappy.metrics import RequestHook, RequestRecord, endpoint_template
+from akamai_wrappy.ratelimit import FamilyBudget, HostRateLimiter, RateLimitThrottle
+from akamai_wrappy.timeouts import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_ENDPOINT_TIMEOUTS,
+    Deadline,
+    HedgePolicy,
+    endpoint_timeout,
+)
+
 # Default retry settings for rate limiting (429)
 DEFAULT_MAX_RETRIES = 5
 DEFAULT_RETRY_BASE_DELAY = 20  # seconds
 
+# Threads shared by hedged GETs (two per request while a hedge is out)
+HEDGE_WORKERS = 32
+
+
+def _body_size(body: Any) -> int:
+    """Return the size in bytes of a prepared request body."""
+    if body is None:
+        return 0
+    if isinstance(body, str):
+        return len(body.encode("utf-8"))
+    try:
+        return len(body)
+    except TypeError:
+        return 0
+
+
+def _paths_related(a: str, b: str) -> bool:
+    """Return True if one API path equals or contains the other.
+
+    Paths are compared on segment boundaries, so a write to
+    ``/papi/v1/properties/prp_1/versions`` relates to
+    ``/papi/v1/properties/prp_1`` but not to ``/papi/v1/properties/prp_12``.
+    """
+    a = a.rstrip("/")
+    b = b.rstrip("/")
+    return a == b or a.startswith(b + "/") or b.startswith(a + "/")
+
+
+def _discard_response(future: Future) -> None:
+    """Close the response of a request that lost a hedge race."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+def _release_budget(budget: FamilyBudget, future: Future) -> None:
+    """Return the budget slot of a hedged copy once it has finished."""
+    if future.cancelled() or future.exception() is not None:
+        budget.release()
+    else:
+        response = future.result()
+        budget.release(response.status_code, response.headers)
+
+
+class _Flight:
+    """A GET in progress that concurrent identical GETs wait on."""
+
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
 
 class Akamai:
     """Base Akamai API client with EdgeGrid authentication."""
@@ -21,30 +95,124 @@ class Akamai:
         self,
         edgerc_path: str = "~/.edgerc",
         section: str = "default",
-        timeout: int = 30,
+        timeout: float = 30,
         account_switch_key: Optional[str] = None,
         max_retries: int = DEFAULT_MAX_RETRIES,
         retry_base_delay: int = DEFAULT_RETRY_BASE_DELAY,
+        hooks: Optional[List[RequestHook]] = None,
+        coalesce: bool = True,
+        memoize: bool = False,
+        memo_ttl: Optional[float] = None,
+        session: Optional[Any] = None,
+        base_url: Optional[str] = None,
+        throttle: bool = True,
+        host_limiter: Optional[HostRateLimiter] = None,
+        compression: bool = True,
+        compress_requests: Optional[int] = None,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        endpoint_timeouts: Optional[Dict[str, float]] = None,
+        deadline: Optional[float] = None,
+        hedge: Optional[HedgePolicy] = None,
     ):
         """Initialize Akamai API client.
 
+        Concurrent identical GETs are coalesced into one request whose
+        result is shared by all callers. With ``memoize=True`` successful
+        GET results are also kept for the life of the client (or
+        ``memo_ttl`` seconds) and dropped when a PUT/POST/PATCH/DELETE
+        touches the same resource or one of its parents or children.
+        Shared and memoized results are the same objects for every caller,
+        so treat them as read-only.
+
+        Requests are throttled per API family from the rate-limit headers
+        of earlier responses (see akamai_wrappy.ratelimit.FamilyBudget):
+        they are spaced out as the remaining quota runs low, and concurrent
+        requests are limited by an AIMD window, so bulk jobs slow down
+        before a 429 instead of stalling on one.
+
+        With a ``host_limiter``, every request also takes a token from a
+        bucket shared by all processes on the host for the same API host
+        and account switch key, and a 429 pauses all of them.
+
+        Responses are requested gzip (or brotli/zstd, when installed)
+        encoded and decoded as they stream in; request bodies of at least
+        ``compress_requests`` bytes are sent gzip-encoded. Each
+        RequestRecord carries both the decoded and the on-the-wire sizes.
+
+        Each request gets a (connect, read) timeout: ``connect_timeout``,
+        and a read timeout looked up in ``endpoint_timeouts`` (see
+        akamai_wrappy.timeouts) with ``timeout`` as the fallback. A
+        ``deadline`` bounds the life of the client: timeouts are capped at
+        the time left, and once it expires or cancel() is called, requests
+        raise DeadlineExceeded. With a ``hedge`` policy, a GET slower than
+        its endpoint's usual latency is sent again and the first response
+        wins.
+
+        A custom ``session`` (e.g. akamai_wrappy.transport.ReplaySession)
+        replaces the EdgeGrid session; with both ``session`` and
+        ``base_url`` given, no .edgerc file is read.
+
         Args:
             edgerc_path: Path to .edgerc file
             section: Section name in .edgerc
-            timeout: Request timeout in seconds
+            timeout: Read timeout in seconds for endpoints without their own
             account_switch_key: Optional account switch key
             max_retries: Max retries on 429 rate limit errors
             retry_base_delay: Base delay in seconds for retry backoff
+            hooks: Callables invoked with a RequestRecord after each request
+            coalesce: Share one in-flight request between identical concurrent GETs
+            memoize: Cache successful GET results in memory
+            memo_ttl: Lifetime of memoized results in seconds (default: unlimited)
+            session: Session-like object used for requests (default: EdgeGrid session)
+            base_url: API base URL (default: host from .edgerc)
+            throttle: Pace requests using rate-limit response headers
+            host_limiter: Optional host-wide limiter shared with other processes
+            compression: Negotiate compressed responses (False requests identity)
+            compress_requests: Gzip request bodies of at least this many bytes
+                (default: never; the endpoint must accept Content-Encoding: gzip)
+            connect_timeout: Connect timeout in seconds
+            endpoint_timeouts: Endpoint template glob -> read timeout in seconds
+                (default: akamai_wrappy.timeouts.DEFAULT_ENDPOINT_TIMEOUTS)
+            deadline: Overall time budget in seconds (default: unlimited)
+            hedge: Optional policy for hedging slow GETs
         """
         self.timeout = timeout
         self.account_switch_key = account_switch_key
         self.max_retries = max_retries
         self.retry_base_delay = retry_base_delay
+        self.request_hooks: List[RequestHook] = list(hooks or [])
+        self.coalesce = coalesce
+        self.memoize = memoize
+        self.memo_ttl = memo_ttl
+        self.throttle = RateLimitThrottle() if throttle else None
+        self.host_limiter = host_limiter
+        self.accept_encoding = accept_encoding(compression)
+        self.compress_requests = compress_requests
+        self.connect_timeout = connect_timeout
+        self.endpoint_timeouts = endpoint_timeouts
+        self.deadline = Deadline(deadline)
+        self.hedge = hedge
+        self._hedge_pool: Optional[ThreadPoolExecutor] = None
+
+        # Single-flight and memo state, keyed by (url, params, headers)
+        self._flights: Dict[Tuple, _Flight] = {}
+        self._memo: Dict[Tuple, Tuple[float, str, Any]] = {}
+        self._memo_generation = 0
+        self._state_lock = threading.Lock()
+
+        if session is not None and base_url is not None:
+            self.base_url = base_url
+            self.session = session
+            return
 
         # Load EdgeGrid credentials
         edgerc_path = os.path.expanduser(edgerc_path)
         edgerc = EdgeRc(edgerc_path)
-        self.base_url = f"https://{edgerc.get(section, 'host')}"
+        self.base_url = base_url or f"https://{edgerc.get(section, 'host')}"
+
+        if session is not None:
+            self.session = session
+            return
 
         # Create session with EdgeGrid auth
         self.session = requests.Session()
@@ -54,22 +222,140 @@ class Akamai:
     def FromOptions(cls, options):
         """Create Akamai client from argparse options.
 
+        The account switch key option may be an account name, which is
+        resolved through the cached account directory. ``--record`` wraps
+        the session in a cassette recorder and ``--replay`` answers all
+        requests from a cassette without credentials or network access.
+
         Args:
             options: argparse Namespace with edgerc, section, timeout attributes
 
         Returns:
             Akamai: Configured API client
+
+        Raises:
+            AccountLookupError: If an account name does not resolve to one key
         """
-        return cls(
+        collector = getattr(options, "metrics_collector", None)
+        replay = getattr(options, "replay", None)
+        record = getattr(options, "record", None)
+
+        session = None
+        base_url = None
+        if replay:
+            from akamai_wrappy.transport import REPLAY_BASE_URL, ReplaySession
+
+            session = ReplaySession(replay, latency_scale=getattr(options, "replay_latency", 1.0))
+            base_url = REPLAY_BASE_URL
+
+        client = cls(
             edgerc_path=getattr(options, "edgerc", "~/.edgerc"),
             section=getattr(options, "section", "default"),
             timeout=getattr(options, "timeout", 30),
-            account_switch_key=getattr(options, "accountSwitchKey", None),
+            hooks=[collector] if collector is not None else None,
+            session=session,
+            base_url=base_url,
+            throttle=not getattr(options, "no_throttle", False),
+            host_limiter=cls._host_limiter_from_options(options),
+            compression=not getattr(options, "no_compression", False),
+            compress_requests=getattr(options, "compress_requests", None),
+            connect_timeout=getattr(options, "connect_timeout", DEFAULT_CONNECT_TIMEOUT),
+            endpoint_timeouts=cls._endpoint_timeouts_from_options(options),
+            deadline=getattr(options, "deadline", None),
+            hedge=cls._hedge_from_options(options),
         )
 
+        if record and not replay:
+            from akamai_wrappy.transport import RecordingSession
+
+            client.session = RecordingSession(client.session, record)
+
+        # The CLI closes the clients its command opened
+        opened = getattr(options, "open_clients", None)
+        if opened is not None:
+            opened.append(client)
+
+        # Account names given to -k are resolved through the cached directory
+        account_switch_key = getattr(options, "accountSwitchKey", None)
+        if account_switch_key:
+            from akamai_wrappy.accounts import AccountDirectory
+
+            client.account_switch_key = AccountDirectory(client).resolve(account_switch_key)
+        return client
+
+    @staticmethod
+    def _host_limiter_from_options(options) -> Optional[HostRateLimiter]:
+        """Build the host-wide limiter requested by --host-limit, if any."""
+        rate = getattr(options, "host_limit", None)
+        if not rate:
+            return None
+        try:
+            return HostRateLimiter(rate)
+        except RuntimeError as e:
+            print(f"Warning: {e}; continuing without it", file=sys.stderr)
+            return None
+
+    @staticmethod
+    def _endpoint_timeouts_from_options(options) -> Optional[Dict[str, float]]:
+        """Put --endpoint-timeout overrides in front of the default table."""
+        overrides = getattr(options, "endpoint_timeout", None)
+        if not overrides:
+            return None
+        table = dict(overrides)
+        for pattern, seconds in DEFAULT_ENDPOINT_TIMEOUTS.items():
+            table.setdefault(pattern, seconds)
+        return table
+
+    @staticmethod
+    def _hedge_from_options(options) -> Optional[HedgePolicy]:
+        """Build the hedging policy requested by --hedge, if any."""
+        percentile = getattr(options, "hedge", None)
+        if percentile is None:
+            return None
+        return HedgePolicy(percentile=percentile / 100)
+
+    def cancel(self) -> None:
+        """Cancel the client's deadline: pending retries stop and new requests fail.
+
+        Safe to call from another thread or a signal handler.
+        """
+        self.deadline.cancel()
+
+    def close(self) -> None:
+        """Shut down the hedge threads without waiting for copies still running.
+
+        The client stays usable; a later hedged GET starts new threads.
+        """
+        with self._state_lock:
+            pool, self._hedge_pool = self._hedge_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def __enter__(self) -> "Akamai":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _request_timeout(self, endpoint: str) -> Tuple[float, float]:
+        """Return the (connect, read) timeout of a request, capped by the deadline.
+
+        Raises:
+            DeadlineExceeded: If the deadline passed or was cancelled
+        """
+        read = endpoint_timeout(endpoint, self.timeout, self.endpoint_timeouts)
+        return self.deadline.cap((self.connect_timeout, read))
+
+    def _host_limiter_key(self) -> str:
+        """Key shared by processes using the same credentials and account."""
+        return f"{self.base_url}|{self.account_switch_key or ''}"
+
     def _handle_response(self, response: requests.Response) -> Any:
         """Handle API response and extract JSON or error.
 
+        The body is decoded straight from bytes with the active codec
+        backend (see akamai_wrappy.codec).
+
         Args:
             response: requests Response object
 
@@ -78,7 +364,7 @@ class Akamai:
         """
         try:
             response.raise_for_status()
-            return response.json()
+            return codec.loads(response.content)
         except requests.exceptions.HTTPError as e:
             return {"error": str(e), "status_code": e.response.status_code}
         except requests.exceptions.RequestException as e:
@@ -90,6 +376,8 @@ class Akamai:
         self,
         method: str,
         url: str,
+        consume: Optional[Callable[[Iterator[bytes]], None]] = None,
+        body_size: Optional[int] = None,
         **kwargs,
     ) -> requests.Response:
         """Make request with retry on 429 rate limit errors.
@@ -97,6 +385,10 @@ class Akamai:
         Args:
             method: HTTP method (get, post, put, etc.)
             url: Request URL
+            consume: Called with the decoded body chunks of a successful
+                response instead of reading the body into memory (pass
+                ``stream=True`` along with it)
+            body_size: Size of the request body before compression
             **kwargs: Additional arguments for requests
 
         Returns:
@@ -104,44 +396,194 @@ class Akamai:
 
         Raises:
             requests.exceptions.HTTPError: If max retries exceeded
+            DeadlineExceeded: If the deadline passed or was cancelled
         """
         request_func = getattr(self.session, method)
+        path = urlparse(url).path
+        endpoint = endpoint_template(path)
+        budget = self.throttle.budget(path) if self.throttle is not None else None
+        # Only plain GETs are hedged: they are idempotent and their body is read up front
+        hedge = self.hedge if method == "get" and consume is None else None
+        latency = 0.0
+        sleep_time = 0.0
+        bytes_sent = 0
+        bytes_received = 0
+        wire_sent = 0
+        wire_received = 0
+        hedged = False
+        kwargs["headers"] = {"Accept-Encoding": self.accept_encoding, **(kwargs.get("headers") or {})}
+
+        def emit(attempt: int, status: Optional[int], error: Optional[str] = None) -> None:
+            self._emit(
+                RequestRecord(
+                    method=method,
+                    endpoint=endpoint,
+                    status=status,
+                    latency=latency,
+                    bytes_sent=bytes_sent,
+                    bytes_received=bytes_received,
+                    retries=attempt,
+                    sleep_time=sleep_time,
+                    error=error,
+                    wire_bytes_sent=wire_sent,
+                    wire_bytes_received=wire_received,
+                    hedged=hedged,
+                )
+            )
 
         for attempt in range(self.max_retries + 1):
-            response = request_func(url, **kwargs)
+            if self.host_limiter is not None:
+                sleep_time += self.host_limiter.acquire(self._host_limiter_key())
+            if budget is not None:
+                sleep_time += budget.acquire()
+            start = time.monotonic()
+            response = None
+            try:
+                kwargs["timeout"] = self._request_timeout(endpoint)
+                hedge_delay = hedge.delay(endpoint) if hedge is not None else None
+                if hedge_delay is not None:
+                    response, hedged_now = self._hedged_request(
+                        request_func, url, hedge_delay, kwargs, budget
+                    )
+                    hedged = hedged or hedged_now
+                else:
+                    response = request_func(url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                latency += time.monotonic() - start
+                emit(attempt, None, str(e))
+                raise
+            finally:
+                # Every acquired slot is returned, whatever the request raised
+                if budget is not None:
+                    if response is None:
+                        budget.release()
+                    else:
+                        budget.release(response.status_code, response.headers)
+            sent = _body_size(response.request.body if response.request else None)
+            wire_sent += sent
+            bytes_sent += body_size if body_size is not None else sent
+
+            final = response.status_code != 429 or attempt == self.max_retries
+            if not final:
+                delay = self._retry_delay(response, attempt)
+                remaining = self.deadline.remaining()
+                # Waiting would outlast the deadline: hand the 429 back now
+                final = remaining is not None and remaining < delay
+
+            error = None
+            if final and consume is not None and response.ok:
+                chunks = CountingChunks(response.iter_content(STREAM_CHUNK_SIZE))
+                try:
+                    consume(iter(chunks))
+                except (OSError, requests.exceptions.RequestException) as e:
+                    error = str(e)
+                    raise
+                finally:
+                    latency += time.monotonic() - start
+                    bytes_received += chunks.count
+                    wire_received += wire_bytes_received(response, chunks.count)
+                    if error is not None:
+                        emit(attempt, response.status_code, error)
+            else:
+                decoded = len(response.content)
+                latency += time.monotonic() - start
+                bytes_received += decoded
+                wire_received += wire_bytes_received(response, decoded)
 
-            if response.status_code != 429:
-                return response
+            if hedge is not None and response.status_code != 429:
+                hedge.observe(endpoint, time.monotonic() - start)
 
-            if attempt == self.max_retries:
-                # Max retries exceeded, return the 429 response
+            if final:
+                # Success, non-retryable error, or max retries exceeded
+                emit(attempt, response.status_code)
                 return response
 
-            # Calculate backoff delay with exponential increase
-            delay = self.retry_base_delay * (2 ** attempt)
-
-            # Check for Retry-After header
-            retry_after = response.headers.get("Retry-After")
-            if retry_after:
-                try:
-                    delay = max(delay, int(retry_after))
-                except ValueError:
-                    pass
+            if self.host_limiter is not None:
+                # Other processes sharing the account back off too
+                self.host_limiter.penalize(self._host_limiter_key(), delay)
 
             print(
                 f"Rate limited (429). Retrying in {delay}s (attempt {attempt + 1}/{self.max_retries})...",
                 file=sys.stderr,
             )
-            time.sleep(delay)
+            try:
+                self.deadline.sleep(delay)
+            except requests.exceptions.RequestException as e:
+                emit(attempt, response.status_code, str(e))
+                raise
+            sleep_time += delay
 
         return response
 
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """Return the backoff before retrying a 429 response."""
+        # Calculate backoff delay with exponential increase
+        delay = self.retry_base_delay * (2 ** attempt)
+
+        # Check for Retry-After header
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                delay = max(delay, int(retry_after))
+            except ValueError:
+                pass
+        return delay
+
+    def _hedged_request(
+        self,
+        request_func: Callable[..., requests.Response],
+        url: str,
+        delay: float,
+        kwargs: Dict[str, Any],
+        budget: Optional[FamilyBudget] = None,
+    ) -> Tuple[requests.Response, bool]:
+        """Send a GET, and a second copy if the first has not answered after ``delay``.
+
+        The first response to arrive wins (a failed copy defers to the
+        other one); the slower copy finishes in the background and its
+        response is closed. The second copy needs a slot of its own in the
+        family ``budget``: without a free one, no hedge is sent.
+
+        Returns:
+            Tuple of (response, whether a hedge was sent)
+        """
+        with self._state_lock:
+            if self._hedge_pool is None:
+                self._hedge_pool = ThreadPoolExecutor(HEDGE_WORKERS, thread_name_prefix="awp-hedge")
+            pool = self._hedge_pool
+
+        primary = pool.submit(request_func, url, **kwargs)
+        done, _ = wait([primary], timeout=delay)
+        if done or (budget is not None and not budget.try_acquire()):
+            return primary.result(), False
+        if not self.hedge.try_hedge():
+            if budget is not None:
+                budget.release()
+            return primary.result(), False
+
+        backup = pool.submit(request_func, url, **kwargs)
+        if budget is not None:
+            backup.add_done_callback(lambda future: _release_budget(budget, future))
+        done, _ = wait([primary, backup], return_when=FIRST_COMPLETED)
+        winner = primary if primary in done else backup
+        loser = backup if winner is primary else primary
+        if winner.exception() is not None:
+            winner, loser = loser, winner
+        loser.add_done_callback(_discard_response)
+        return winner.result(), True
+
+    def _emit(self, record: RequestRecord) -> None:
+        """Pass a request record to all registered hooks."""
+        for hook in self.request_hooks:
+            hook(record)
+
     def get(
         self,
         path: str,
         query: Optional[str] = None,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
+        stream: bool = False,
     ) -> Any:
         """Make GET request to Akamai API.
 
@@ -150,6 +592,9 @@ class Akamai:
             query: Optional query string
             params: Optional query parameters dict
             headers: Optional request headers
+            stream: Decode the body chunk by chunk as it arrives into the
+                buffer the parser reads (for large pulls such as rule trees
+                and lists with their elements)
 
         Returns:
             Parsed JSON response or error dict/string
@@ -171,10 +616,165 @@ class Akamai:
         if self.account_switch_key:
             query_params["accountSwitchKey"] = self.account_switch_key
 
+        if not (self.coalesce or self.memoize):
+            return self._get(url, query_params, headers, stream)
+
+        key = (
+            url,
+            tuple(sorted((k, str(v)) for k, v in query_params.items())),
+            tuple(sorted((headers or {}).items())),
+        )
+
+        with self._state_lock:
+            if self.memoize:
+                entry = self._memo.get(key)
+                if entry is not None:
+                    stored_at, _, result = entry
+                    if self.memo_ttl is None or time.monotonic() - stored_at <= self.memo_ttl:
+                        return result
+                    del self._memo[key]
+
+            flight = self._flights.get(key) if self.coalesce else None
+            if flight is not None:
+                leader = False
+            else:
+                flight = _Flight()
+                leader = True
+                if self.coalesce:
+                    self._flights[key] = flight
+            generation = self._memo_generation
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            result = self._get(url, query_params, headers, stream)
+            flight.result = result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._state_lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                # Skip memoizing if a write invalidated the memo meanwhile
+                if (
+                    self.memoize
+                    and flight.error is None
+                    and generation == self._memo_generation
+                    and not (isinstance(flight.result, dict) and "error" in flight.result)
+                ):
+                    self._memo[key] = (time.monotonic(), urlparse(url).path, flight.result)
+            flight.event.set()
+
+        return result
+
+    def _encode_body(
+        self, data: Any, headers: Optional[Dict[str, str]]
+    ) -> Tuple[Dict[str, Any], Optional[int]]:
+        """Return the requests arguments for a JSON body and its uncompressed size.
+
+        Bodies of at least ``compress_requests`` bytes are serialized with
+        the codec and sent gzip-encoded; others are passed as ``json=``.
+        """
+        if data is None or self.compress_requests is None:
+            return {"json": data, "headers": headers}, None
+        raw = codec.dumps(data)
+        if len(raw) < self.compress_requests:
+            return {"json": data, "headers": headers}, None
+        headers = {"Content-Type": "application/json", **(headers or {}), "Content-Encoding": "gzip"}
+        return {"data": gzip_body(raw), "headers": headers}, len(raw)
+
+    def _get(
+        self,
+        url: str,
+        query_params: Dict[str, Any],
+        headers: Optional[Dict[str, str]],
+        stream: bool = False,
+    ) -> Any:
+        """Perform a GET request without coalescing or memoization."""
+        if not stream:
+            response = self._request_with_retry("get", url, params=query_params, headers=headers)
+            return self._handle_response(response)
+
+        # One growing buffer instead of the chunk list plus joined copy of response.content
+        body = bytearray()
+
+        def consume(chunks: Iterator[bytes]) -> None:
+            for chunk in chunks:
+                body.extend(chunk)
+
         response = self._request_with_retry(
-            "get", url, params=query_params, headers=headers, timeout=self.timeout
+            "get", url, consume=consume, stream=True, params=query_params, headers=headers
         )
-        return self._handle_response(response)
+        if not response.ok:
+            return self._handle_response(response)
+        try:
+            return codec.loads(body)
+        except ValueError as e:
+            return {"error": f"JSON decode error: {e}"}
+
+    def download(
+        self,
+        path: str,
+        output_file: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Any:
+        """Stream a GET response body to a file without holding it in memory.
+
+        The body is decoded (gzip/brotli) chunk by chunk as it arrives and
+        written atomically, so the file is either complete or absent. GETs
+        made this way are neither coalesced nor memoized.
+
+        Args:
+            path: API path
+            output_file: Destination file path
+            params: Optional query parameters
+            headers: Optional request headers
+
+        Returns:
+            The output file path, or an error dict
+        """
+        url = urljoin(self.base_url, path)
+
+        query_params = params or {}
+        if self.account_switch_key:
+            query_params["accountSwitchKey"] = self.account_switch_key
+
+        try:
+            response = self._request_with_retry(
+                "get",
+                url,
+                consume=lambda chunks: atomic_write(output_file, chunks, fsync=False),
+                stream=True,
+                params=query_params,
+                headers=headers,
+            )
+        except requests.exceptions.RequestException as e:
+            return {"error": str(e)}
+        if not response.ok:
+            return self._handle_response(response)
+        return output_file
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop memoized GET results.
+
+        Args:
+            path: API path whose related entries (same resource, parents and
+                children) are dropped; None drops everything
+        """
+        with self._state_lock:
+            self._memo_generation += 1
+            if path is None:
+                self._memo.clear()
+                return
+            path = urlparse(urljoin(self.base_url, path)).path
+            for key in [k for k, entry in self._memo.items() if _paths_related(entry[1], path)]:
+                del self._memo[key]
 
     def put(
         self,
@@ -200,9 +800,12 @@ class Akamai:
         if self.account_switch_key:
             query_params["accountSwitchKey"] = self.account_switch_key
 
+        body, body_size = self._encode_body(data, headers)
         response = self._request_with_retry(
-            "put", url, json=data, params=query_params, headers=headers, timeout=self.timeout
+            "put", url, params=query_params, body_size=body_size, **body
         )
+        if self.memoize:
+            self.invalidate(path)
         return self._handle_response(response)
 
     def post(
@@ -229,15 +832,18 @@ class Akamai:
         if self.account_switch_key:
             query_params["accountSwitchKey"] = self.account_switch_key
 
+        body, body_size = self._encode_body(data, headers)
         response = self._request_with_retry(
-            "post", url, json=data, params=query_params, headers=headers, timeout=self.timeout
+            "post", url, params=query_params, body_size=body_size, **body
         )
+        if self.memoize:
+            self.invalidate(path)
         return self._handle_response(response)
 
     def patch(
         self,
         path: str,
-        data: Optional[Dict[str, Any]] = None,
+        data: Optional[Any] = None,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
     ) -> Any:
@@ -245,7 +851,7 @@ class Akamai:
 
         Args:
             path: API path
-            data: Request body data
+            data: Request body data (a dict, or a list such as a JSON Patch)
             params: Optional query parameters
             headers: Optional request headers
 
@@ -258,9 +864,12 @@ class Akamai:
         if self.account_switch_key:
             query_params["accountSwitchKey"] = self.account_switch_key
 
+        body, body_size = self._encode_body(data, headers)
         response = self._request_with_retry(
-            "patch", url, json=data, params=query_params, headers=headers, timeout=self.timeout
+            "patch", url, params=query_params, body_size=body_size, **body
         )
+        if self.memoize:
+            self.invalidate(path)
         return self._handle_response(response)
 
     def delete(
@@ -285,7 +894,7 @@ class Akamai:
         if self.account_switch_key:
             query_params["accountSwitchKey"] = self.account_switch_key
 
-        response = self._request_with_retry(
-            "delete", url, params=query_params, headers=headers, timeout=self.timeout
-        )
+        response = self._request_with_retry("delete", url, params=query_params, headers=headers)
+        if self.memoize:
+            self.invalidate(path)
         return self._handle_response(response)
@@ -0,0 +1,88 @@
+"""Small on-disk JSON cache with per-entry TTL."""
+
+import json
+import os
+import time
+from typing import Any, Dict, Optional
+
+from akamai_wrappy.files import atomic_write
+
+
+def cache_dir() -> str:
+    """Return the cache directory, creating it if needed.
+
+    Uses ``$AWP_CACHE_DIR`` if set, otherwise ``$XDG_CACHE_HOME/akamai-wrappy``
+    (default ``~/.cache/akamai-wrappy``).
+    """
+    path = os.environ.get("AWP_CACHE_DIR") or os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+        "akamai-wrappy",
+    )
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def client_scope(akm_api: Any) -> str:
+    """Return a cache scope identifying the credentials and account in use.
+
+    Args:
+        akm_api: Akamai API client
+
+    Returns:
+        Scope string built from the API host and account switch key
+    """
+    return f"{akm_api.base_url}|{akm_api.account_switch_key or ''}"
+
+
+class JsonCache:
+    """Key/value cache persisted as one JSON file in the cache directory."""
+
+    def __init__(self, name: str, ttl: float, directory: Optional[str] = None):
+        """Initialize cache.
+
+        Args:
+            name: Cache file name (without extension)
+            ttl: Entry lifetime in seconds
+            directory: Cache directory (default: cache_dir())
+        """
+        self.path = os.path.join(directory or cache_dir(), f"{name}.json")
+        self.ttl = ttl
+        self._entries: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        """Load entries from disk on first use."""
+        if self._entries is None:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._load().get(key)
+        if entry is None or time.time() - entry.get("time", 0) > self.ttl:
+            return None
+        return entry.get("value")
+
+    def age(self, key: str) -> Optional[float]:
+        """Return the age in seconds of a cached entry, or None if missing."""
+        entry = self._load().get(key)
+        return time.time() - entry.get("time", 0) if entry else None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value and persist the cache atomically."""
+        entries = self._load()
+        now = time.time()
+        # Drop expired entries so the file does not grow without bound
+        for stale in [k for k, e in entries.items() if now - e.get("time", 0) > self.ttl]:
+            del entries[stale]
+        entries[key] = {"time": now, "value": value}
+        atomic_write(self.path, json.dumps(entries), fsync=False)
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        entries = self._load()
+        if entries.pop(key, None) is not None:
+            atomic_write(self.path, json.dumps(entries), fsync=False)
@@ -0,0 +1,145 @@
+"""CIDR aggregation for network list elements.
+
+Elements (single addresses or CIDR blocks, IPv4 or IPv6) are parsed to
+integer ``(start, end)`` ranges, sorted, merged where they overlap or are
+adjacent, and each merged range is split back into the minimal set of
+aligned prefixes. Sorting dominates, so compaction is O(n log n) and works
+on plain integers, which keeps millions of entries practical.
+"""
+
+import socket
+from typing import Iterable, List, Optional, Tuple
+
+_FAMILIES = {4: (socket.AF_INET, 32, 4), 6: (socket.AF_INET6, 128, 16)}
+
+Range = Tuple[int, int]
+
+
+def parse_element(value: str) -> Optional[Tuple[int, int, int]]:
+    """Parse an address or CIDR block to ``(version, start, end)``.
+
+    Host bits of a CIDR block are ignored (``10.0.0.7/24`` covers
+    ``10.0.0.0/24``).
+
+    Args:
+        value: Element such as ``192.0.2.1``, ``192.0.2.0/24`` or ``2001:db8::/32``
+
+    Returns:
+        Tuple of IP version and inclusive integer range, or None if invalid
+    """
+    address, _, prefix = value.strip().partition("/")
+    version = 6 if ":" in address else 4
+    family, bits, _ = _FAMILIES[version]
+
+    try:
+        start = int.from_bytes(socket.inet_pton(family, address), "big")
+    except (OSError, ValueError):
+        return None
+
+    if prefix:
+        if not prefix.isdigit() or int(prefix) > bits:
+            return None
+        host_bits = bits - int(prefix)
+    else:
+        host_bits = 0
+
+    start = start >> host_bits << host_bits
+    return version, start, start + (1 << host_bits) - 1
+
+
+def merge_ranges(ranges: List[Range]) -> List[Range]:
+    """Merge overlapping and adjacent ranges (sorts the input in place)."""
+    ranges.sort()
+    merged: List[Range] = []
+    for start, end in ranges:
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def range_to_prefixes(start: int, end: int, bits: int) -> List[Tuple[int, int]]:
+    """Split an inclusive range into the minimal list of ``(network, prefixlen)``."""
+    prefixes = []
+    while start <= end:
+        # Largest block aligned at start (start == 0 is aligned to everything)
+        # that also fits in the remaining span
+        aligned = start & -start if start else 1 << bits
+        fits = 1 << ((end - start + 1).bit_length() - 1)
+        size = min(aligned, fits)
+        prefixes.append((start, bits - size.bit_length() + 1))
+        start += size
+    return prefixes
+
+
+def format_prefix(network: int, prefix_length: int, version: int) -> str:
+    """Format a prefix; host prefixes (/32, /128) are written as bare addresses."""
+    family, bits, width = _FAMILIES[version]
+    address = socket.inet_ntop(family, network.to_bytes(width, "big"))
+    return address if prefix_length == bits else f"{address}/{prefix_length}"
+
+
+class CompactionResult:
+    """Outcome of compacting a list of elements."""
+
+    __slots__ = ("input_count", "unique_count", "elements", "invalid")
+
+    def __init__(self, input_count: int, unique_count: int, elements: List[str], invalid: List[str]):
+        self.input_count = input_count
+        self.unique_count = unique_count
+        self.elements = elements
+        self.invalid = invalid
+
+    @property
+    def output_count(self) -> int:
+        """Number of elements after compaction."""
+        return len(self.elements)
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of input elements removed (0.0 - 1.0)."""
+        if not self.input_count:
+            return 0.0
+        return 1 - self.output_count / self.input_count
+
+
+def compact(elements: Iterable[str]) -> CompactionResult:
+    """Collapse elements into the minimal covering set of IPv4 and IPv6 prefixes.
+
+    Blank values are ignored. Values that are not addresses or CIDR blocks
+    are returned in ``invalid`` and left out of the compacted elements.
+
+    Args:
+        elements: Addresses and CIDR blocks
+
+    Returns:
+        CompactionResult with IPv4 prefixes first, then IPv6, each in address order
+    """
+    ranges = {4: [], 6: []}
+    invalid = []
+    input_count = 0
+
+    for value in elements:
+        value = value.strip()
+        if not value:
+            continue
+        input_count += 1
+        parsed = parse_element(value)
+        if parsed is None:
+            invalid.append(value)
+            continue
+        version, start, end = parsed
+        ranges[version].append((start, end))
+
+    unique_count = len(set(ranges[4])) + len(set(ranges[6]))
+
+    compacted = []
+    for version in (4, 6):
+        bits = _FAMILIES[version][1]
+        for start, end in merge_ranges(ranges[version]):
+            for network, prefix_length in range_to_prefixes(start, end, bits):
+                compacted.append(format_prefix(network, prefix_length, version))
+
+    return CompactionResult(input_count, unique_count, compacted, invalid)
@@ -7,20 +7,45 @@ from typing import Any, Dict, List
 
 from tabulate import tabulate
 
+from akamai_wrappy.accounts import DEFAULT_DIRECTORY_TTL, AccountDirectory, AccountLookupError
 from akamai_wrappy.api import Akamai
 from akamai_wrappy.cli.common import add_common_args, get_table_format
 
 
-def account_search(akm_api: Akamai, name: str) -> List[Dict[str, Any]]:
+def account_search(
+    akm_api: Akamai,
+    name: str,
+    use_cache: bool = True,
+    refresh: bool = False,
+    ttl: float = DEFAULT_DIRECTORY_TTL,
+) -> List[Dict[str, Any]]:
     """Search for account switch keys by name.
 
+    By default the search runs against the locally cached account
+    directory (fuzzy, typo-tolerant) and only calls the API when the cache
+    is missing or expired.
+
     Args:
         akm_api: Akamai API client
         name: Search term for account name
+        use_cache: Search the cached directory instead of the API
+        refresh: Refresh the cached directory before searching
+        ttl: Directory cache lifetime in seconds
 
     Returns:
         List of matching account switch keys
     """
+    if use_cache:
+        try:
+            matches = AccountDirectory(akm_api, ttl=ttl).search(name, refresh=refresh)
+        except AccountLookupError as e:
+            print(e)
+            return []
+        return [
+            {"accountSwitchKey": m.get("accountSwitchKey"), "accountName": m.get("accountName")}
+            for m in matches
+        ]
+
     result = akm_api.get(
         "/identity-management/v3/api-clients/self/account-switch-keys",
         query=f"search={name}",
@@ -37,7 +62,23 @@ def add_args(parser: argparse.ArgumentParser) -> None:
     """Add arguments to parser."""
     parser.add_argument(
         "name",
-        help="Account name to search (partial match supported)",
+        help="Account name to search (partial and fuzzy match supported)",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Refresh the cached account directory before searching",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Search via the API instead of the cached directory",
+    )
+    parser.add_argument(
+        "--ttl",
+        type=float,
+        default=DEFAULT_DIRECTORY_TTL,
+        help=f"Account directory cache lifetime in seconds (default: {DEFAULT_DIRECTORY_TTL})",
     )
     add_common_args(parser)
 
@@ -45,7 +86,13 @@ def add_args(parser: argparse.ArgumentParser) -> None:
 def run(options: argparse.Namespace) -> None:
     """Run the command with parsed options."""
     akm_api = Akamai.FromOptions(options)
-    result = account_search(akm_api, options.name)
+    result = account_search(
+        akm_api,
+        options.name,
+        use_cache=not options.no_cache,
+        refresh=options.refresh,
+        ttl=options.ttl,
+    )
 
     if result:
         print(tabulate(result, headers="keys", tablefmt=get_table_format(options)))
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+"""Activate Akamai network lists and track them until done."""
+
+import argparse
+import fnmatch
+import sys
+from typing import Any, Dict, List
+
+from tabulate import tabulate
+
+from akamai_wrappy.activation import (
+    ACTIVATION_NETWORKS,
+    Activation,
+    AdaptiveBackoff,
+    submit_activations,
+    summarize,
+    track_activations,
+)
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.cli.common import add_common_args, get_table_format
+from akamai_wrappy.cli.list_networklists import list_networklists
+
+
+def activate_networklists(
+    akm_api: Akamai,
+    list_ids: List[str],
+    network: str = "staging",
+    comments: str = "Activated by awp",
+    emails: List[str] | None = None,
+    max_workers: int = 8,
+    wait: bool = True,
+    max_wait: float = 3600,
+    max_interval: float = 60,
+    names: Dict[str, str] | None = None,
+) -> List[Activation]:
+    """Submit activations for many network lists and poll them together.
+
+    Args:
+        akm_api: Akamai API client
+        list_ids: Network list IDs to activate
+        network: Target network (staging or production)
+        comments: Activation comments
+        emails: Notification recipients
+        max_workers: Maximum concurrent activation requests
+        wait: Poll until all activations finish
+        max_wait: Maximum seconds to wait for activations
+        max_interval: Maximum seconds between polling rounds
+        names: Optional mapping of list ID to display name
+
+    Returns:
+        List of Activation results
+    """
+    names = names or {}
+    environment = network.upper()
+
+    def submit(activation: Activation) -> Dict[str, Any]:
+        return akm_api.post(
+            f"/network-list/v2/network-lists/{activation.list_id}/environments/{environment}/activate",
+            data={"comments": comments, "notificationRecipients": emails or []},
+        )
+
+    def poll(activation: Activation) -> Dict[str, Any]:
+        if activation.activation_id is not None:
+            return akm_api.get(f"/network-list/v2/activations/{activation.activation_id}")
+        return akm_api.get(
+            f"/network-list/v2/network-lists/{activation.list_id}/environments/{environment}/status"
+        )
+
+    print(f"Submitting {len(list_ids)} activations to {network}...", file=sys.stderr)
+    activations = submit_activations(
+        [Activation(list_id=list_id, name=names.get(list_id, list_id)) for list_id in list_ids],
+        submit,
+        max_workers=max_workers,
+    )
+
+    if wait:
+        track_activations(
+            activations,
+            poll,
+            backoff=AdaptiveBackoff(maximum=max_interval),
+            max_wait=max_wait,
+        )
+
+    return activations
+
+
+def add_args(parser: argparse.ArgumentParser) -> None:
+    """Add arguments to parser."""
+    parser.add_argument(
+        "list_ids",
+        nargs="*",
+        help="Network list IDs to activate",
+    )
+    parser.add_argument(
+        "--name",
+        action="append",
+        default=None,
+        metavar="GLOB",
+        help="Also activate network lists whose name matches this glob (repeatable)",
+    )
+    parser.add_argument(
+        "-n",
+        "--network",
+        choices=ACTIVATION_NETWORKS,
+        default="staging",
+        help="Target network (default: staging)",
+    )
+    parser.add_argument(
+        "--comments",
+        type=str,
+        default="Activated by awp",
+        help="Activation comments",
+    )
+    parser.add_argument(
+        "--email",
+        action="append",
+        default=None,
+        help="Notification recipient (repeatable)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=8,
+        help="Maximum concurrent activation requests (default: 8)",
+    )
+    parser.add_argument(
+        "--no-wait",
+        action="store_true",
+        help="Submit activations without waiting for them to finish",
+    )
+    parser.add_argument(
+        "--max-wait",
+        type=float,
+        default=3600,
+        help="Maximum seconds to wait for activations (default: 3600)",
+    )
+    parser.add_argument(
+        "--max-interval",
+        type=float,
+        default=60,
+        help="Maximum seconds between status polls (default: 60)",
+    )
+    add_common_args(parser)
+
+
+def run(options: argparse.Namespace) -> None:
+    """Run the command with parsed options."""
+    akm_api = Akamai.FromOptions(options)
+
+    list_ids = list(options.list_ids)
+    names = {}
+    if options.name:
+        for nl in list_networklists(akm_api, verbose=options.verbose):
+            names[nl.unique_id] = nl.name
+            if any(fnmatch.fnmatch(nl.name, pattern) for pattern in options.name):
+                if nl.unique_id not in list_ids:
+                    list_ids.append(nl.unique_id)
+
+    if not list_ids:
+        print("No network lists selected", file=sys.stderr)
+        sys.exit(1)
+
+    activations = activate_networklists(
+        akm_api,
+        list_ids,
+        network=options.network,
+        comments=options.comments,
+        emails=options.email,
+        max_workers=options.workers,
+        wait=not options.no_wait,
+        max_wait=options.max_wait,
+        max_interval=options.max_interval,
+        names=names,
+    )
+
+    print(tabulate(summarize(activations), headers="keys", tablefmt=get_table_format(options)))
+
+    if any(a.error or a.status == "FAILED" for a in activations):
+        sys.exit(1)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Activate Akamai network lists concurrently and track their status"
+    )
+    add_args(parser)
+    options = parser.parse_args()
+    run(options)
+
+
+if __name__ == "__main__":
+    main()
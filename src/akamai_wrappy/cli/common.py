@@ -1,6 +1,20 @@
 """Common CLI utilities and argument helpers."""
 
 import argparse
+import os
+import sys
+from typing import Callable, Tuple
+
+from akamai_wrappy.metrics import METRICS_FORMATS
+from akamai_wrappy.timeouts import DEFAULT_CONNECT_TIMEOUT, parse_endpoint_timeout
+
+
+def _endpoint_timeout_arg(value: str) -> Tuple[str, float]:
+    """argparse type for PATTERN=SECONDS endpoint timeouts."""
+    try:
+        return parse_endpoint_timeout(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
 
 
 def add_common_args(parser: argparse.ArgumentParser) -> None:
@@ -15,14 +29,44 @@ def add_common_args(parser: argparse.ArgumentParser) -> None:
         type=str,
         default=None,
         dest="accountSwitchKey",
-        help="Account switch key for multi-account access",
+        help="Account switch key (or account name, resolved via the cached directory)",
     )
     parser.add_argument(
         "-t",
         "--timeout",
-        type=int,
+        type=float,
         default=30,
-        help="Request timeout in seconds (default: 30)",
+        help="Read timeout in seconds for endpoints without their own (default: 30)",
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=DEFAULT_CONNECT_TIMEOUT,
+        help=f"Connect timeout in seconds (default: {DEFAULT_CONNECT_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--endpoint-timeout",
+        type=_endpoint_timeout_arg,
+        action="append",
+        default=None,
+        metavar="PATTERN=SECONDS",
+        help="Read timeout for endpoints matching a glob, e.g. '/papi/v1/properties/{id}/versions/{id}/rules=300' (repeatable)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Give up on any request still pending SECONDS after the command started",
+    )
+    parser.add_argument(
+        "--hedge",
+        type=float,
+        nargs="?",
+        const=95,
+        default=None,
+        metavar="PERCENTILE",
+        help="Send a second copy of GETs slower than this latency percentile of their endpoint (default: 95)",
     )
     parser.add_argument(
         "--edgerc",
@@ -46,8 +90,106 @@ def add_common_args(parser: argparse.ArgumentParser) -> None:
         action="store_true",
         help="Plain output without table borders",
     )
+    parser.add_argument(
+        "--metrics",
+        nargs="?",
+        const="summary",
+        default=None,
+        choices=METRICS_FORMATS,
+        help="Report per-endpoint request metrics: summary (default), json or prometheus",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=str,
+        default=None,
+        help="Write metrics to this file instead of stderr",
+    )
+    parser.add_argument(
+        "--no-throttle",
+        action="store_true",
+        help="Do not pace requests from rate-limit response headers",
+    )
+    parser.add_argument(
+        "--host-limit",
+        type=float,
+        default=float(os.environ.get("AWP_HOST_LIMIT") or 0) or None,
+        metavar="RATE",
+        help="Share a limit of RATE requests/s with all awp processes on this host using the same credentials and account (default: $AWP_HOST_LIMIT)",
+    )
+    parser.add_argument(
+        "--no-compression",
+        action="store_true",
+        help="Request uncompressed responses (to measure the savings of gzip/brotli)",
+    )
+    parser.add_argument(
+        "--compress-requests",
+        type=int,
+        default=None,
+        metavar="BYTES",
+        help="Gzip request bodies of at least BYTES bytes (only for endpoints accepting Content-Encoding: gzip)",
+    )
+    parser.add_argument(
+        "--record",
+        type=str,
+        default=None,
+        metavar="CASSETTE",
+        help="Record all API interactions to a cassette file (credentials scrubbed)",
+    )
+    parser.add_argument(
+        "--replay",
+        type=str,
+        default=None,
+        metavar="CASSETTE",
+        help="Answer API requests from a recorded cassette instead of the network",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        type=float,
+        default=1.0,
+        metavar="SCALE",
+        help="Multiplier for recorded latencies when replaying (default: 1.0, 0 for none)",
+    )
+
+
+def add_pipeline_args(parser: argparse.ArgumentParser, fetch: bool = False) -> None:
+    """Add worker counts of the download pipeline stages (see akamai_wrappy.pipeline).
+
+    Args:
+        parser: ArgumentParser to add arguments to
+        fetch: Also offer --fetch-workers (commands fetching one item per request)
+    """
+    if fetch:
+        parser.add_argument(
+            "--fetch-workers",
+            type=int,
+            default=1,
+            help="Concurrent fetch requests; their start is still spaced by --delay (default: 1)",
+        )
+    parser.add_argument(
+        "--transform-workers",
+        type=int,
+        default=1,
+        help="Threads formatting files while others are fetched and written (default: 1)",
+    )
 
 
 def get_table_format(options: argparse.Namespace) -> str:
     """Get table format based on options."""
     return "plain" if getattr(options, "plain", False) else "simple"
+
+
+def stderr_progress(verbose: bool = False) -> Callable[[str, str], None]:
+    """Return a Client progress callback printing to stderr.
+
+    Args:
+        verbose: Also print debug messages
+
+    Returns:
+        Callback taking (level, message)
+    """
+
+    def progress(level: str, message: str) -> None:
+        if level != "debug" or verbose:
+            print(message, file=sys.stderr)
+
+    return progress
@@ -0,0 +1,174 @@
+#!/usr/bin/env python
+"""Compact a network list CSV into the minimal set of CIDR blocks."""
+
+import argparse
+import csv
+import sys
+from typing import List
+
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.cidr import CompactionResult, compact
+from akamai_wrappy.cli.common import add_common_args
+from akamai_wrappy.cli.download_networklists import format_networklist_csv
+from akamai_wrappy.files import atomic_write
+
+
+def read_elements(path: str) -> List[str]:
+    """Read elements from a CSV in the download-networklists format.
+
+    The first column is used; a leading ``value`` header row is skipped.
+
+    Args:
+        path: CSV file path ("-" for stdin)
+
+    Returns:
+        List of raw element strings
+    """
+    if path == "-":
+        return _first_column(csv.reader(sys.stdin))
+    with open(path, newline="", encoding="utf-8") as f:
+        return _first_column(csv.reader(f))
+
+
+def _first_column(rows) -> List[str]:
+    """Return the first column of CSV rows without the header."""
+    elements = [row[0] for row in rows if row]
+    if elements and elements[0].strip().lower() == "value":
+        elements = elements[1:]
+    return elements
+
+
+def print_report(result: CompactionResult) -> None:
+    """Print the compaction summary to stderr."""
+    print(
+        f"Input:  {result.input_count} elements ({result.unique_count} unique, "
+        f"{len(result.invalid)} invalid)",
+        file=sys.stderr,
+    )
+    print(
+        f"Output: {result.output_count} elements ({result.reduction:.1%} reduction)",
+        file=sys.stderr,
+    )
+    for value in result.invalid[:10]:
+        print(f"✗ Not an address or CIDR block: {value}", file=sys.stderr)
+    if len(result.invalid) > 10:
+        print(f"  ... and {len(result.invalid) - 10} more", file=sys.stderr)
+
+
+def push_networklist(akm_api: Akamai, list_id: str, elements: List[str]) -> bool:
+    """Replace the elements of a network list.
+
+    The current list is fetched first so its name, description and
+    syncPoint are sent back unchanged; the API rejects the update if the
+    list was modified in between.
+
+    Args:
+        akm_api: Akamai API client
+        list_id: Network list unique ID
+        elements: New elements
+
+    Returns:
+        True if the list was updated
+    """
+    current = akm_api.get(f"/network-list/v2/network-lists/{list_id}")
+    if isinstance(current, dict) and "error" in current:
+        print(f"Error: {current}", file=sys.stderr)
+        return False
+
+    if current.get("type", "IP") != "IP":
+        print(f"Error: {list_id} is a {current.get('type')} list, not an IP list", file=sys.stderr)
+        return False
+
+    body = {
+        "name": current.get("name"),
+        "type": "IP",
+        "description": current.get("description", ""),
+        "syncPoint": current.get("syncPoint"),
+        "list": elements,
+    }
+    response = akm_api.put(f"/network-list/v2/network-lists/{list_id}", data=body)
+    if isinstance(response, dict) and "error" in response:
+        print(f"✗ Failed to update {list_id}: {response}", file=sys.stderr)
+        return False
+
+    print(
+        f"✓ Updated {current.get('name', list_id)} ({len(elements)} elements, "
+        f"syncPoint {response.get('syncPoint')})",
+        file=sys.stderr,
+    )
+    return True
+
+
+def add_args(parser: argparse.ArgumentParser) -> None:
+    """Add arguments to parser."""
+    parser.add_argument(
+        "input",
+        help="CSV file in download-networklists format ('-' for stdin)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=None,
+        help="Write the compacted CSV to this file (default: stdout unless --push)",
+    )
+    parser.add_argument(
+        "--push",
+        metavar="LIST_ID",
+        default=None,
+        help="Replace the elements of this network list with the compacted set",
+    )
+    parser.add_argument(
+        "--drop-invalid",
+        action="store_true",
+        help="Allow --push to drop elements that are not an address or CIDR block",
+    )
+    add_common_args(parser)
+
+
+def run(options: argparse.Namespace) -> None:
+    """Run the command with parsed options."""
+    try:
+        elements = read_elements(options.input)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    result = compact(elements)
+    print_report(result)
+
+    if options.output:
+        atomic_write(options.output, format_networklist_csv(result.elements))
+        print(f"Saved to: {options.output}", file=sys.stderr)
+    elif not options.push:
+        sys.stdout.write(format_networklist_csv(result.elements))
+
+    if options.push:
+        if not result.elements:
+            print("Error: refusing to push an empty list", file=sys.stderr)
+            sys.exit(1)
+        if result.invalid and not options.drop_invalid:
+            # Pushing would delete these entries from the live list
+            print(
+                f"Error: refusing to push, {len(result.invalid)} invalid elements would be removed "
+                "from the list (pass --drop-invalid to remove them)",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        akm_api = Akamai.FromOptions(options)
+        if not push_networklist(akm_api, options.push, result.elements):
+            sys.exit(1)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Compact a network list CSV into the minimal set of CIDR blocks"
+    )
+    add_args(parser)
+    options = parser.parse_args()
+    run(options)
+
+
+if __name__ == "__main__":
+    main()
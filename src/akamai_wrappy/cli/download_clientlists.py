@@ -3,24 +3,86 @@
 
 import argparse
 import csv
+import io
 import os
 import sys
-from typing import Any, Dict, List
+from typing import List, Tuple
 
 from akamai_wrappy.api import Akamai
-from akamai_wrappy.cli.common import add_common_args
+from akamai_wrappy.cli.common import add_common_args, add_pipeline_args
+from akamai_wrappy.columnar import COLUMNAR_FORMATS, dataset_dir, write_clientlists_dataset
+from akamai_wrappy.files import atomic_write, safe_filename
+from akamai_wrappy.models import ClientList
+from akamai_wrappy.pipeline import BatchWriter, Pipeline, Stage, describe_stats
+
+
+def clientlist_filename(cl: ClientList) -> str:
+    """Return the CSV file name of a client list."""
+    return f"{cl.list_id}_{safe_filename(cl.name)}.csv"
+
+
+def format_clientlist_csv(cl: ClientList) -> str:
+    """Format a client list's items as CSV with activation status columns."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    # Header with metadata columns
+    writer.writerow([
+        "value",
+        "description",
+        "expirationDate",
+        "tags",
+        "stagingStatus",
+        "productionStatus",
+    ])
+
+    # Items are decoded one at a time (dict or bare value)
+    for item in cl.iter_items():
+        writer.writerow([
+            item.value,
+            item.description,
+            item.expiration_date,
+            ",".join(item.tags),
+            cl.staging_status,
+            cl.production_status,
+        ])
+    return buffer.getvalue()
+
+
+def write_clientlist_csv(cl: ClientList, output_dir: str) -> str:
+    """Write a client list's items to its CSV file atomically.
+
+    Args:
+        cl: Client list with items
+        output_dir: Output directory path
+
+    Returns:
+        File name written (relative to output_dir)
+    """
+    filename = clientlist_filename(cl)
+    atomic_write(os.path.join(output_dir, filename), format_clientlist_csv(cl), fsync=False)
+    return filename
+
 
 def download_clientlists(
     akm_api: Akamai,
     output_dir: str = "./clientlists",
     verbose: bool = False,
+    output_format: str = "csv",
+    transform_workers: int = 1,
 ) -> None:
     """Download all client lists to CSV files.
 
+    All lists arrive in one response; CSV formatting and file writes then
+    run as pipeline stages, so writing one file overlaps with formatting
+    the next.
+
     Args:
         akm_api: Akamai API client
         output_dir: Output directory path
         verbose: Enable verbose output
+        output_format: "csv" (one file per list), "parquet" or "arrow"
+            (one columnar dataset per account)
+        transform_workers: Threads formatting CSV files
     """
     os.makedirs(output_dir, exist_ok=True)
 
@@ -32,76 +94,65 @@ def download_clientlists(
     response = akm_api.get(
         "/client-list/v1/lists",
         params={"includeItems": "true"},
+        stream=True,
     )
 
     if isinstance(response, dict) and "error" in response:
         print(f"Error: {response}", file=sys.stderr)
         return
 
-    client_lists: List[Dict[str, Any]] = response.get("content", [])
+    client_lists = ClientList.list_from_response(response)
 
     if not client_lists:
         print("No client lists found", file=sys.stderr)
         return
 
     print(f"Found {len(client_lists)} client lists", file=sys.stderr)
-    print("Writing CSV files...", file=sys.stderr)
 
-    success_count = 0
+    if output_format in COLUMNAR_FORMATS:
+        directory = dataset_dir(output_dir, "clientlists", akm_api.account_switch_key)
+        try:
+            counts = write_clientlists_dataset(client_lists, directory, output_format)
+        except ImportError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return
+        print(
+            f"Wrote {counts['lists']} client lists ({counts['rows']} items) to {directory}",
+            file=sys.stderr,
+        )
+        return
 
-    for i, cl in enumerate(client_lists, 1):
-        cl_id = cl.get("listId", "unknown")
-        cl_name = cl.get("name", "unknown")
-        cl_type = cl.get("type", "")
-        staging_status = cl.get("stagingActivationStatus", "")
-        prod_status = cl.get("productionActivationStatus", "")
-        items = cl.get("items", []) or []
+    print("Writing CSV files...", file=sys.stderr)
 
-        # Sanitize filename
-        safe_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in cl_name)
-        filename = f"{cl_id}_{safe_name}.csv"
-        filepath = os.path.join(output_dir, filename)
+    success_count = 0
 
-        try:
-            with open(filepath, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                # Header with metadata columns
-                writer.writerow([
-                    "value",
-                    "description",
-                    "expirationDate",
-                    "tags",
-                    "stagingStatus",
-                    "productionStatus",
-                ])
-
-                for item in items:
-                    # Handle item structure - could be dict or string
-                    if isinstance(item, dict):
-                        value = item.get("value", "")
-                        description = item.get("description", "")
-                        expiration = item.get("expirationDate", "")
-                        tags = ",".join(item.get("tags", []) or [])
-                    else:
-                        value = str(item)
-                        description = ""
-                        expiration = ""
-                        tags = ""
-
-                    writer.writerow([
-                        value,
-                        description,
-                        expiration,
-                        tags,
-                        staging_status,
-                        prod_status,
-                    ])
-
-            print(f"✓ {cl_name} ({len(items)} {cl_type})", file=sys.stderr)
-            success_count += 1
-
-        except Exception as e:
-            print(f"✗ Failed to write {cl_name}: {e}", file=sys.stderr)
+    def on_flush(batch: List[ClientList]) -> None:
+        nonlocal success_count
+        for cl in batch:
+            print(f"✓ {cl.name} ({cl.raw_item_count} {cl.type})", file=sys.stderr)
+        success_count += len(batch)
+
+    def on_error(item: Tuple[ClientList, str], stage: str, error: BaseException) -> None:
+        cl = item if stage == "transform" else item[0]
+        print(f"✗ Failed to write {cl.name}: {error}", file=sys.stderr)
+
+    writer = BatchWriter(on_flush=on_flush)
+    pipeline = Pipeline(
+        [
+            Stage("transform", lambda cl: (cl, format_clientlist_csv(cl)), transform_workers),
+            Stage(
+                "write",
+                lambda job: writer.add(os.path.join(output_dir, clientlist_filename(job[0])), job[1], tag=job[0]),
+                on_idle=writer.flush,
+            ),
+        ],
+        on_error=on_error,
+    )
+    try:
+        stats = pipeline.run(client_lists)
+    finally:
+        writer.discard()
+    print(describe_stats(stats), file=sys.stderr)
 
     print(f"\nDownloaded {success_count} of {len(client_lists)} client lists", file=sys.stderr)
 
@@ -115,6 +166,14 @@ def add_args(parser: argparse.ArgumentParser) -> None:
         default="./clientlists",
         help="Output directory (default: ./clientlists)",
     )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=("csv",) + COLUMNAR_FORMATS,
+        default="csv",
+        help="Output format: csv (one file per list, default), parquet or arrow (one dataset per account)",
+    )
+    add_pipeline_args(parser)
     add_common_args(parser)
 
 
@@ -125,6 +184,8 @@ def run(options: argparse.Namespace) -> None:
         akm_api,
         output_dir=options.output_dir,
         verbose=options.verbose,
+        output_format=options.format,
+        transform_workers=options.transform_workers,
     )
 
 
@@ -3,24 +3,69 @@
 
 import argparse
 import csv
+import io
 import os
 import sys
-from typing import Any, Dict, List
+from typing import List, Tuple
 
 from akamai_wrappy.api import Akamai
-from akamai_wrappy.cli.common import add_common_args
+from akamai_wrappy.cli.common import add_common_args, add_pipeline_args
+from akamai_wrappy.columnar import COLUMNAR_FORMATS, dataset_dir, write_networklists_dataset
+from akamai_wrappy.files import atomic_write, safe_filename
+from akamai_wrappy.models import NetworkList
+from akamai_wrappy.pipeline import BatchWriter, Pipeline, Stage, describe_stats
+
+
+def networklist_filename(nl: NetworkList) -> str:
+    """Return the CSV file name of a network list."""
+    return f"{nl.unique_id}_{safe_filename(nl.name)}.csv"
+
+
+def format_networklist_csv(elements: List[str]) -> str:
+    """Format network list elements as CSV with a ``value`` header."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["value"])
+    for element in elements:
+        writer.writerow([element])
+    return buffer.getvalue()
+
+
+def write_networklist_csv(nl: NetworkList, output_dir: str) -> str:
+    """Write a network list's elements to its CSV file atomically.
+
+    Args:
+        nl: Network list with elements
+        output_dir: Output directory path
+
+    Returns:
+        File name written (relative to output_dir)
+    """
+    filename = networklist_filename(nl)
+    atomic_write(os.path.join(output_dir, filename), format_networklist_csv(nl.elements), fsync=False)
+    return filename
+
 
 def download_networklists(
     akm_api: Akamai,
     output_dir: str = "./networklists",
     verbose: bool = False,
+    output_format: str = "csv",
+    transform_workers: int = 1,
 ) -> None:
     """Download all network lists to CSV files.
 
+    All lists arrive in one response; CSV formatting and file writes then
+    run as pipeline stages, so writing one file overlaps with formatting
+    the next.
+
     Args:
         akm_api: Akamai API client
         output_dir: Output directory path
         verbose: Enable verbose output
+        output_format: "csv" (one file per list), "parquet" or "arrow"
+            (one columnar dataset per account)
+        transform_workers: Threads formatting CSV files
     """
     os.makedirs(output_dir, exist_ok=True)
 
@@ -32,46 +77,65 @@ def download_networklists(
     response = akm_api.get(
         "/network-list/v2/network-lists",
         params={"includeElements": "true"},
+        stream=True,
     )
 
     if isinstance(response, dict) and "error" in response:
         print(f"Error: {response}", file=sys.stderr)
         return
 
-    network_lists: List[Dict[str, Any]] = response.get("networkLists", [])
+    network_lists = NetworkList.list_from_response(response)
 
     if not network_lists:
         print("No network lists found", file=sys.stderr)
         return
 
     print(f"Found {len(network_lists)} network lists", file=sys.stderr)
-    print("Writing CSV files...", file=sys.stderr)
-
-    success_count = 0
-
-    for i, nl in enumerate(network_lists, 1):
-        nl_id = nl.get("uniqueId", "unknown")
-        nl_name = nl.get("name", "unknown")
-        nl_type = nl.get("type", "IP")
-        elements = nl.get("list", []) or []
-
-        # Sanitize filename
-        safe_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in nl_name)
-        filename = f"{nl_id}_{safe_name}.csv"
-        filepath = os.path.join(output_dir, filename)
 
+    if output_format in COLUMNAR_FORMATS:
+        directory = dataset_dir(output_dir, "networklists", akm_api.account_switch_key)
         try:
-            with open(filepath, "w", newline="", encoding="utf-8") as f:
-                writer = csv.writer(f)
-                writer.writerow(["value"])
-                for element in elements:
-                    writer.writerow([element])
+            counts = write_networklists_dataset(network_lists, directory, output_format)
+        except ImportError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return
+        print(
+            f"Wrote {counts['lists']} network lists ({counts['rows']} elements) to {directory}",
+            file=sys.stderr,
+        )
+        return
 
-            print(f"✓ {nl_name} ({len(elements)} {nl_type})", file=sys.stderr)
-            success_count += 1
+    print("Writing CSV files...", file=sys.stderr)
+
+    success_count = 0
 
-        except Exception as e:
-            print(f"✗ Failed to write {nl_name}: {e}", file=sys.stderr)
+    def on_flush(batch: List[NetworkList]) -> None:
+        nonlocal success_count
+        for nl in batch:
+            print(f"✓ {nl.name} ({len(nl.elements)} {nl.type})", file=sys.stderr)
+        success_count += len(batch)
+
+    def on_error(item: Tuple[NetworkList, str], stage: str, error: BaseException) -> None:
+        nl = item if stage == "transform" else item[0]
+        print(f"✗ Failed to write {nl.name}: {error}", file=sys.stderr)
+
+    writer = BatchWriter(on_flush=on_flush)
+    pipeline = Pipeline(
+        [
+            Stage("transform", lambda nl: (nl, format_networklist_csv(nl.elements)), transform_workers),
+            Stage(
+                "write",
+                lambda job: writer.add(os.path.join(output_dir, networklist_filename(job[0])), job[1], tag=job[0]),
+                on_idle=writer.flush,
+            ),
+        ],
+        on_error=on_error,
+    )
+    try:
+        stats = pipeline.run(network_lists)
+    finally:
+        writer.discard()
+    print(describe_stats(stats), file=sys.stderr)
 
     print(f"\nDownloaded {success_count} of {len(network_lists)} network lists", file=sys.stderr)
 
@@ -85,6 +149,14 @@ def add_args(parser: argparse.ArgumentParser) -> None:
         default="./networklists",
         help="Output directory (default: ./networklists)",
     )
+    parser.add_argument(
+        "-f",
+        "--format",
+        choices=("csv",) + COLUMNAR_FORMATS,
+        default="csv",
+        help="Output format: csv (one file per list, default), parquet or arrow (one dataset per account)",
+    )
+    add_pipeline_args(parser)
     add_common_args(parser)
 
 
@@ -95,6 +167,8 @@ def run(options: argparse.Namespace) -> None:
         akm_api,
         output_dir=options.output_dir,
         verbose=options.verbose,
+        output_format=options.format,
+        transform_workers=options.transform_workers,
     )
 
 
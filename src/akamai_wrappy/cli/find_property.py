@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+"""Find Akamai properties by name, hostname or edge hostname."""
+
+import argparse
+import sys
+from typing import Any, Dict, List
+
+from tabulate import tabulate
+
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.cache import JsonCache, client_scope
+from akamai_wrappy.cli.common import add_common_args, get_table_format
+
+# Search field per lookup type accepted by /papi/v1/search/find-by-value
+SEARCH_FIELDS = {
+    "name": "propertyName",
+    "hostname": "hostname",
+    "edge-hostname": "edgeHostname",
+}
+
+EDGE_HOSTNAME_SUFFIXES = (
+    ".edgesuite.net",
+    ".edgekey.net",
+    ".akamaized.net",
+    ".edgesuite-staging.net",
+    ".edgekey-staging.net",
+    ".akamaized-staging.net",
+)
+
+DEFAULT_CACHE_TTL = 3600  # seconds
+
+
+def guess_search_type(value: str) -> str:
+    """Guess the lookup type for a value.
+
+    Args:
+        value: Property name, hostname or edge hostname
+
+    Returns:
+        One of the SEARCH_FIELDS keys
+    """
+    lowered = value.lower()
+    if lowered.endswith(EDGE_HOSTNAME_SUFFIXES):
+        return "edge-hostname"
+    if "." in lowered:
+        return "hostname"
+    return "name"
+
+
+def find_property(
+    akm_api: Akamai,
+    value: str,
+    search_type: str | None = None,
+    use_cache: bool = True,
+    cache_ttl: float = DEFAULT_CACHE_TTL,
+) -> List[Dict[str, Any]]:
+    """Find property versions matching a name, hostname or edge hostname.
+
+    Uses PAPI's find-by-value search, a single request regardless of the
+    number of groups and contracts. When the type is guessed and a
+    hostname search finds nothing, the value is retried as a property name
+    (property names may contain dots).
+
+    Args:
+        akm_api: Akamai API client
+        value: Value to search for
+        search_type: One of SEARCH_FIELDS keys (default: guessed from value)
+        use_cache: Read and update the local result cache (when False,
+            the cache is neither read nor written)
+        cache_ttl: Cache entry lifetime in seconds
+
+    Returns:
+        List of matching property versions
+    """
+    types = [search_type] if search_type else [guess_search_type(value)]
+    if not search_type and types[0] == "hostname":
+        types.append("name")
+
+    cache = JsonCache("find-property", cache_ttl)
+    scope = client_scope(akm_api)
+
+    for current_type in types:
+        cache_key = f"{scope}|{current_type}|{value.lower()}"
+        if use_cache:
+            cached = cache.get(cache_key)
+            if cached is not None:
+                if cached:
+                    return cached
+                continue
+
+        response = akm_api.post(
+            "/papi/v1/search/find-by-value",
+            data={SEARCH_FIELDS[current_type]: value},
+        )
+        if isinstance(response, dict) and "error" in response:
+            print(f"Error: {response}", file=sys.stderr)
+            return []
+
+        items = response.get("versions", {}).get("items", [])
+        if use_cache:
+            cache.set(cache_key, items)
+        if items:
+            return items
+
+    return []
+
+
+def unique_properties(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Collapse search results to one entry per property.
+
+    Args:
+        items: Property versions from find_property
+
+    Returns:
+        List of dicts with propertyId, propertyName, contractId and groupId
+    """
+    seen: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        property_id = item.get("propertyId")
+        if property_id and property_id not in seen:
+            seen[property_id] = {
+                "propertyId": property_id,
+                "propertyName": item.get("propertyName"),
+                "contractId": item.get("contractId"),
+                "groupId": item.get("groupId"),
+            }
+    return list(seen.values())
+
+
+def add_args(parser: argparse.ArgumentParser) -> None:
+    """Add arguments to parser."""
+    parser.add_argument(
+        "value",
+        help="Property name, hostname or edge hostname",
+    )
+    parser.add_argument(
+        "--by",
+        choices=list(SEARCH_FIELDS),
+        default=None,
+        help="Lookup type (default: guessed from the value)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the local result cache (neither read nor updated)",
+    )
+    add_common_args(parser)
+
+
+def run(options: argparse.Namespace) -> None:
+    """Run the command with parsed options."""
+    akm_api = Akamai.FromOptions(options)
+    items = find_property(
+        akm_api,
+        options.value,
+        search_type=options.by,
+        use_cache=not options.no_cache,
+    )
+
+    if not items:
+        print("No results found")
+        return
+
+    rows = [
+        {
+            "propertyId": item.get("propertyId"),
+            "propertyName": item.get("propertyName"),
+            "version": item.get("propertyVersion"),
+            "production": item.get("productionStatus"),
+            "staging": item.get("stagingStatus"),
+            "hostname": item.get("hostname", ""),
+            "edgeHostname": item.get("edgeHostname", ""),
+            "groupId": item.get("groupId"),
+            "contractId": item.get("contractId"),
+        }
+        for item in items
+    ]
+    print(tabulate(rows, headers="keys", tablefmt=get_table_format(options)))
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Find Akamai properties by name, hostname or edge hostname"
+    )
+    add_args(parser)
+    options = parser.parse_args()
+    run(options)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ from tabulate import tabulate
 
 from akamai_wrappy.api import Akamai
 from akamai_wrappy.cli.common import add_common_args, get_table_format
+from akamai_wrappy.client import ApiError, Client
 
 
 def group_search(akm_api: Akamai, name: str) -> List[Dict[str, Any]]:
@@ -21,30 +22,20 @@ def group_search(akm_api: Akamai, name: str) -> List[Dict[str, Any]]:
     Returns:
         List of matching groups
     """
-    result = akm_api.get("/papi/v1/groups")
-
-    if isinstance(result, dict) and "error" in result:
-        pprint(result)
+    client = Client(akm_api)
+    try:
+        return [
+            {
+                "groupId": group.group_id,
+                "groupName": group.group_name,
+                "contractIds": ";".join(group.contract_ids),
+            }
+            for group in client.search_groups(name)
+        ]
+    except ApiError as e:
+        pprint(e.response)
         return []
 
-    groups = result.get("groups", {}).get("items", [])
-
-    # Filter by name (case-insensitive substring match)
-    search_lower = name.lower()
-    matches = []
-    for group in groups:
-        group_name = group.get("groupName", "")
-        if search_lower in group_name.lower():
-            matches.append(
-                {
-                    "groupId": group.get("groupId"),
-                    "groupName": group_name,
-                    "contractIds": ";".join(group.get("contractIds", [])),
-                }
-            )
-
-    return matches
-
 
 def add_args(parser: argparse.ArgumentParser) -> None:
     """Add arguments to parser."""
@@ -3,18 +3,20 @@
 
 import argparse
 import sys
-from typing import Any, Dict, List
+from typing import List
 
 from tabulate import tabulate
 
 from akamai_wrappy.api import Akamai
-from akamai_wrappy.cli.common import add_common_args, get_table_format
+from akamai_wrappy.cli.common import add_common_args, get_table_format, stderr_progress
+from akamai_wrappy.client import ApiError, Client
+from akamai_wrappy.models import ClientList
 
 
 def list_clientlists(
     akm_api: Akamai,
     verbose: bool = False,
-) -> List[Dict[str, Any]]:
+) -> List[ClientList]:
     """List all client lists.
 
     Args:
@@ -22,36 +24,15 @@ def list_clientlists(
         verbose: Enable verbose output
 
     Returns:
-        List of client list metadata dicts
+        List of ClientList models
     """
-    if verbose:
-        print("Fetching client lists...", file=sys.stderr)
-
-    response = akm_api.get("/client-list/v1/lists")
-
-    if isinstance(response, dict) and "error" in response:
-        print(f"Error: {response}", file=sys.stderr)
+    client = Client(akm_api, progress=stderr_progress(verbose))
+    try:
+        return list(client.iter_clientlists())
+    except ApiError as e:
+        print(e, file=sys.stderr)
         return []
 
-    # Extract client lists from response
-    client_lists = response.get("content", [])
-
-    if verbose:
-        print(f"Found {len(client_lists)} client lists", file=sys.stderr)
-
-    results = []
-    for cl in client_lists:
-        results.append({
-            "name": cl.get("name", ""),
-            "listId": cl.get("listId", ""),
-            "type": cl.get("type", ""),
-            "itemsCount": cl.get("itemsCount", 0),
-            "stagingStatus": cl.get("stagingActivationStatus", ""),
-            "productionStatus": cl.get("productionActivationStatus", ""),
-        })
-
-    return results
-
 
 def add_args(parser: argparse.ArgumentParser) -> None:
     """Add arguments to parser."""
@@ -67,7 +48,8 @@ def run(options: argparse.Namespace) -> None:
         print("No client lists found", file=sys.stderr)
         sys.exit(1)
 
-    print(tabulate(results, headers="keys", tablefmt=get_table_format(options)))
+    rows = [cl.to_row() for cl in results]
+    print(tabulate(rows, headers="keys", tablefmt=get_table_format(options)))
 
 
 def main():
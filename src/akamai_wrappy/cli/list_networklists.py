@@ -3,18 +3,20 @@
 
 import argparse
 import sys
-from typing import Any, Dict, List
+from typing import List
 
 from tabulate import tabulate
 
 from akamai_wrappy.api import Akamai
-from akamai_wrappy.cli.common import add_common_args, get_table_format
+from akamai_wrappy.cli.common import add_common_args, get_table_format, stderr_progress
+from akamai_wrappy.client import ApiError, Client
+from akamai_wrappy.models import NetworkList
 
 
 def list_networklists(
     akm_api: Akamai,
     verbose: bool = False,
-) -> List[Dict[str, Any]]:
+) -> List[NetworkList]:
     """List all network lists.
 
     Args:
@@ -22,34 +24,15 @@ def list_networklists(
         verbose: Enable verbose output
 
     Returns:
-        List of network list metadata dicts
+        List of NetworkList models
     """
-    if verbose:
-        print("Fetching network lists...", file=sys.stderr)
-
-    response = akm_api.get("/network-list/v2/network-lists")
-
-    if isinstance(response, dict) and "error" in response:
-        print(f"Error: {response}", file=sys.stderr)
+    client = Client(akm_api, progress=stderr_progress(verbose))
+    try:
+        return list(client.iter_networklists())
+    except ApiError as e:
+        print(e, file=sys.stderr)
         return []
 
-    # Extract network lists from response
-    network_lists = response.get("networkLists", [])
-
-    if verbose:
-        print(f"Found {len(network_lists)} network lists", file=sys.stderr)
-
-    results = []
-    for nl in network_lists:
-        results.append({
-            "name": nl.get("name", ""),
-            "uniqueId": nl.get("uniqueId", ""),
-            "type": nl.get("type", ""),
-            "elementCount": nl.get("elementCount", 0),
-        })
-
-    return results
-
 
 def add_args(parser: argparse.ArgumentParser) -> None:
     """Add arguments to parser."""
@@ -65,7 +48,8 @@ def run(options: argparse.Namespace) -> None:
         print("No network lists found", file=sys.stderr)
         sys.exit(1)
 
-    print(tabulate(results, headers="keys", tablefmt=get_table_format(options)))
+    rows = [nl.to_row() for nl in results]
+    print(tabulate(rows, headers="keys", tablefmt=get_table_format(options)))
 
 
 def main():
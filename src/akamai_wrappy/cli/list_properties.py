@@ -3,13 +3,14 @@
 
 import argparse
 import sys
-import time
-from typing import Any, Dict, List
+from typing import List
 
 from tabulate import tabulate
 
 from akamai_wrappy.api import Akamai
-from akamai_wrappy.cli.common import add_common_args, get_table_format
+from akamai_wrappy.cli.common import add_common_args, get_table_format, stderr_progress
+from akamai_wrappy.client import ApiError, Client
+from akamai_wrappy.models import Property
 
 
 def list_properties(
@@ -17,9 +18,11 @@ def list_properties(
     group_filter: str | None = None,
     rate_limit_delay: float = 0.3,
     verbose: bool = False,
-) -> List[Dict[str, Any]]:
+) -> List[Property]:
     """List all properties across all groups.
 
+    Collects Client.iter_properties(); use that to stream instead.
+
     Args:
         akm_api: Akamai API client
         group_filter: Optional group ID filter (e.g., grp_123456)
@@ -27,66 +30,15 @@ def list_properties(
         verbose: Enable verbose output
 
     Returns:
-        List of properties with key info
+        List of Property models
     """
-    if verbose:
-        print("Fetching groups...", file=sys.stderr)
-
-    groups_response = akm_api.get("/papi/v1/groups")
-
-    if isinstance(groups_response, dict) and "error" in groups_response:
-        print(f"Error: {groups_response}", file=sys.stderr)
+    client = Client(akm_api, progress=stderr_progress(verbose))
+    try:
+        return list(client.iter_properties(group_filter, delay=rate_limit_delay))
+    except ApiError as e:
+        print(e, file=sys.stderr)
         return []
 
-    groups = groups_response.get("groups", {}).get("items", [])
-    if verbose:
-        print(f"Found {len(groups)} groups", file=sys.stderr)
-
-    properties_list = []
-
-    for group in groups:
-        group_id = group.get("groupId")
-        group_name = group.get("groupName", "Unknown")
-        contract_ids = group.get("contractIds", [])
-
-        if not contract_ids:
-            continue
-
-        # Filter by group ID if specified
-        if group_filter and group_filter != group_id:
-            continue
-
-        for contract_id in contract_ids:
-            if verbose:
-                print(f"Fetching: {group_name} ({group_id})", file=sys.stderr)
-
-            time.sleep(rate_limit_delay)
-
-            props_response = akm_api.get(
-                "/papi/v1/properties",
-                params={"contractId": contract_id, "groupId": group_id},
-            )
-
-            if isinstance(props_response, dict) and "error" in props_response:
-                print(f"Warning: {props_response}", file=sys.stderr)
-                continue
-
-            properties = props_response.get("properties", {}).get("items", [])
-
-            for prop in properties:
-                properties_list.append(
-                    {
-                        "propertyId": prop.get("propertyId"),
-                        "propertyName": prop.get("propertyName"),
-                        "prodVer": prop.get("productionVersion"),
-                        "stgVer": prop.get("stagingVersion"),
-                        "latestVer": prop.get("latestVersion"),
-                        "groupId": group_id,
-                    }
-                )
-
-    return properties_list
-
 
 def add_args(parser: argparse.ArgumentParser) -> None:
     """Add arguments to parser."""
@@ -117,7 +69,8 @@ def run(options: argparse.Namespace) -> None:
     )
 
     if result:
-        print(tabulate(result, headers="keys", tablefmt=get_table_format(options)))
+        rows = [prop.to_row() for prop in result]
+        print(tabulate(rows, headers="keys", tablefmt=get_table_format(options)))
         print(f"\nTotal: {len(result)} properties")
     else:
         print("No properties found")
@@ -9,28 +9,57 @@ from rich.table import Table
 from rich.text import Text
 
 from akamai_wrappy import __version__
+from akamai_wrappy.accounts import AccountLookupError
+from akamai_wrappy.metrics import MetricsCollector
+from akamai_wrappy.timeouts import DeadlineExceeded
+from akamai_wrappy.transport import CassetteError
 from akamai_wrappy.cli import (
     account_search,
+    activate_clientlists,
+    activate_networklists,
+    compact_networklist,
     download_clientlists,
     download_networklists,
+    find_property,
     group_search,
     list_clientlists,
     list_networklists,
     list_properties,
+    patch_properties,
     properties_download,
     property_download,
+    property_history_download,
+    queue_properties,
+    search_rules,
+    sync_clientlists,
+    sync_networklists,
+    worker,
 )
 
 COMMANDS = {
     "search-asw": (account_search, "Search for account switch keys"),
     "search-group": (group_search, "Search for groups by name"),
     "list-properties": (list_properties, "List all properties with version info"),
+    "find-property": (find_property, "Find a property by name, hostname or edge hostname"),
+    "search-rules": (search_rules, "Find properties whose rules match a JSONPath query"),
     "download-property": (property_download, "Download property rules to JSON"),
     "download-properties": (properties_download, "Download all property rules to JSON"),
+    "download-property-history": (
+        property_history_download,
+        "Download every property version (deduplicated)",
+    ),
+    "queue-properties": (queue_properties, "Queue property exports for awp worker processes"),
+    "worker": (worker, "Process queued property exports"),
+    "patch-properties": (patch_properties, "Apply a JSON Patch to many property rule trees"),
     "list-networklists": (list_networklists, "List all network lists"),
     "download-networklists": (download_networklists, "Download network lists to CSV"),
+    "activate-networklists": (activate_networklists, "Activate network lists and track status"),
+    "sync-networklists": (sync_networklists, "Mirror network lists, fetching only changed lists"),
+    "compact-networklist": (compact_networklist, "Merge a network list CSV into minimal CIDR blocks"),
     "list-clientlists": (list_clientlists, "List all client lists"),
     "download-clientlists": (download_clientlists, "Download client lists to CSV"),
+    "sync-clientlists": (sync_clientlists, "Mirror client lists, fetching only changed lists"),
+    "activate-clientlists": (activate_clientlists, "Activate client lists and track status"),
 }
 
 
@@ -67,12 +96,25 @@ def print_help():
 
     # Global options
     console.print("[bold]Global options:[/bold] [dim](available for all commands)[/dim]")
-    console.print("  [green]-k, --account-switch-key[/green]  Account switch key for multi-account access")
-    console.print("  [green]-t, --timeout[/green]             Request timeout in seconds (default: 30)")
+    console.print("  [green]-k, --account-switch-key[/green]  Account switch key or account name")
+    console.print("  [green]-t, --timeout[/green]             Read timeout in seconds (default: 30)")
+    console.print("  [green]--connect-timeout[/green]         Connect timeout in seconds (default: 10)")
+    console.print("  [green]--endpoint-timeout[/green] P=S    Read timeout for endpoints matching glob P")
+    console.print("  [green]--deadline[/green] SECONDS        Overall time budget for the command")
+    console.print("  [green]--hedge[/green] [PCT]             Re-send GETs slower than the PCT latency percentile")
     console.print("  [green]--edgerc[/green]                  Path to .edgerc file (default: ~/.edgerc)")
     console.print("  [green]--section[/green]                 Section in .edgerc (default: default)")
     console.print("  [green]--verbose[/green]                 Enable verbose output")
     console.print("  [green]--plain[/green]                   Plain output without table borders")
+    console.print("  [green]--metrics[/green] [FORMAT]        Report request metrics (summary, json, prometheus)")
+    console.print("  [green]--metrics-file[/green]            Write metrics to a file instead of stderr")
+    console.print("  [green]--no-throttle[/green]             Do not pace requests from rate-limit headers")
+    console.print("  [green]--host-limit[/green] RATE         Requests/s shared by all awp processes on this host")
+    console.print("  [green]--no-compression[/green]          Request uncompressed responses")
+    console.print("  [green]--compress-requests[/green] BYTES Gzip request bodies of at least BYTES")
+    console.print("  [green]--record[/green] CASSETTE         Record API interactions to a cassette file")
+    console.print("  [green]--replay[/green] CASSETTE         Replay API responses from a cassette file")
+    console.print("  [green]--replay-latency[/green] SCALE    Scale recorded latencies (1.0 original, 0 none)")
     console.print()
 
     # Footer
@@ -113,8 +155,25 @@ def main():
         print_help()
         sys.exit(1)
 
+    # Collect request metrics if requested; reported even if the command fails
+    collector = None
+    if getattr(args, "metrics", None):
+        collector = MetricsCollector(keep_records=args.metrics == "json")
+        args.metrics_collector = collector
+    # Clients created by the command (Akamai.FromOptions), closed afterwards
+    args.open_clients = []
+
     # Dispatch
-    COMMANDS[args.command][0].run(args)
+    try:
+        COMMANDS[args.command][0].run(args)
+    except (AccountLookupError, CassetteError, DeadlineExceeded) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        for client in args.open_clients:
+            client.close()
+        if collector is not None:
+            collector.write(args.metrics, args.metrics_file)
 
 
 if __name__ == "__main__":
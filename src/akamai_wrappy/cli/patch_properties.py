@@ -0,0 +1,229 @@
+#!/usr/bin/env python
+"""Apply a JSON Patch to the rule trees of many Akamai properties."""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List
+
+from tabulate import tabulate
+
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.cli.common import add_common_args, get_table_format, stderr_progress
+from akamai_wrappy.client import ApiError, Client
+from akamai_wrappy.files import atomic_write
+from akamai_wrappy.ratelimit import IntervalScheduler
+from akamai_wrappy.rulepatch import (
+    BASE_VERSIONS,
+    BULK_CHUNK_SIZE,
+    PatchResult,
+    bulk_patch_properties,
+    load_patch,
+    patch_properties,
+    plan_patches,
+    summarize,
+)
+from akamai_wrappy.selection import PropertySelector
+
+
+def select_patch_targets(
+    akm_api: Akamai,
+    selector: PropertySelector,
+    group_filter: str | None = None,
+    base: str = "latest",
+    verbose: bool = False,
+) -> List[PatchResult] | None:
+    """List the selected properties as pending patch results.
+
+    Args:
+        akm_api: Akamai API client
+        selector: Property selector
+        group_filter: Optional group ID filter
+        base: Version new versions are created from (latest, staging, production)
+        verbose: Enable verbose output
+
+    Returns:
+        Pending results, or None if the listing failed
+    """
+    client = Client(akm_api, progress=stderr_progress(verbose))
+    try:
+        return plan_patches(client.iter_properties(group_filter, selector=selector), base)
+    except ApiError as e:
+        print(e, file=sys.stderr)
+        return None
+
+
+def write_results(path: str, results: List[PatchResult], patch: List[Dict[str, Any]]) -> None:
+    """Write per-property results and rollback information as JSON."""
+    data = {"patch": patch, "results": [r.to_record() for r in results]}
+    atomic_write(path, json.dumps(data, indent=2) + "\n")
+
+
+def add_args(parser: argparse.ArgumentParser) -> None:
+    """Add arguments to parser."""
+    parser.add_argument(
+        "patch",
+        help="JSON Patch file (RFC 6902) applied to each rule tree, or - for stdin",
+    )
+    parser.add_argument(
+        "-g",
+        "--group",
+        type=str,
+        default=None,
+        help="Filter by group ID (e.g., grp_123456)",
+    )
+    parser.add_argument(
+        "--name",
+        action="append",
+        default=None,
+        metavar="GLOB",
+        help="Only properties whose name matches this glob (repeatable, case-insensitive)",
+    )
+    parser.add_argument(
+        "--name-regex",
+        type=str,
+        default=None,
+        help="Only properties whose name matches this regular expression",
+    )
+    parser.add_argument(
+        "--contract",
+        action="append",
+        default=None,
+        help="Only properties in this contract ID (repeatable)",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Patch every property of the account (required when no filter is given)",
+    )
+    parser.add_argument(
+        "--from",
+        choices=BASE_VERSIONS,
+        default="latest",
+        dest="base",
+        help="Version to create the new version from (default: latest)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Maximum properties patched at once (default: 4)",
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=0,
+        help="Minimum seconds between the start of two properties (default: 0)",
+    )
+    parser.add_argument(
+        "--no-validate",
+        action="store_true",
+        help="Skip PAPI rule validation of the patched trees (not with --bulk)",
+    )
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        help="Submit patches through the asynchronous bulk patch API (for large batches)",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=BULK_CHUNK_SIZE,
+        help=f"Properties per bulk patch request (default: {BULK_CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "-r",
+        "--results",
+        type=str,
+        default=None,
+        help="Write per-property results and rollback versions to this JSON file",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only list the properties and versions that would be patched",
+    )
+    add_common_args(parser)
+
+
+def run(options: argparse.Namespace) -> None:
+    """Run the command with parsed options."""
+    try:
+        patch = load_patch(options.patch)
+    except (OSError, ValueError) as e:
+        print(f"Error: invalid patch {options.patch}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if not (options.all or options.group or options.name or options.name_regex or options.contract):
+        print("Error: select properties with -g/--name/--name-regex/--contract, or pass --all", file=sys.stderr)
+        sys.exit(1)
+
+    if options.bulk and options.no_validate:
+        print("Error: --no-validate does not apply to --bulk", file=sys.stderr)
+        sys.exit(1)
+
+    akm_api = Akamai.FromOptions(options)
+    selector = PropertySelector(
+        name_patterns=options.name,
+        name_regex=options.name_regex,
+        contracts=options.contract,
+    )
+    results = select_patch_targets(
+        akm_api, selector, options.group, options.base, options.verbose
+    )
+    if results is None:
+        sys.exit(1)
+    if not results:
+        print("No properties match the selection", file=sys.stderr)
+        return
+
+    print(f"Selected {len(results)} properties", file=sys.stderr)
+    if options.dry_run:
+        print(tabulate(summarize(results), headers="keys", tablefmt=get_table_format(options)))
+        return
+
+    if options.bulk:
+        bulk_patch_properties(
+            akm_api,
+            results,
+            patch,
+            max_workers=options.workers,
+            chunk_size=options.chunk_size,
+            scheduler=IntervalScheduler(options.delay, akm_api.deadline),
+        )
+    else:
+        patch_properties(
+            akm_api,
+            results,
+            patch,
+            max_workers=options.workers,
+            delay=options.delay,
+            validate=not options.no_validate,
+        )
+
+    print(tabulate(summarize(results), headers="keys", tablefmt=get_table_format(options)))
+    if options.results:
+        write_results(options.results, results, patch)
+        print(f"Results and rollback versions written to {options.results}", file=sys.stderr)
+
+    patched = sum(1 for r in results if r.ok)
+    print(
+        f"\nPatched {patched} of {len(results)} properties (new versions are not activated)",
+        file=sys.stderr,
+    )
+    if patched < len(results):
+        sys.exit(1)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Apply a JSON Patch to the rule trees of many Akamai properties in new versions"
+    )
+    add_args(parser)
+    options = parser.parse_args()
+    run(options)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,13 +2,27 @@
 """Download all Akamai property rules to JSON files."""
 
 import argparse
-import json
 import os
 import sys
-import time
+from typing import Any, Dict, List
 
+from akamai_wrappy import codec
 from akamai_wrappy.api import Akamai
-from akamai_wrappy.cli.common import add_common_args
+from akamai_wrappy.cli.common import add_common_args, add_pipeline_args, stderr_progress
+from akamai_wrappy.client import ApiError, Client
+from akamai_wrappy.files import rule_tree_path
+from akamai_wrappy.includes import REFERENCE_MAP_FILENAME, export_includes
+from akamai_wrappy.journal import ExportJournal, item_key
+from akamai_wrappy.models import Property
+from akamai_wrappy.pipeline import BatchWriter, Pipeline, Stage, describe_stats
+from akamai_wrappy.ratelimit import IntervalScheduler
+from akamai_wrappy.selection import (
+    ORDER_CHOICES,
+    PropertySelector,
+    parse_since,
+    select_and_order,
+)
+from akamai_wrappy.timeouts import DeadlineExceeded
 
 
 def download_property_rules(
@@ -19,7 +33,7 @@ def download_property_rules(
     contract_id: str,
     group_id: str,
     output_dir: str,
-) -> bool:
+) -> str | None:
     """Download a single property's rule tree.
 
     Args:
@@ -32,37 +46,170 @@ def download_property_rules(
         output_dir: Output directory path
 
     Returns:
-        True if successful, False otherwise
+        Output file path if successful, None otherwise
     """
+    client = Client(akm_api, progress=stderr_progress())
+    result = client.export_property_rules(
+        property_id, property_name, version, contract_id, group_id, output_dir
+    )
+    return result.path
+
+
+# Akamai PAPI rate limit: 3 rule tree exports per minute
+DEFAULT_EXPORT_DELAY = 21  # seconds (safe for 3/min limit)
+
+
+def collect_properties(
+    akm_api: Akamai,
+    group_filter: str | None = None,
+    verbose: bool = False,
+    selector: PropertySelector | None = None,
+) -> List[Property] | None:
+    """Collect properties across all groups with their contract info.
+
+    Args:
+        akm_api: Akamai API client
+        group_filter: Optional group ID filter
+        verbose: Enable verbose output
+        selector: Optional name/contract selector applied during listing
+
+    Returns:
+        List of Property models, or None if the groups listing failed
+    """
+    client = Client(akm_api, progress=stderr_progress(verbose))
     try:
-        # Fetch the rule tree
-        rules_response = akm_api.get(
-            f"/papi/v1/properties/{property_id}/versions/{version}/rules",
-            params={"contractId": contract_id, "groupId": group_id},
-        )
+        return list(client.iter_properties(group_filter, selector=selector))
+    except ApiError as e:
+        print(e, file=sys.stderr)
+        return None
 
-        if isinstance(rules_response, dict) and "error" in rules_response:
-            print(f"Error downloading {property_name}: {rules_response}", file=sys.stderr)
-            return False
 
-        # Determine output filename
-        safe_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in property_name)
-        output_file = os.path.join(output_dir, f"{safe_name}_v{version}.json")
+def plan_exports(properties_list: List[Property]) -> List[Dict[str, Any]]:
+    """Turn collected properties into export work items.
 
-        # Write to file
-        with open(output_file, "w", encoding="utf-8") as f:
-            json.dump(rules_response, f, indent=2)
+    Uses the production version if available, otherwise the latest version.
+    Properties with incomplete data are skipped.
 
-        print(f"✓ {property_name} v{version}", file=sys.stderr)
-        return True
+    Args:
+        properties_list: Properties from collect_properties
 
-    except Exception as e:
-        print(f"✗ Failed to download {property_name}: {e}", file=sys.stderr)
-        return False
+    Returns:
+        List of work items (JSON-serializable, stored in the journal) with
+        propertyId, propertyName, version, contractId, groupId and isProduction
+    """
+    items = []
+    for prop in properties_list:
+        item = {
+            "propertyId": prop.property_id,
+            "propertyName": prop.property_name,
+            "version": prop.export_version,
+            "contractId": prop.contract_id,
+            "groupId": prop.group_id,
+        }
+        if not all(item.values()):
+            print(f"✗ Skipping incomplete property data: {prop}", file=sys.stderr)
+            continue
+        item["isProduction"] = bool(prop.production_version)
+        items.append(item)
+    return items
 
 
-# Akamai PAPI rate limit: 3 rule tree exports per minute
-DEFAULT_EXPORT_DELAY = 21  # seconds (safe for 3/min limit)
+class _Export:
+    """A planned rule tree export moving through the download pipeline."""
+
+    __slots__ = ("item", "rules", "data", "path")
+
+    def __init__(self, item: Dict[str, Any]):
+        self.item = item
+        self.rules: Any = None
+        self.data = b""
+        self.path = ""
+
+
+def export_work_items(
+    akm_api: Akamai,
+    items: List[Dict[str, Any]],
+    output_dir: str,
+    journal: ExportJournal,
+    scheduler: IntervalScheduler,
+    fetch_workers: int = 1,
+    transform_workers: int = 1,
+    verbose: bool = False,
+) -> int:
+    """Export rule trees through a fetch/transform/write pipeline.
+
+    Fetching the next rule tree overlaps with serializing and writing the
+    previous ones. Files are made durable in batches, and each batch is
+    recorded in the journal with one fsync once its files are in place.
+
+    Args:
+        akm_api: Akamai API client
+        items: Work items to export
+        output_dir: Output directory path
+        journal: Journal recording completed and failed exports
+        scheduler: Spaces the start of rule tree requests
+        fetch_workers: Concurrent rule tree requests (still spaced by the scheduler)
+        transform_workers: Threads serializing rule trees
+        verbose: Enable verbose output
+
+    Returns:
+        Number of rule trees written
+    """
+    written = 0
+
+    def fetch(export: _Export) -> _Export:
+        item = export.item
+        scheduler.wait()
+        if verbose:
+            print(f"Fetching {item['propertyName']} v{item['version']}...", file=sys.stderr)
+        response = akm_api.get(
+            f"/papi/v1/properties/{item['propertyId']}/versions/{item['version']}/rules",
+            params={"contractId": item["contractId"], "groupId": item["groupId"]},
+            stream=True,
+        )
+        if isinstance(response, dict) and "error" in response:
+            raise ApiError(str(response), response)
+        export.rules = response
+        return export
+
+    def transform(export: _Export) -> _Export:
+        export.data = codec.dumps(export.rules, indent=True)
+        export.rules = None
+        export.path = rule_tree_path(output_dir, export.item["propertyName"], export.item["version"])
+        return export
+
+    def write(export: _Export) -> None:
+        writer.add(export.path, export.data, tag=export)
+        export.data = b""
+
+    def on_flush(batch: List[_Export]) -> None:
+        nonlocal written
+        journal.mark_done_many([(item_key(export.item), export.path) for export in batch])
+        for export in batch:
+            print(f"✓ {export.item['propertyName']} v{export.item['version']}", file=sys.stderr)
+        written += len(batch)
+
+    def on_error(export: _Export, stage: str, error: BaseException) -> None:
+        print(f"✗ Failed to download {export.item['propertyName']}: {error}", file=sys.stderr)
+        journal.mark_failed(item_key(export.item), f"{stage}: {error}")
+
+    writer = BatchWriter(on_flush=on_flush)
+    pipeline = Pipeline(
+        [
+            Stage("fetch", fetch, fetch_workers),
+            Stage("transform", transform, transform_workers),
+            Stage("write", write, on_idle=writer.flush),
+        ],
+        on_error=on_error,
+        # Fetched trees are still written and journaled; the rest is left for --resume
+        stop_on=(DeadlineExceeded,),
+    )
+    try:
+        stats = pipeline.run(_Export(item) for item in items)
+    finally:
+        writer.discard()
+    print(describe_stats(stats), file=sys.stderr)
+    return written
 
 
 def download_properties(
@@ -71,15 +218,38 @@ def download_properties(
     output_dir: str = "./properties",
     rate_limit_delay: float = DEFAULT_EXPORT_DELAY,
     verbose: bool = False,
+    resume: bool = False,
+    selector: PropertySelector | None = None,
+    order: str = "listing",
+    includes: bool = False,
+    fetch_workers: int = 1,
+    transform_workers: int = 1,
 ) -> None:
     """Download all property rule trees to JSON files.
 
+    Progress is recorded in a journal in the output directory. With
+    ``resume=True`` the planned work list is read from the journal instead
+    of listing groups again, and already completed exports are skipped.
+
+    Selection and ordering happen before any rule tree is requested, and
+    the journal stores the resulting plan so a resumed run keeps it.
+
+    With ``includes=True`` the includes referenced by the downloaded rule
+    trees are exported afterwards, each version once, under the same rate
+    limit (see akamai_wrappy.includes).
+
     Args:
         akm_api: Akamai API client
         group_filter: Optional group ID filter
         output_dir: Output directory path
         rate_limit_delay: Delay between downloads in seconds (default: 21s for rate limit)
         verbose: Enable verbose output
+        resume: Resume an interrupted run from the output directory's journal
+        selector: Optional property selector (name, contract, changed since)
+        order: Export order, one of ORDER_CHOICES
+        includes: Also export referenced includes with a reference map
+        fetch_workers: Concurrent rule tree requests (see export_work_items)
+        transform_workers: Threads serializing rule trees
     """
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
@@ -87,100 +257,110 @@ def download_properties(
     if verbose:
         print(f"Output directory: {output_dir}", file=sys.stderr)
 
-    # Get groups and properties directly to have access to contract info
-    if verbose:
-        print("Fetching groups...", file=sys.stderr)
-
-    groups_response = akm_api.get("/papi/v1/groups")
-    if isinstance(groups_response, dict) and "error" in groups_response:
-        print(f"Error: {groups_response}", file=sys.stderr)
-        return
-
-    groups = groups_response.get("groups", {}).get("items", [])
-    if verbose:
-        print(f"Found {len(groups)} groups", file=sys.stderr)
+    journal = ExportJournal(output_dir)
+    done: set = set()
 
-    properties_list = []
-
-    for group in groups:
-        group_id = group.get("groupId")
-        group_name = group.get("groupName", "Unknown")
-        contract_ids = group.get("contractIds", [])
+    if resume and journal.exists():
+        work_items, _, done = journal.load()
+        print(
+            f"Resuming: {len(done)} of {len(work_items)} properties already downloaded",
+            file=sys.stderr,
+        )
+    else:
+        if resume:
+            print("No journal found, starting a new run", file=sys.stderr)
+        elif journal.exists():
+            print("Existing journal replaced (use --resume to continue a run)", file=sys.stderr)
+
+        # Get groups and properties directly to have access to contract info
+        properties_list = collect_properties(akm_api, group_filter, verbose, selector)
+        if properties_list is None:
+            return
+
+        if not properties_list:
+            print("No properties found", file=sys.stderr)
+            return
+
+        print(f"Found {len(properties_list)} properties", file=sys.stderr)
+        work_items = select_and_order(
+            akm_api, plan_exports(properties_list), selector, order, verbose
+        )
+        if not work_items:
+            print("No properties match the selection", file=sys.stderr)
+            return
+        if len(work_items) < len(properties_list):
+            print(f"Selected {len(work_items)} properties", file=sys.stderr)
+
+        journal.start(
+            work_items,
+            meta={
+                "groupFilter": group_filter,
+                "selector": selector.describe() if selector else None,
+                "order": order,
+            },
+        )
 
-        if not contract_ids:
-            continue
+    pending = [item for item in work_items if item_key(item) not in done]
+    total_count = len(work_items)
+    success_count = total_count - len(pending)
 
-        # Filter by group ID if specified
-        if group_filter and group_filter != group_id:
-            continue
+    # Rate limiting: time spent downloading counts towards the delay
+    scheduler = IntervalScheduler(rate_limit_delay, akm_api.deadline)
 
-        for contract_id in contract_ids:
-            if verbose:
-                print(f"Fetching: {group_name} ({group_id})", file=sys.stderr)
-
-            props_response = akm_api.get(
-                "/papi/v1/properties",
-                params={"contractId": contract_id, "groupId": group_id},
-            )
-
-            if isinstance(props_response, dict) and "error" in props_response:
-                print(f"Warning: {props_response}", file=sys.stderr)
-                continue
-
-            properties = props_response.get("properties", {}).get("items", [])
-
-            for prop in properties:
-                properties_list.append(
-                    {
-                        "propertyId": prop.get("propertyId"),
-                        "propertyName": prop.get("propertyName"),
-                        "prodVer": prop.get("productionVersion"),
-                        "latestVer": prop.get("latestVersion"),
-                        "groupId": group_id,
-                        "contractId": contract_id,
-                    }
-                )
-
-    if not properties_list:
-        print("No properties found", file=sys.stderr)
+    if not pending:
+        print("Nothing to download, all properties already downloaded", file=sys.stderr)
+        if includes:
+            download_includes(akm_api, work_items, output_dir, scheduler, verbose)
         return
 
-    print(f"Found {len(properties_list)} properties", file=sys.stderr)
     print("Starting downloads...", file=sys.stderr)
 
-    success_count = 0
-    total_count = len(properties_list)
-
-    for i, prop in enumerate(properties_list, 1):
-        property_id = prop.get("propertyId")
-        property_name = prop.get("propertyName")
-        version = prop.get("prodVer") or prop.get("latestVer")
-        contract_id = prop.get("contractId")
-        group_id = prop.get("groupId")
+    try:
+        success_count += export_work_items(
+            akm_api,
+            pending,
+            output_dir,
+            journal,
+            scheduler,
+            fetch_workers=fetch_workers,
+            transform_workers=transform_workers,
+            verbose=verbose,
+        )
+    finally:
+        journal.close()
 
-        if not all([property_id, property_name, version, contract_id, group_id]):
-            print(f"✗ Skipping incomplete property data: {prop}", file=sys.stderr)
-            continue
+    print(f"\nDownloaded {success_count} of {total_count} properties", file=sys.stderr)
+    if includes:
+        download_includes(akm_api, work_items, output_dir, scheduler, verbose)
+    if success_count < total_count:
+        print("Re-run with --resume to retry the remaining properties", file=sys.stderr)
 
-        if verbose:
-            print(f"[{i}/{total_count}] {property_name}...", file=sys.stderr)
 
-        # Rate limiting
-        if i > 1:
-            time.sleep(rate_limit_delay)
+def download_includes(
+    akm_api: Akamai,
+    work_items: List[Dict[str, Any]],
+    output_dir: str,
+    scheduler: IntervalScheduler,
+    verbose: bool = False,
+) -> None:
+    """Export the includes referenced by the downloaded rule trees.
 
-        if download_property_rules(
-            akm_api,
-            property_id,
-            property_name,
-            version,
-            contract_id,
-            group_id,
-            output_dir,
-        ):
-            success_count += 1
+    Args:
+        akm_api: Akamai API client
+        work_items: Planned export items; those with a rule tree on disk are scanned
+        output_dir: Output directory path
+        scheduler: Scheduler shared with the property downloads
+        verbose: Enable verbose output
+    """
+    downloaded = []
+    for item in work_items:
+        path = rule_tree_path(output_dir, item["propertyName"], item["version"])
+        if os.path.exists(path):
+            downloaded.append({**item, "path": path})
 
-    print(f"\nDownloaded {success_count} of {total_count} properties", file=sys.stderr)
+    print("\nExporting referenced includes...", file=sys.stderr)
+    export_includes(akm_api, downloaded, output_dir, scheduler, verbose)
+    print(f"Reference map: {os.path.join(output_dir, REFERENCE_MAP_FILENAME)}", file=sys.stderr)
 
 
 def add_args(parser: argparse.ArgumentParser) -> None:
@@ -205,18 +385,72 @@ def add_args(parser: argparse.ArgumentParser) -> None:
         default=DEFAULT_EXPORT_DELAY,
         help=f"Delay between downloads in seconds (default: {DEFAULT_EXPORT_DELAY}, for 3/min rate limit)",
     )
+    parser.add_argument(
+        "--name",
+        action="append",
+        default=None,
+        metavar="GLOB",
+        help="Only properties whose name matches this glob (repeatable, case-insensitive)",
+    )
+    parser.add_argument(
+        "--name-regex",
+        type=str,
+        default=None,
+        help="Only properties whose name matches this regular expression",
+    )
+    parser.add_argument(
+        "--contract",
+        action="append",
+        default=None,
+        help="Only properties in this contract ID (repeatable, e.g. ctr_1-ABCDE)",
+    )
+    parser.add_argument(
+        "--changed-since",
+        type=parse_since,
+        default=None,
+        help="Only properties whose exported version changed since a date or age (e.g. 2025-01-31, 7d)",
+    )
+    parser.add_argument(
+        "--order",
+        choices=ORDER_CHOICES,
+        default="listing",
+        help="Export order (default: listing)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume an interrupted run from the journal in the output directory",
+    )
+    parser.add_argument(
+        "--includes",
+        action="store_true",
+        help="Also export the includes the rule trees reference (each version once) with a reference map",
+    )
+    add_pipeline_args(parser, fetch=True)
     add_common_args(parser)
 
 
 def run(options: argparse.Namespace) -> None:
     """Run the command with parsed options."""
     akm_api = Akamai.FromOptions(options)
+    selector = PropertySelector(
+        name_patterns=options.name,
+        name_regex=options.name_regex,
+        contracts=options.contract,
+        changed_since=options.changed_since,
+    )
     download_properties(
         akm_api,
         group_filter=options.group,
         output_dir=options.output_dir,
         rate_limit_delay=options.delay,
         verbose=options.verbose,
+        resume=options.resume,
+        selector=selector,
+        order=options.order,
+        includes=options.includes,
+        fetch_workers=options.fetch_workers,
+        transform_workers=options.transform_workers,
     )
 
 
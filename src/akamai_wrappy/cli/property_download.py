@@ -2,11 +2,48 @@
 """Download Akamai property rules."""
 
 import argparse
-import json
+import re
 import sys
 
+from akamai_wrappy import codec
 from akamai_wrappy.api import Akamai
 from akamai_wrappy.cli.common import add_common_args
+from akamai_wrappy.cli.find_property import find_property, unique_properties
+
+_PROPERTY_ID = re.compile(r"^(prp_)?\d+$")
+
+
+def resolve_property_id(akm_api: Akamai, value: str) -> str | None:
+    """Resolve a property ID, name or hostname to a property ID.
+
+    IDs are returned unchanged; anything else is looked up with the
+    find-by-value search (cached locally).
+
+    Args:
+        akm_api: Akamai API client
+        value: Property ID (e.g., prp_123456), property name or hostname
+
+    Returns:
+        Property ID, or None if not found or ambiguous
+    """
+    if _PROPERTY_ID.match(value):
+        return value
+
+    print(f"Looking up property {value}...", file=sys.stderr)
+    matches = unique_properties(find_property(akm_api, value))
+
+    if not matches:
+        print(f"No property found for {value}", file=sys.stderr)
+        return None
+
+    if len(matches) > 1:
+        print(f"{value} matches {len(matches)} properties, use a property ID:", file=sys.stderr)
+        for match in matches:
+            print(f"  {match['propertyId']}  {match['propertyName']}", file=sys.stderr)
+        return None
+
+    print(f"Resolved to {matches[0]['propertyName']} ({matches[0]['propertyId']})", file=sys.stderr)
+    return matches[0]["propertyId"]
 
 
 def property_download(
@@ -19,10 +56,14 @@ def property_download(
 
     Args:
         akm_api: Akamai API client
-        property_id: Property ID (e.g., prp_123456)
+        property_id: Property ID (e.g., prp_123456), property name or hostname
         version: Specific version to download (default: production or latest)
         output_file: Output file path (default: {propertyName}_v{version}.json)
     """
+    property_id = resolve_property_id(akm_api, property_id)
+    if property_id is None:
+        return
+
     print(f"Fetching property info for {property_id}...", file=sys.stderr)
     prop_response = akm_api.get(f"/papi/v1/properties/{property_id}")
 
@@ -53,6 +94,7 @@ def property_download(
     rules_response = akm_api.get(
         f"/papi/v1/properties/{property_id}/versions/{version}/rules",
         params={"contractId": contract_id, "groupId": group_id},
+        stream=True,
     )
 
     if isinstance(rules_response, dict) and "error" in rules_response:
@@ -65,8 +107,8 @@ def property_download(
         output_file = f"{safe_name}_v{version}.json"
 
     # Write to file
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(rules_response, f, indent=2)
+    with open(output_file, "wb") as f:
+        f.write(codec.dumps(rules_response, indent=True))
 
     print(f"Saved to {output_file}")
 
@@ -75,7 +117,7 @@ def add_args(parser: argparse.ArgumentParser) -> None:
     """Add arguments to parser."""
     parser.add_argument(
         "property_id",
-        help="Property ID (e.g., prp_123456)",
+        help="Property ID (e.g., prp_123456), property name or hostname",
     )
     parser.add_argument(
         "-v",
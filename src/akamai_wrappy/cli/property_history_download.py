@@ -0,0 +1,223 @@
+#!/usr/bin/env python
+"""Download the full version history of Akamai properties."""
+
+import argparse
+import os
+import sys
+from typing import Any, Dict, List
+
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.cli.common import add_common_args
+from akamai_wrappy.cli.properties_download import DEFAULT_EXPORT_DELAY, collect_properties
+from akamai_wrappy.files import safe_filename
+from akamai_wrappy.history import RuleTreeStore
+from akamai_wrappy.models import Property
+from akamai_wrappy.ratelimit import IntervalScheduler
+from akamai_wrappy.selection import PropertySelector
+
+
+def resolve_properties(akm_api: Akamai, property_ids: List[str]) -> List[Property]:
+    """Look up name, contract and group for explicit property IDs.
+
+    Args:
+        akm_api: Akamai API client
+        property_ids: Property IDs (e.g., prp_123456)
+
+    Returns:
+        List of Property models
+    """
+    properties = []
+    for property_id in property_ids:
+        response = akm_api.get(f"/papi/v1/properties/{property_id}")
+        if isinstance(response, dict) and "error" in response:
+            print(f"Error: {response}", file=sys.stderr)
+            continue
+
+        items = response.get("properties", {}).get("items", [])
+        if not items:
+            print(f"Property {property_id} not found", file=sys.stderr)
+            continue
+
+        properties.append(Property.from_api(items[0]))
+    return properties
+
+
+def list_versions(akm_api: Akamai, prop: Property) -> List[Dict[str, Any]] | None:
+    """List all versions of a property.
+
+    Args:
+        akm_api: Akamai API client
+        prop: Property with contract and group IDs
+
+    Returns:
+        List of version metadata dicts, or None on error
+    """
+    response = akm_api.get(
+        f"/papi/v1/properties/{prop.property_id}/versions",
+        params={"contractId": prop.contract_id, "groupId": prop.group_id},
+    )
+    if isinstance(response, dict) and "error" in response:
+        print(f"Error listing versions of {prop.property_name}: {response}", file=sys.stderr)
+        return None
+    return response.get("versions", {}).get("items", [])
+
+
+def download_property_history(
+    akm_api: Akamai,
+    properties: List[Property],
+    output_dir: str = "./property-history",
+    rate_limit_delay: float = DEFAULT_EXPORT_DELAY,
+    verbose: bool = False,
+) -> None:
+    """Download every version of the given properties into deduplicated stores.
+
+    Versions already present in a property's manifest are skipped without
+    any API call; the remaining rule trees are fetched under the export
+    rate scheduler.
+
+    Args:
+        akm_api: Akamai API client
+        properties: Properties with contract and group IDs
+        output_dir: Output directory path
+        rate_limit_delay: Minimum seconds between rule tree exports
+        verbose: Enable verbose output
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    scheduler = IntervalScheduler(rate_limit_delay, akm_api.deadline)
+
+    fetched_count = 0
+    skipped_count = 0
+    failed_count = 0
+
+    for i, prop in enumerate(properties, 1):
+        property_id = prop.property_id
+        property_name = prop.property_name
+
+        versions = list_versions(akm_api, prop)
+        if versions is None:
+            failed_count += 1
+            continue
+
+        store = RuleTreeStore(
+            os.path.join(output_dir, f"{safe_filename(property_name)}_{property_id}")
+        )
+        missing = [v for v in versions if not store.has_version(v.get("propertyVersion"))]
+        skipped_count += len(versions) - len(missing)
+
+        print(
+            f"[{i}/{len(properties)}] {property_name}: {len(versions)} versions, "
+            f"{len(missing)} to fetch",
+            file=sys.stderr,
+        )
+
+        for version_info in sorted(missing, key=lambda v: v.get("propertyVersion", 0)):
+            version = version_info.get("propertyVersion")
+            scheduler.wait()
+
+            rules_response = akm_api.get(
+                f"/papi/v1/properties/{property_id}/versions/{version}/rules",
+                params={"contractId": prop.contract_id, "groupId": prop.group_id},
+                stream=True,
+            )
+            if isinstance(rules_response, dict) and "error" in rules_response:
+                print(f"✗ {property_name} v{version}: {rules_response}", file=sys.stderr)
+                failed_count += 1
+                continue
+
+            before = store.new_objects
+            store.add_version(version, rules_response, version_info)
+            fetched_count += 1
+
+            if verbose:
+                print(
+                    f"✓ {property_name} v{version} ({store.new_objects - before} new rule nodes)",
+                    file=sys.stderr,
+                )
+            else:
+                print(f"✓ {property_name} v{version}", file=sys.stderr)
+
+    print(
+        f"\nFetched {fetched_count} versions, skipped {skipped_count} already stored, "
+        f"{failed_count} failed",
+        file=sys.stderr,
+    )
+
+
+def add_args(parser: argparse.ArgumentParser) -> None:
+    """Add arguments to parser."""
+    parser.add_argument(
+        "property_ids",
+        nargs="*",
+        help="Property IDs (e.g., prp_123456); default: all properties",
+    )
+    parser.add_argument(
+        "-g",
+        "--group",
+        type=str,
+        default=None,
+        help="Filter by group ID when downloading all properties (e.g., grp_123456)",
+    )
+    parser.add_argument(
+        "--name",
+        action="append",
+        default=None,
+        metavar="GLOB",
+        help="Only properties whose name matches this glob (repeatable, case-insensitive)",
+    )
+    parser.add_argument(
+        "--contract",
+        action="append",
+        default=None,
+        help="Only properties in this contract ID (repeatable)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=str,
+        default="./property-history",
+        help="Output directory (default: ./property-history)",
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=DEFAULT_EXPORT_DELAY,
+        help=f"Minimum seconds between rule tree exports (default: {DEFAULT_EXPORT_DELAY}, for 3/min rate limit)",
+    )
+    add_common_args(parser)
+
+
+def run(options: argparse.Namespace) -> None:
+    """Run the command with parsed options."""
+    akm_api = Akamai.FromOptions(options)
+
+    if options.property_ids:
+        properties = resolve_properties(akm_api, options.property_ids)
+    else:
+        selector = PropertySelector(name_patterns=options.name, contracts=options.contract)
+        properties = collect_properties(akm_api, options.group, options.verbose, selector)
+
+    if not properties:
+        print("No properties found", file=sys.stderr)
+        return
+
+    download_property_history(
+        akm_api,
+        properties,
+        output_dir=options.output_dir,
+        rate_limit_delay=options.delay,
+        verbose=options.verbose,
+    )
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Download every version of Akamai properties with deduplicated storage"
+    )
+    add_args(parser)
+    options = parser.parse_args()
+    run(options)
+
+
+if __name__ == "__main__":
+    main()
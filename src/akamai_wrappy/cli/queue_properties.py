@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+"""Queue property rule tree exports for `awp worker` processes."""
+
+import argparse
+import os
+import sys
+
+from tabulate import tabulate
+
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.cli.common import add_common_args, get_table_format
+from akamai_wrappy.cli.properties_download import (
+    DEFAULT_EXPORT_DELAY,
+    collect_properties,
+    plan_exports,
+)
+from akamai_wrappy.journal import item_key
+from akamai_wrappy.selection import ORDER_CHOICES, PropertySelector, parse_since, select_and_order
+from akamai_wrappy.workqueue import WorkQueue
+
+
+def queue_properties(
+    akm_api: Akamai,
+    queue: WorkQueue,
+    output_dir: str = "./properties",
+    group_filter: str | None = None,
+    selector: PropertySelector | None = None,
+    order: str = "listing",
+    verbose: bool = False,
+) -> int:
+    """Plan property exports for the client's account and add them to a queue.
+
+    Tasks are keyed by account, property and version, so queuing the same
+    account again only adds new versions. Run once per account (``-k``) to
+    build a multi-account job.
+
+    Args:
+        akm_api: Akamai API client
+        queue: Work queue
+        output_dir: Directory workers write this account's rule trees to
+        group_filter: Optional group ID filter
+        selector: Optional property selector
+        order: Export order, one of ORDER_CHOICES
+        verbose: Enable verbose output
+
+    Returns:
+        Number of tasks added, or -1 if listing failed
+    """
+    properties_list = collect_properties(akm_api, group_filter, verbose, selector)
+    if properties_list is None:
+        return -1
+    print(f"Found {len(properties_list)} properties", file=sys.stderr)
+
+    work_items = select_and_order(akm_api, plan_exports(properties_list), selector, order, verbose)
+    account = akm_api.account_switch_key or ""
+    tasks = []
+    for item in work_items:
+        item["accountSwitchKey"] = akm_api.account_switch_key
+        item["outputDir"] = os.path.abspath(output_dir)
+        tasks.append((f"{account}|{item_key(item)}", item))
+
+    added = queue.enqueue(tasks)
+    print(
+        f"Queued {added} exports ({len(tasks) - added} already in the queue)",
+        file=sys.stderr,
+    )
+    return added
+
+
+def print_status(queue: WorkQueue, options: argparse.Namespace) -> None:
+    """Print task counts and failures of a queue."""
+    counts = queue.counts()
+    print(tabulate([counts], headers="keys", tablefmt=get_table_format(options)))
+    failures = queue.failures()
+    if failures:
+        print("\nFailed:")
+        print(tabulate(failures, headers=["task", "error"], tablefmt=get_table_format(options)))
+
+
+def add_args(parser: argparse.ArgumentParser) -> None:
+    """Add arguments to parser."""
+    parser.add_argument(
+        "queue",
+        help="Queue database file (created if missing, shared with workers)",
+    )
+    parser.add_argument(
+        "-g",
+        "--group",
+        type=str,
+        default=None,
+        help="Filter by group ID (e.g., grp_123456)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=str,
+        default="./properties",
+        help="Directory workers write rule trees to (default: ./properties)",
+    )
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=DEFAULT_EXPORT_DELAY,
+        help=f"Minimum seconds between exports per account across all workers (default: {DEFAULT_EXPORT_DELAY})",
+    )
+    parser.add_argument(
+        "--name",
+        action="append",
+        default=None,
+        metavar="GLOB",
+        help="Only properties whose name matches this glob (repeatable, case-insensitive)",
+    )
+    parser.add_argument(
+        "--name-regex",
+        type=str,
+        default=None,
+        help="Only properties whose name matches this regular expression",
+    )
+    parser.add_argument(
+        "--contract",
+        action="append",
+        default=None,
+        help="Only properties in this contract ID (repeatable)",
+    )
+    parser.add_argument(
+        "--changed-since",
+        type=parse_since,
+        default=None,
+        help="Only properties whose exported version changed since a date or age (e.g. 7d)",
+    )
+    parser.add_argument(
+        "--order",
+        choices=ORDER_CHOICES,
+        default="listing",
+        help="Export order (default: listing)",
+    )
+    parser.add_argument(
+        "--status",
+        action="store_true",
+        help="Only print the queue status",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="Move failed tasks back to the queue",
+    )
+    add_common_args(parser)
+
+
+def run(options: argparse.Namespace) -> None:
+    """Run the command with parsed options."""
+    queue = WorkQueue(options.queue)
+
+    if options.status or options.retry_failed:
+        if options.retry_failed:
+            print(f"Requeued {queue.retry_failed()} failed tasks", file=sys.stderr)
+        print_status(queue, options)
+        return
+
+    queue.set_meta("exportDelay", options.delay)
+    akm_api = Akamai.FromOptions(options)
+    selector = PropertySelector(
+        name_patterns=options.name,
+        name_regex=options.name_regex,
+        contracts=options.contract,
+        changed_since=options.changed_since,
+    )
+    added = queue_properties(
+        akm_api,
+        queue,
+        output_dir=options.output_dir,
+        group_filter=options.group,
+        selector=selector,
+        order=options.order,
+        verbose=options.verbose,
+    )
+    if added < 0:
+        sys.exit(1)
+    print(f"Start workers with: awp worker {options.queue}", file=sys.stderr)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Queue Akamai property rule tree exports for awp worker processes"
+    )
+    add_args(parser)
+    options = parser.parse_args()
+    run(options)
+
+
+if __name__ == "__main__":
+    main()
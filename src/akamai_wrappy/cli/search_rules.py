@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""Search the rule trees of all Akamai properties with a JSONPath query."""
+
+import argparse
+import json
+import sys
+from typing import Any, Dict
+
+from tabulate import tabulate
+
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.cli.common import add_common_args, get_table_format
+from akamai_wrappy.client import ApiError
+from akamai_wrappy.rulesearch import DEFAULT_CACHE_TTL, VERSION_FILTERS, search_rules
+
+
+def match_row(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the table row of a search result."""
+    return {
+        "propertyName": result.get("propertyName"),
+        "propertyId": result.get("propertyId"),
+        "version": result.get("propertyVersion"),
+        "production": result.get("productionStatus", ""),
+        "staging": result.get("stagingStatus", ""),
+        "latest": "yes" if result.get("isLatest") else "",
+        "matches": len(result.get("matchLocations") or []),
+    }
+
+
+def add_args(parser: argparse.ArgumentParser) -> None:
+    """Add arguments to parser."""
+    parser.add_argument(
+        "match",
+        help="JSONPath matched against each rule tree, e.g. \"$..behaviors[?(@.name == 'caching')]\"",
+    )
+    parser.add_argument(
+        "--qualifier",
+        action="append",
+        default=None,
+        metavar="JSONPATH",
+        help="Additional JSONPath a rule tree must match (repeatable)",
+    )
+    parser.add_argument(
+        "--contract",
+        type=str,
+        default=None,
+        help="Only search properties of this contract ID",
+    )
+    parser.add_argument(
+        "-g",
+        "--group",
+        type=str,
+        default=None,
+        help="Only search properties of this group ID",
+    )
+    parser.add_argument(
+        "--versions",
+        choices=VERSION_FILTERS,
+        default="all",
+        help="Only report latest, production-active or staging-active versions (default: all)",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Stream matches as JSON lines instead of printing a table",
+    )
+    parser.add_argument(
+        "--max-wait",
+        type=float,
+        default=1800,
+        help="Maximum seconds to wait for the search (default: 1800)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the local result cache",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_CACHE_TTL,
+        help=f"Seconds a completed search is reused (default: {DEFAULT_CACHE_TTL})",
+    )
+    add_common_args(parser)
+
+
+def run(options: argparse.Namespace) -> None:
+    """Run the command with parsed options."""
+    akm_api = Akamai.FromOptions(options)
+
+    def on_status(status: str) -> None:
+        if status == "CACHED":
+            print("Using cached results (--no-cache to search again)", file=sys.stderr)
+        else:
+            print(f"Search status: {status}", file=sys.stderr)
+
+    rows = []
+    count = 0
+    try:
+        for result in search_rules(
+            akm_api,
+            options.match,
+            qualifiers=options.qualifier,
+            contract_id=options.contract,
+            group_id=options.group,
+            versions=options.versions,
+            use_cache=not options.no_cache,
+            cache_ttl=options.cache_ttl,
+            max_wait=options.max_wait,
+            on_status=on_status,
+        ):
+            count += 1
+            if options.json:
+                print(json.dumps(result), flush=True)
+                continue
+            print(f"✓ {result.get('propertyName')} v{result.get('propertyVersion')}", file=sys.stderr)
+            rows.append(match_row(result))
+    except ApiError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    if not options.json:
+        if rows:
+            print(tabulate(rows, headers="keys", tablefmt=get_table_format(options)))
+        else:
+            print("No matches found")
+    print(f"\n{count} matching property versions", file=sys.stderr)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Search the rule trees of all Akamai properties with a JSONPath query"
+    )
+    add_args(parser)
+    options = parser.parse_args()
+    run(options)
+
+
+if __name__ == "__main__":
+    main()
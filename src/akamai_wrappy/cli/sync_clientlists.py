@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""Incrementally mirror Akamai client lists to CSV files."""
+
+import argparse
+import sys
+from typing import Any, Dict, List
+
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.cli.common import add_common_args
+from akamai_wrappy.cli.download_clientlists import write_clientlist_csv
+from akamai_wrappy.cli.list_clientlists import list_clientlists
+from akamai_wrappy.models import ClientList
+from akamai_wrappy.sync import ListMirror, add_sync_args, run_sync, sync_lists
+
+
+def list_version(cl: ClientList) -> List[Any]:
+    """Return the change-detection key of a client list."""
+    return [cl.version, cl.update_date, cl.staging_status, cl.production_status]
+
+
+class ClientListMirror(ListMirror):
+    """Client lists, changed when their version, update time or activation status changes."""
+
+    kind = "clientlists"
+    noun = "client lists"
+    default_output_dir = "./clientlists"
+
+    def list(self, akm_api: Akamai, verbose: bool = False) -> List[ClientList]:
+        return list_clientlists(akm_api, verbose=verbose)
+
+    def list_id(self, item: ClientList) -> str:
+        return item.list_id
+
+    def version(self, item: ClientList) -> Any:
+        return list_version(item)
+
+    def show_version(self, version: Any) -> Any:
+        return version[0]
+
+    def fetch(self, akm_api: Akamai, list_id: str) -> Any:
+        response = akm_api.get(
+            f"/client-list/v1/lists/{list_id}",
+            params={"includeItems": "true"},
+            stream=True,
+        )
+        if isinstance(response, dict) and "error" in response:
+            return response
+        return ClientList.from_api(response)
+
+    def write(self, item: ClientList, output_dir: str) -> str:
+        return write_clientlist_csv(item, output_dir)
+
+    def describe(self, item: ClientList) -> str:
+        return f"{item.raw_item_count} {item.type}"
+
+
+def sync_clientlists(
+    akm_api: Akamai,
+    output_dir: str = "./clientlists",
+    full: bool = False,
+    prune: bool = True,
+    verbose: bool = False,
+) -> Dict[str, int]:
+    """Bring a directory of client list CSV files up to date.
+
+    Only the metadata listing is fetched on every run; items are fetched
+    for lists whose version, update time or activation status (written
+    into every CSV row) differs from the sync state, or whose CSV file is
+    missing.
+
+    Args:
+        akm_api: Akamai API client
+        output_dir: Mirror directory (same file layout as download-clientlists)
+        full: Refetch every list regardless of its version
+        prune: Delete files of lists that no longer exist
+        verbose: Enable verbose output
+
+    Returns:
+        Dict with updated, unchanged, deleted and failed counts
+    """
+    return sync_lists(akm_api, ClientListMirror(), output_dir, full=full, prune=prune, verbose=verbose)
+
+
+def add_args(parser: argparse.ArgumentParser) -> None:
+    """Add arguments to parser."""
+    add_sync_args(parser, ClientListMirror())
+    add_common_args(parser)
+
+
+def run(options: argparse.Namespace) -> None:
+    """Run the command with parsed options."""
+    akm_api = Akamai.FromOptions(options)
+    if not run_sync(akm_api, ClientListMirror(), options):
+        sys.exit(1)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Incrementally mirror Akamai client lists to CSV files"
+    )
+    add_args(parser)
+    options = parser.parse_args()
+    run(options)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+"""Incrementally mirror Akamai network lists to CSV files."""
+
+import argparse
+import sys
+from typing import Any, Dict, List
+
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.cli.common import add_common_args
+from akamai_wrappy.cli.download_networklists import write_networklist_csv
+from akamai_wrappy.cli.list_networklists import list_networklists
+from akamai_wrappy.models import NetworkList
+from akamai_wrappy.sync import ListMirror, add_sync_args, run_sync, sync_lists
+
+
+class NetworkListMirror(ListMirror):
+    """Network lists, changed when their ``syncPoint`` changes."""
+
+    kind = "networklists"
+    noun = "network lists"
+    version_label = "syncPoint"
+    default_output_dir = "./networklists"
+
+    def list(self, akm_api: Akamai, verbose: bool = False) -> List[NetworkList]:
+        return list_networklists(akm_api, verbose=verbose)
+
+    def list_id(self, item: NetworkList) -> str:
+        return item.unique_id
+
+    def version(self, item: NetworkList) -> Any:
+        return item.sync_point
+
+    def fetch(self, akm_api: Akamai, list_id: str) -> Any:
+        response = akm_api.get(
+            f"/network-list/v2/network-lists/{list_id}",
+            params={"includeElements": "true"},
+            stream=True,
+        )
+        if isinstance(response, dict) and "error" in response:
+            return response
+        return NetworkList.from_api(response)
+
+    def write(self, item: NetworkList, output_dir: str) -> str:
+        return write_networklist_csv(item, output_dir)
+
+    def describe(self, item: NetworkList) -> str:
+        return f"{len(item.elements)} {item.type}"
+
+
+def sync_networklists(
+    akm_api: Akamai,
+    output_dir: str = "./networklists",
+    full: bool = False,
+    prune: bool = True,
+    verbose: bool = False,
+) -> Dict[str, int]:
+    """Bring a directory of network list CSV files up to date.
+
+    Only the metadata listing is fetched on every run; elements are
+    fetched for lists whose ``syncPoint`` differs from the one recorded in
+    the directory's sync state (or whose CSV file is missing).
+
+    Args:
+        akm_api: Akamai API client
+        output_dir: Mirror directory (same file layout as download-networklists)
+        full: Refetch every list regardless of its syncPoint
+        prune: Delete files of lists that no longer exist
+        verbose: Enable verbose output
+
+    Returns:
+        Dict with updated, unchanged, deleted and failed counts
+    """
+    return sync_lists(akm_api, NetworkListMirror(), output_dir, full=full, prune=prune, verbose=verbose)
+
+
+def add_args(parser: argparse.ArgumentParser) -> None:
+    """Add arguments to parser."""
+    add_sync_args(parser, NetworkListMirror())
+    add_common_args(parser)
+
+
+def run(options: argparse.Namespace) -> None:
+    """Run the command with parsed options."""
+    akm_api = Akamai.FromOptions(options)
+    if not run_sync(akm_api, NetworkListMirror(), options):
+        sys.exit(1)
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Incrementally mirror Akamai network lists to CSV files"
+    )
+    add_args(parser)
+    options = parser.parse_args()
+    run(options)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+"""Process property exports queued with `awp queue-properties`."""
+
+import argparse
+import os
+import socket
+import sys
+import threading
+import time
+from typing import Dict
+
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.cli.common import add_common_args
+from akamai_wrappy.cli.properties_download import DEFAULT_EXPORT_DELAY, download_property_rules
+from akamai_wrappy.workqueue import Task, WorkQueue
+
+
+class LeaseKeeper:
+    """Renew a task lease in the background while the task is processed."""
+
+    def __init__(self, queue: WorkQueue, task: Task, owner: str):
+        self.queue = queue
+        self.task = task
+        self.owner = owner
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        interval = max(1.0, self.queue.lease_seconds / 3)
+        while not self._stop.wait(interval):
+            if not self.queue.renew(self.task, self.owner):
+                self.lost = True
+                return
+
+    def __enter__(self) -> "LeaseKeeper":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(
+    akm_api: Akamai,
+    queue: WorkQueue,
+    worker_id: str,
+    output_dir: str | None = None,
+    max_attempts: int = 3,
+    exit_when_empty: bool = True,
+    poll_interval: float = 5,
+    verbose: bool = False,
+) -> Dict[str, int]:
+    """Lease, export and acknowledge tasks until the queue is drained.
+
+    Each export first claims a slot of its account's shared rate budget,
+    so the delay set by the coordinator holds across all workers.
+
+    Args:
+        akm_api: Akamai API client (account switch key is taken from each task)
+        queue: Work queue
+        worker_id: Lease owner name
+        output_dir: Override the output directory stored in the tasks
+        max_attempts: Attempts before a task is marked failed
+        exit_when_empty: Stop once no task is pending or leased
+        poll_interval: Seconds to wait when no task is available
+        verbose: Enable verbose output
+
+    Returns:
+        Dict with done and failed counts for this worker
+    """
+    delay = queue.get_meta("exportDelay", DEFAULT_EXPORT_DELAY)
+    stats = {"done": 0, "failed": 0}
+
+    while True:
+        task = queue.lease(worker_id)
+        if task is None:
+            counts = queue.counts()
+            if exit_when_empty and not counts["pending"] and not counts["leased"]:
+                break
+            # Leases held by other workers may still expire and come back
+            time.sleep(poll_interval)
+            continue
+
+        item = task.payload
+        account = item.get("accountSwitchKey")
+        with LeaseKeeper(queue, task, worker_id) as keeper:
+            wait = queue.claim_slot(f"papi-rules:{account or 'default'}", delay)
+            if wait > 0:
+                if verbose:
+                    print(f"Waiting {wait:.1f}s for a rate slot", file=sys.stderr)
+                time.sleep(wait)
+
+            akm_api.account_switch_key = account
+            target_dir = output_dir or item.get("outputDir") or "./properties"
+            os.makedirs(target_dir, exist_ok=True)
+            output_file = download_property_rules(
+                akm_api,
+                item["propertyId"],
+                item["propertyName"],
+                item["version"],
+                item["contractId"],
+                item["groupId"],
+                target_dir,
+            )
+
+        if keeper.lost:
+            print(f"Lease lost for {task.key}, result discarded", file=sys.stderr)
+            continue
+        if output_file:
+            queue.ack(task, worker_id, output_file)
+            stats["done"] += 1
+        else:
+            queue.fail(task, worker_id, "download failed", max_attempts)
+            stats["failed"] += 1
+
+    return stats
+
+
+def add_args(parser: argparse.ArgumentParser) -> None:
+    """Add arguments to parser."""
+    parser.add_argument(
+        "queue",
+        help="Queue database file created by queue-properties",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=str,
+        default=None,
+        help="Override the output directory stored in the queue",
+    )
+    parser.add_argument(
+        "--id",
+        type=str,
+        default=None,
+        dest="worker_id",
+        help="Worker name used for leases (default: host:pid)",
+    )
+    parser.add_argument(
+        "--lease",
+        type=float,
+        default=600,
+        help="Lease duration in seconds; leases of crashed workers expire after this (default: 600)",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=3,
+        help="Attempts per task before it is marked failed (default: 3)",
+    )
+    parser.add_argument(
+        "--wait",
+        action="store_true",
+        help="Keep waiting for new tasks instead of exiting when the queue is drained",
+    )
+    add_common_args(parser)
+
+
+def run(options: argparse.Namespace) -> None:
+    """Run the command with parsed options."""
+    if not os.path.exists(options.queue):
+        print(f"Error: queue {options.queue} not found", file=sys.stderr)
+        sys.exit(1)
+
+    queue = WorkQueue(options.queue, lease_seconds=options.lease)
+    akm_api = Akamai.FromOptions(options)
+    worker_id = options.worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
+    print(f"Worker {worker_id} started", file=sys.stderr)
+    try:
+        stats = run_worker(
+            akm_api,
+            queue,
+            worker_id,
+            output_dir=options.output_dir,
+            max_attempts=options.max_attempts,
+            exit_when_empty=not options.wait,
+            verbose=options.verbose,
+        )
+    except KeyboardInterrupt:
+        # The current lease expires and another worker picks the task up
+        print("\nStopped", file=sys.stderr)
+        return
+
+    counts = queue.counts()
+    print(
+        f"\nWorker {worker_id}: exported {stats['done']}, failed {stats['failed']} "
+        f"(queue: {counts['done']} done, {counts['failed']} failed)",
+        file=sys.stderr,
+    )
+
+
+def main():
+    """CLI entry point."""
+    parser = argparse.ArgumentParser(
+        description="Process property exports queued with awp queue-properties"
+    )
+    add_args(parser)
+    options = parser.parse_args()
+    run(options)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""Streaming library facade over the Akamai API client.
+
+``Client`` yields typed models one at a time instead of printing and
+returning complete lists, so services embedding akamai-wrappy can process
+accounts of any size in constant memory::
+
+    from akamai_wrappy import Client
+
+    client = Client(section="default")
+    for prop in client.iter_properties():
+        ...
+    for export in client.export_rules(client.iter_properties(), output_dir="out"):
+        if not export.ok:
+            ...
+
+Nothing is written to stdout or stderr: progress is reported through an
+optional ``progress(level, message)`` callback, where level is one of
+PROGRESS_LEVELS. A failure that ends an iteration raises ApiError; a
+failure that only affects one item is reported as a warning (listings)
+or carried by the yielded result (exports).
+"""
+
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from akamai_wrappy import codec
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.files import atomic_write, rule_tree_path
+from akamai_wrappy.models import ClientList, Group, NetworkList, Property
+from akamai_wrappy.ratelimit import IntervalScheduler
+from akamai_wrappy.timeouts import DeadlineExceeded
+
+PROGRESS_LEVELS = ("debug", "info", "warning", "error")
+
+ProgressCallback = Callable[[str, str], None]
+
+
+class ApiError(RuntimeError):
+    """Raised when a request an iteration depends on fails."""
+
+    def __init__(self, message: str, response: Optional[Dict[str, Any]] = None):
+        super().__init__(message)
+        self.response = response
+
+
+def _is_error(response: Any) -> bool:
+    return isinstance(response, dict) and "error" in response
+
+
+class RuleExport:
+    """Outcome of one rule tree export."""
+
+    __slots__ = ("property_id", "property_name", "version", "path", "rules", "error")
+
+    def __init__(
+        self,
+        property_id: str,
+        property_name: str,
+        version: int,
+        path: Optional[str] = None,
+        rules: Optional[Dict[str, Any]] = None,
+        error: Any = None,
+    ):
+        self.property_id = property_id
+        self.property_name = property_name
+        self.version = version
+        self.path = path
+        self.rules = rules
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """True if the rule tree was fetched (and written, with an output dir)."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        state = "ok" if self.ok else "failed"
+        return f"RuleExport({self.property_name!r}, v{self.version}, {state})"
+
+
+class Client:
+    """Iterator-based access to groups, properties, lists and rule trees."""
+
+    def __init__(
+        self,
+        akm_api: Optional[Akamai] = None,
+        progress: Optional[ProgressCallback] = None,
+        **kwargs: Any,
+    ):
+        """Initialize client.
+
+        Args:
+            akm_api: Existing Akamai API client (default: built from kwargs)
+            progress: Optional callback receiving (level, message)
+            **kwargs: Akamai constructor arguments (edgerc_path, section, ...)
+        """
+        self.api = akm_api if akm_api is not None else Akamai(**kwargs)
+        self.progress = progress
+
+    def _report(self, level: str, message: str) -> None:
+        if self.progress is not None:
+            self.progress(level, message)
+
+    def iter_groups(self) -> Iterator[Group]:
+        """Yield all PAPI groups.
+
+        Raises:
+            ApiError: If the groups listing fails
+        """
+        self._report("debug", "Fetching groups...")
+        response = self.api.get("/papi/v1/groups")
+        if _is_error(response):
+            raise ApiError(f"Error: {response}", response)
+        items = response.get("groups", {}).get("items", [])
+        self._report("debug", f"Found {len(items)} groups")
+        for item in items:
+            yield Group.from_api(item)
+
+    def search_groups(self, name: str) -> Iterator[Group]:
+        """Yield groups whose name contains ``name`` (case-insensitive)."""
+        search_lower = name.lower()
+        for group in self.iter_groups():
+            if search_lower in group.group_name.lower():
+                yield group
+
+    def iter_properties(
+        self,
+        group_filter: Optional[str] = None,
+        selector: Optional[Any] = None,
+        delay: float = 0,
+    ) -> Iterator[Property]:
+        """Yield properties of all groups and contracts.
+
+        One contract is listed at a time, and its properties are yielded
+        before the next listing request is made.
+
+        Args:
+            group_filter: Optional group ID filter (e.g., grp_123456)
+            selector: Optional PropertySelector applied during listing
+            delay: Seconds to wait before each properties listing request
+
+        Raises:
+            ApiError: If the groups listing fails (a failed contract listing
+                is reported as a warning and skipped)
+        """
+        for group in self.iter_groups():
+            group_id = group.group_id
+
+            # Filter by group ID if specified
+            if group_filter and group_filter != group_id:
+                continue
+
+            for contract_id in group.contract_ids:
+                # Skip listing contracts the selector excludes
+                if selector and not selector.wants_contract(contract_id):
+                    continue
+
+                self._report("debug", f"Fetching: {group.group_name} ({group_id})")
+                if delay:
+                    time.sleep(delay)
+
+                response = self.api.get(
+                    "/papi/v1/properties",
+                    params={"contractId": contract_id, "groupId": group_id},
+                )
+                if _is_error(response):
+                    self._report("warning", f"Warning: {response}")
+                    continue
+
+                for item in response.get("properties", {}).get("items", []):
+                    prop = Property.from_api(item, contract_id=contract_id, group_id=group_id)
+                    if selector and not selector.matches(prop):
+                        continue
+                    yield prop
+
+    def iter_networklists(self) -> Iterator[NetworkList]:
+        """Yield network list metadata (without elements).
+
+        Raises:
+            ApiError: If the listing fails
+        """
+        self._report("debug", "Fetching network lists...")
+        response = self.api.get("/network-list/v2/network-lists")
+        if _is_error(response):
+            raise ApiError(f"Error: {response}", response)
+        items = response.get("networkLists", [])
+        self._report("debug", f"Found {len(items)} network lists")
+        for item in items:
+            yield NetworkList.from_api(item)
+
+    def iter_clientlists(self) -> Iterator[ClientList]:
+        """Yield client list metadata (without items).
+
+        Raises:
+            ApiError: If the listing fails
+        """
+        self._report("debug", "Fetching client lists...")
+        response = self.api.get("/client-list/v1/lists")
+        if _is_error(response):
+            raise ApiError(f"Error: {response}", response)
+        items = response.get("content", [])
+        self._report("debug", f"Found {len(items)} client lists")
+        for item in items:
+            yield ClientList.from_api(item)
+
+    def search_rules(self, match: str, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        """Yield property versions whose rule tree matches a JSONPath query.
+
+        Runs a PAPI bulk rules search on the server; see
+        akamai_wrappy.rulesearch.search_rules for the keyword arguments.
+        """
+        from akamai_wrappy.rulesearch import search_rules
+
+        kwargs.setdefault("on_status", lambda status: self._report("debug", f"Search status: {status}"))
+        return search_rules(self.api, match, **kwargs)
+
+    def export_property_rules(
+        self,
+        property_id: str,
+        property_name: str,
+        version: int,
+        contract_id: str,
+        group_id: str,
+        output_dir: Optional[str] = None,
+    ) -> RuleExport:
+        """Fetch one property version's rule tree.
+
+        Args:
+            property_id: Property ID
+            property_name: Property name
+            version: Property version
+            contract_id: Contract ID
+            group_id: Group ID
+            output_dir: Write the rule tree to ``<name>_v<version>.json`` here
+                instead of keeping it on the result
+
+        Returns:
+            RuleExport with either the path or the rules, or the error
+        """
+        result = RuleExport(property_id, property_name, version)
+        try:
+            response = self.api.get(
+                f"/papi/v1/properties/{property_id}/versions/{version}/rules",
+                params={"contractId": contract_id, "groupId": group_id},
+                stream=True,
+            )
+            if _is_error(response):
+                result.error = response
+                self._report("error", f"Error downloading {property_name}: {response}")
+                return result
+
+            if output_dir is None:
+                result.rules = response
+            else:
+                path = rule_tree_path(output_dir, property_name, version)
+                # Write atomically so an interrupted run never leaves a truncated file
+                atomic_write(path, codec.dumps(response, indent=True))
+                result.path = path
+        except DeadlineExceeded:
+            # Ends the whole export, not just this property
+            raise
+        except Exception as e:
+            result.error = str(e)
+            self._report("error", f"✗ Failed to download {property_name}: {e}")
+            return result
+
+        self._report("info", f"✓ {property_name} v{version}")
+        return result
+
+    def export_rules(
+        self,
+        properties: Iterable[Property],
+        output_dir: Optional[str] = None,
+        delay: float = 0,
+    ) -> Iterator[RuleExport]:
+        """Export the rule tree of each property's export version.
+
+        Properties are consumed lazily, so a generator such as
+        iter_properties() is never materialized.
+
+        Args:
+            properties: Properties to export (production version if active,
+                otherwise latest)
+            output_dir: Directory to write rule trees to (created if
+                needed); without it each result carries the rule tree
+            delay: Minimum seconds between the start of two exports
+
+        Yields:
+            RuleExport per property, failed ones included
+        """
+        if output_dir is not None:
+            os.makedirs(output_dir, exist_ok=True)
+        # Time spent downloading counts towards the delay
+        scheduler = IntervalScheduler(delay, self.api.deadline)
+        for prop in properties:
+            version = prop.export_version
+            if not (prop.property_id and prop.property_name and version and prop.contract_id and prop.group_id):
+                self._report("warning", f"✗ Skipping incomplete property data: {prop}")
+                continue
+            scheduler.wait()
+            yield self.export_property_rules(
+                prop.property_id,
+                prop.property_name,
+                version,
+                prop.contract_id,
+                prop.group_id,
+                output_dir,
+            )
@@ -0,0 +1,159 @@
+"""Pluggable JSON codec.
+
+Uses the fastest installed backend (orjson, then ujson) and falls back to
+the standard library. All backends decode from bytes and encode to UTF-8
+bytes with the same layout (2-space indent or compact separators,
+non-ASCII characters written as UTF-8), so output files and content
+hashes do not depend on which backend is installed (only the exponent
+format of very small or large floats can differ).
+
+Set ``AWP_JSON_BACKEND`` (orjson, ujson or stdlib) to force a backend.
+"""
+
+import json
+import os
+from typing import Any, Callable, Dict, List, Union
+
+BACKENDS = ("orjson", "ujson", "stdlib")
+
+JsonInput = Union[bytes, bytearray, memoryview, str]
+
+
+def _stdlib_loads(data: JsonInput) -> Any:
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any, indent: bool, sort_keys: bool) -> bytes:
+    return json.dumps(
+        obj,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        sort_keys=sort_keys,
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+
+def _load_orjson() -> Dict[str, Callable]:
+    import orjson
+
+    def dumps(obj: Any, indent: bool, sort_keys: bool) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+
+    return {"loads": orjson.loads, "dumps": dumps}
+
+
+def _load_ujson() -> Dict[str, Callable]:
+    import ujson
+
+    def loads(data: JsonInput) -> Any:
+        if isinstance(data, (memoryview, bytearray)):
+            data = bytes(data)
+        return ujson.loads(data)
+
+    def dumps(obj: Any, indent: bool, sort_keys: bool) -> bytes:
+        return ujson.dumps(
+            obj,
+            indent=2 if indent else 0,
+            sort_keys=sort_keys,
+            ensure_ascii=False,
+            escape_forward_slashes=False,
+        ).encode("utf-8")
+
+    return {"loads": loads, "dumps": dumps}
+
+
+_LOADERS = {"orjson": _load_orjson, "ujson": _load_ujson}
+
+_backend_name = "stdlib"
+_loads: Callable[[JsonInput], Any] = _stdlib_loads
+_dumps: Callable[[Any, bool, bool], bytes] = _stdlib_dumps
+
+
+def available_backends() -> List[str]:
+    """Return the names of the backends that can be used in this environment."""
+    names = []
+    for name in BACKENDS:
+        if name == "stdlib":
+            names.append(name)
+            continue
+        try:
+            _LOADERS[name]()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def set_backend(name: str) -> None:
+    """Select a JSON backend.
+
+    Args:
+        name: One of BACKENDS
+
+    Raises:
+        ValueError: If the backend name is unknown
+        ImportError: If the backend library is not installed
+    """
+    global _backend_name, _loads, _dumps
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown JSON backend '{name}' (choose from {', '.join(BACKENDS)})")
+
+    if name == "stdlib":
+        _loads, _dumps = _stdlib_loads, _stdlib_dumps
+    else:
+        funcs = _LOADERS[name]()
+        _loads, _dumps = funcs["loads"], funcs["dumps"]
+    _backend_name = name
+
+
+def backend() -> str:
+    """Return the name of the active backend."""
+    return _backend_name
+
+
+def loads(data: JsonInput) -> Any:
+    """Decode JSON from bytes (or str).
+
+    Raises:
+        ValueError: If the data is not valid JSON
+    """
+    return _loads(data)
+
+
+def dumps(obj: Any, indent: bool = False, sort_keys: bool = False) -> bytes:
+    """Encode an object to UTF-8 JSON bytes.
+
+    Args:
+        obj: Object to encode
+        indent: Indent with 2 spaces (default: compact)
+        sort_keys: Sort object keys
+
+    Returns:
+        Encoded JSON bytes
+    """
+    return _dumps(obj, indent, sort_keys)
+
+
+def _select_default_backend() -> None:
+    """Pick the backend from AWP_JSON_BACKEND or the fastest installed one."""
+    forced = os.environ.get("AWP_JSON_BACKEND")
+    if forced:
+        set_backend(forced)
+        return
+    for name in ("orjson", "ujson"):
+        try:
+            set_backend(name)
+            return
+        except ImportError:
+            continue
+
+
+_select_default_backend()
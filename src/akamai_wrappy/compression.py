@@ -0,0 +1,79 @@
+"""Content-encoding negotiation, request body compression and byte counts.
+
+Responses are requested with every encoding urllib3 can decode in this
+environment (gzip and deflate always, brotli with the ``brotli`` extra,
+zstd with ``zstandard``), and decoded chunk by chunk as they are read.
+Request bodies are only compressed when asked to, since not every API
+accepts ``Content-Encoding: gzip``.
+"""
+
+import gzip
+from typing import Any, Iterator, Optional
+
+from urllib3.util.request import ACCEPT_ENCODING
+
+# Chunk size for streamed response bodies
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def accept_encoding(enabled: bool = True) -> str:
+    """Return the Accept-Encoding header value to send.
+
+    Args:
+        enabled: Negotiate compression; False asks for identity encoding
+            (e.g. to measure the uncompressed baseline)
+    """
+    if not enabled:
+        return "identity"
+    return ", ".join(e.strip() for e in ACCEPT_ENCODING.split(","))
+
+
+def gzip_body(body: bytes, level: int = 6) -> bytes:
+    """Gzip a request body.
+
+    The header timestamp is zeroed so equal bodies compress to equal bytes
+    (recorded cassettes match them on replay).
+    """
+    return gzip.compress(body, compresslevel=level, mtime=0)
+
+
+def wire_bytes_received(response: Any, decoded_bytes: int) -> int:
+    """Return the number of body bytes a response took on the wire.
+
+    Uses the byte count of the underlying urllib3 response, then the
+    Content-Length header (replayed responses), then the decoded size.
+
+    Args:
+        response: requests Response whose body was read
+        decoded_bytes: Size of the decoded body
+    """
+    tell = getattr(getattr(response, "raw", None), "tell", None)
+    if callable(tell):
+        try:
+            count = tell()
+        except (OSError, ValueError):
+            count = None
+        if isinstance(count, int) and count > 0:
+            return count
+    length = response.headers.get("Content-Length") if response.headers else None
+    if length and length.isdigit():
+        return int(length)
+    return decoded_bytes
+
+
+class CountingChunks:
+    """Iterate over body chunks while counting the decoded bytes."""
+
+    def __init__(self, chunks: Iterator[bytes]):
+        self._chunks = chunks
+        self.count = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._chunks:
+            self.count += len(chunk)
+            yield chunk
+
+
+def compression_ratio(wire: int, decoded: int) -> Optional[float]:
+    """Return decoded / wire bytes, or None if nothing was transferred."""
+    return round(decoded / wire, 2) if wire else None
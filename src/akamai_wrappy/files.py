@@ -0,0 +1,59 @@
+"""File helpers shared by the download commands."""
+
+import os
+import tempfile
+from typing import Iterable, Union
+
+
+def safe_filename(name: str) -> str:
+    """Replace characters that are unsafe in file names with underscores.
+
+    Args:
+        name: Raw name (property name, list name, etc.)
+
+    Returns:
+        Sanitized name containing only alphanumerics and ``._-``
+    """
+    return "".join(c if c.isalnum() or c in "._-" else "_" for c in name)
+
+
+def rule_tree_path(output_dir: str, property_name: str, version: int) -> str:
+    """Return the path a property version's rule tree is exported to."""
+    return os.path.join(output_dir, f"{safe_filename(property_name)}_v{version}.json")
+
+
+def atomic_write(path: str, data: Union[str, bytes, Iterable[bytes]], fsync: bool = True) -> None:
+    """Write a file atomically.
+
+    Data is written to a temporary file in the same directory which is then
+    renamed over the target, so readers (and a resumed run) never see a
+    partially written file.
+
+    Args:
+        path: Destination file path
+        data: File contents (str is encoded as UTF-8), or an iterable of
+            bytes chunks written as they arrive
+        fsync: Flush the file to disk before renaming
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if isinstance(data, (bytes, bytearray, memoryview)):
+                f.write(data)
+            else:
+                for chunk in data:
+                    f.write(chunk)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
@@ -0,0 +1,157 @@
+"""Deduplicated on-disk store for property rule-tree versions.
+
+Each property gets a directory with a ``manifest.json`` and an
+``objects/`` directory. Rule nodes are stored content-addressed (SHA-256 of
+their canonical JSON) with their children replaced by references, so a
+new version only adds the rule nodes that actually changed; unchanged
+subtrees are shared with earlier versions.
+"""
+
+import hashlib
+import os
+from typing import Any, Dict, Optional, Set
+
+from akamai_wrappy import codec
+from akamai_wrappy.files import atomic_write
+from akamai_wrappy.pipeline import BatchWriter
+
+MANIFEST_FILENAME = "manifest.json"
+OBJECTS_DIRNAME = "objects"
+
+# Envelope fields of a rules response that are kept per version in the manifest
+_ENVELOPE_FIELDS = ("propertyVersion", "etag", "ruleFormat", "comments")
+
+
+def _canonical(obj: Any) -> bytes:
+    """Return canonical JSON bytes used for hashing."""
+    return codec.dumps(obj, sort_keys=True)
+
+
+class RuleTreeStore:
+    """Version store for one property's rule trees."""
+
+    def __init__(self, directory: str):
+        """Initialize store, loading an existing manifest if present.
+
+        Args:
+            directory: Property history directory
+        """
+        self.directory = directory
+        self.objects_dir = os.path.join(directory, OBJECTS_DIRNAME)
+        self.manifest_path = os.path.join(directory, MANIFEST_FILENAME)
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        self.manifest: Dict[str, Any] = {"versions": {}}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "rb") as f:
+                self.manifest = codec.loads(f.read())
+        self.new_objects = 0
+        # Objects of the version being added; made durable before the manifest
+        self._writer = BatchWriter()
+        self._stored: Set[str] = set()
+
+    def has_version(self, version: int) -> bool:
+        """Return True if the version is already stored."""
+        return str(version) in self.manifest["versions"]
+
+    def _put_object(self, obj: Dict[str, Any]) -> str:
+        """Store an object if not present and return its hash."""
+        data = _canonical(obj)
+        digest = hashlib.sha256(data).hexdigest()
+        path = os.path.join(self.objects_dir, f"{digest}.json")
+        if digest not in self._stored and not os.path.exists(path):
+            self._writer.add(path, data)
+            self.new_objects += 1
+        self._stored.add(digest)
+        return digest
+
+    def _put_rule(self, rule: Dict[str, Any]) -> str:
+        """Store a rule node bottom-up, replacing children with references."""
+        node = dict(rule)
+        children = node.get("children")
+        if isinstance(children, list):
+            node["children"] = [
+                {"$ref": self._put_rule(child)} if isinstance(child, dict) else child
+                for child in children
+            ]
+        return self._put_object(node)
+
+    def add_version(
+        self,
+        version: int,
+        rules_response: Dict[str, Any],
+        version_info: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Store a version's rule tree and record it in the manifest.
+
+        New objects are fsynced in batches (one directory sync per batch)
+        and the manifest is rewritten atomically only after all of them are
+        on disk, so an interrupted run never records a version it has not
+        stored.
+
+        Args:
+            version: Property version number
+            rules_response: Rules response from PAPI
+            version_info: Optional version metadata (note, updatedDate, ...)
+
+        Returns:
+            Hash of the root rule node
+        """
+        try:
+            root = self._put_rule(rules_response.get("rules", {}))
+            self._writer.flush()
+        except BaseException:
+            self._writer.discard()
+            self._stored.clear()
+            raise
+
+        for key in ("propertyId", "propertyName", "contractId", "groupId", "accountId"):
+            if key in rules_response:
+                self.manifest[key] = rules_response[key]
+
+        entry = {key: rules_response[key] for key in _ENVELOPE_FIELDS if key in rules_response}
+        entry["root"] = root
+        if version_info:
+            for key in ("updatedByUser", "updatedDate", "note", "productionStatus", "stagingStatus"):
+                if key in version_info:
+                    entry[key] = version_info[key]
+
+        self.manifest["versions"][str(version)] = entry
+        atomic_write(self.manifest_path, codec.dumps(self.manifest, indent=True, sort_keys=True))
+        return root
+
+    def _load_rule(self, digest: str) -> Dict[str, Any]:
+        """Load a rule node and resolve its child references."""
+        with open(os.path.join(self.objects_dir, f"{digest}.json"), "rb") as f:
+            node = codec.loads(f.read())
+        children = node.get("children")
+        if isinstance(children, list):
+            node["children"] = [
+                self._load_rule(child["$ref"]) if isinstance(child, dict) and "$ref" in child else child
+                for child in children
+            ]
+        return node
+
+    def load_version(self, version: int) -> Dict[str, Any]:
+        """Reconstruct the rules response for a stored version.
+
+        Args:
+            version: Property version number
+
+        Returns:
+            Rules response dict as returned by PAPI
+
+        Raises:
+            KeyError: If the version is not stored
+        """
+        entry = self.manifest["versions"][str(version)]
+        response = {
+            key: self.manifest[key]
+            for key in ("accountId", "contractId", "groupId", "propertyId", "propertyName")
+            if key in self.manifest
+        }
+        for key in _ENVELOPE_FIELDS:
+            if key in entry:
+                response[key] = entry[key]
+        response["rules"] = self._load_rule(entry["root"])
+        return response
@@ -0,0 +1,214 @@
+"""Deduplicated export of the PAPI includes referenced by property rule trees.
+
+Rule trees reference includes through the ``include`` behavior
+(``{"name": "include", "options": {"id": "inc_123"}}``). Many properties
+share the same few includes, so the references of all exported trees are
+collected first and each include version is then fetched once. Include
+rule trees are written to ``includes/`` next to the property files, along
+with an ``includes.json`` reference map linking properties and includes
+in both directions.
+"""
+
+import os
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from akamai_wrappy import codec
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.files import atomic_write, safe_filename
+from akamai_wrappy.models import Include
+from akamai_wrappy.ratelimit import IntervalScheduler
+
+INCLUDES_DIRNAME = "includes"
+REFERENCE_MAP_FILENAME = "includes.json"
+
+
+def find_include_references(rules: Dict[str, Any]) -> List[str]:
+    """Return the IDs of the includes a rule tree references, in tree order.
+
+    Args:
+        rules: Rules response (or its ``rules`` object)
+    """
+    found: Dict[str, None] = {}
+    stack = [rules.get("rules", rules)]
+    while stack:
+        rule = stack.pop()
+        if not isinstance(rule, dict):
+            continue
+        for behavior in rule.get("behaviors") or []:
+            if isinstance(behavior, dict) and behavior.get("name") == "include":
+                include_id = (behavior.get("options") or {}).get("id")
+                if include_id:
+                    found.setdefault(include_id)
+        stack.extend(reversed(rule.get("children") or []))
+    return list(found)
+
+
+def list_includes(akm_api: Akamai, contract_id: str, group_id: str) -> Optional[List[Include]]:
+    """List the includes of one contract and group.
+
+    Returns:
+        List of Include models, or None on error (printed as a warning)
+    """
+    response = akm_api.get(
+        "/papi/v1/includes",
+        params={"contractId": contract_id, "groupId": group_id},
+    )
+    if isinstance(response, dict) and "error" in response:
+        print(f"Warning: listing includes of {contract_id}/{group_id} failed: {response}", file=sys.stderr)
+        return None
+    return [Include.from_api(item) for item in response.get("includes", {}).get("items", [])]
+
+
+def get_include(akm_api: Akamai, include_id: str, contract_id: str, group_id: str) -> Optional[Include]:
+    """Look up one include, e.g. one living in another group than its referrers."""
+    response = akm_api.get(
+        f"/papi/v1/includes/{include_id}",
+        params={"contractId": contract_id, "groupId": group_id},
+    )
+    if isinstance(response, dict) and "error" in response:
+        return None
+    items = response.get("includes", {}).get("items", [])
+    return Include.from_api(items[0]) if items else None
+
+
+def index_includes(
+    akm_api: Akamai,
+    scopes: Iterable[Tuple[str, str]],
+    verbose: bool = False,
+) -> Dict[str, Include]:
+    """List includes of each (contract, group) once and index them by ID."""
+    index: Dict[str, Include] = {}
+    for contract_id, group_id in sorted(set(scopes)):
+        if verbose:
+            print(f"Listing includes: {contract_id}/{group_id}", file=sys.stderr)
+        for include in list_includes(akm_api, contract_id, group_id) or []:
+            index[include.include_id] = include
+    return index
+
+
+def include_path(include: Include, version: int) -> str:
+    """Return the path of an include rule tree, relative to the output directory."""
+    return os.path.join(INCLUDES_DIRNAME, f"{safe_filename(include.include_name)}_v{version}.json")
+
+
+def export_include_rules(akm_api: Akamai, include: Include, version: int, path: str) -> Optional[str]:
+    """Fetch one include version's rule tree and write it to ``path``.
+
+    Returns:
+        None on success, otherwise the error text
+    """
+    response = akm_api.get(
+        f"/papi/v1/includes/{include.include_id}/versions/{version}/rules",
+        params={"contractId": include.contract_id, "groupId": include.group_id},
+        stream=True,
+    )
+    if isinstance(response, dict) and "error" in response:
+        return str(response)
+    atomic_write(path, codec.dumps(response, indent=True))
+    return None
+
+
+def export_includes(
+    akm_api: Akamai,
+    properties: List[Dict[str, Any]],
+    output_dir: str,
+    scheduler: Optional[IntervalScheduler] = None,
+    verbose: bool = False,
+) -> Dict[str, Any]:
+    """Export every include referenced by exported property rule trees.
+
+    Each include version is fetched once, however many properties use it,
+    and include files already present (from an earlier run) are kept.
+
+    Args:
+        akm_api: Akamai API client
+        properties: Export items (propertyId, propertyName, version,
+            contractId, groupId) with ``path`` set to the exported rule tree
+        output_dir: Output directory of the property files
+        scheduler: Scheduler the rule tree exports share (rate limit)
+        verbose: Enable verbose output
+
+    Returns:
+        Reference map, also written to ``includes.json`` in output_dir
+    """
+    # Collect references from the exported trees
+    references: Dict[str, List[str]] = {}
+    referrers: Dict[str, List[Dict[str, Any]]] = {}
+    for item in properties:
+        try:
+            with open(item["path"], "rb") as f:
+                include_ids = find_include_references(codec.loads(f.read()))
+        except (OSError, ValueError) as e:
+            print(f"✗ Cannot read {item['path']}: {e}", file=sys.stderr)
+            continue
+        references[item["propertyId"]] = include_ids
+        for include_id in include_ids:
+            referrers.setdefault(include_id, []).append(item)
+
+    print(
+        f"Found {len(referrers)} unique includes referenced by {sum(1 for ids in references.values() if ids)} properties",
+        file=sys.stderr,
+    )
+
+    # Only the contracts and groups of referring properties are listed
+    scopes = ((item["contractId"], item["groupId"]) for items in referrers.values() for item in items)
+    index = index_includes(akm_api, scopes, verbose)
+
+    os.makedirs(os.path.join(output_dir, INCLUDES_DIRNAME), exist_ok=True)
+    include_map: Dict[str, Dict[str, Any]] = {}
+    fetched = 0
+    for include_id, items in referrers.items():
+        include = index.get(include_id)
+        if include is None:
+            # Not in the referrers' groups: ask in the context of a referrer
+            include = get_include(akm_api, include_id, items[0]["contractId"], items[0]["groupId"])
+        referenced_by = [item["propertyId"] for item in items]
+        version = include.export_version if include is not None else None
+        if include is None or not version:
+            include_map[include_id] = {"error": "include not found", "referencedBy": referenced_by}
+            print(f"✗ {include_id}: include not found", file=sys.stderr)
+            continue
+
+        entry: Dict[str, Any] = {
+            "includeName": include.include_name,
+            "includeType": include.include_type,
+            "version": version,
+            "file": include_path(include, version),
+            "referencedBy": referenced_by,
+        }
+        include_map[include_id] = entry
+        path = os.path.join(output_dir, entry["file"])
+        if os.path.exists(path):
+            if verbose:
+                print(f"  {include.include_name} v{version} already downloaded", file=sys.stderr)
+            continue
+
+        if scheduler is not None:
+            scheduler.wait()
+        error = export_include_rules(akm_api, include, version, path)
+        if error is not None:
+            entry["error"] = error
+            del entry["file"]
+            print(f"✗ {include.include_name} v{version}: {error}", file=sys.stderr)
+            continue
+        fetched += 1
+        print(f"✓ {include.include_name} v{version} (used by {len(items)} properties)", file=sys.stderr)
+
+    reference_map = {
+        "includes": include_map,
+        "properties": {
+            item["propertyId"]: {
+                "propertyName": item["propertyName"],
+                "version": item["version"],
+                "file": os.path.relpath(item["path"], output_dir),
+                "includes": references[item["propertyId"]],
+            }
+            for item in properties
+            if item["propertyId"] in references
+        },
+    }
+    atomic_write(os.path.join(output_dir, REFERENCE_MAP_FILENAME), codec.dumps(reference_map, indent=True))
+
+    print(f"Downloaded {fetched} include rule trees", file=sys.stderr)
+    return reference_map
@@ -0,0 +1,160 @@
+"""Crash-safe journal for resumable export runs."""
+
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from akamai_wrappy.files import atomic_write
+
+JOURNAL_FILENAME = ".awp-journal.jsonl"
+
+
+def item_key(item: Dict[str, Any]) -> str:
+    """Return the journal key for a planned export item."""
+    return f"{item.get('propertyId')}@{item.get('version')}"
+
+
+class ExportJournal:
+    """Append-only JSON Lines journal stored in the output directory.
+
+    The first record holds the planned work list; every completed export
+    appends a ``done`` record that is fsynced before the next export starts.
+    A torn final line (crash mid-write) is ignored on load. Records may be
+    appended from several threads.
+    """
+
+    def __init__(self, output_dir: str, filename: str = JOURNAL_FILENAME):
+        """Initialize journal.
+
+        Args:
+            output_dir: Directory the journal lives in
+            filename: Journal file name
+        """
+        self.path = os.path.join(output_dir, filename)
+        self._file = None
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        """Return True if a journal with a plan exists."""
+        return os.path.exists(self.path)
+
+    def start(self, items: List[Dict[str, Any]], meta: Optional[Dict[str, Any]] = None) -> None:
+        """Start a new journal with the planned work list.
+
+        Replaces any previous journal atomically.
+
+        Args:
+            items: Planned export items (JSON-serializable dicts)
+            meta: Optional run metadata stored with the plan
+        """
+        self.close()
+        plan = {"type": "plan", "created": time.time(), "meta": meta or {}, "items": items}
+        atomic_write(self.path, json.dumps(plan) + "\n")
+
+    def load(self) -> Tuple[List[Dict[str, Any]], Dict[str, Any], Set[str]]:
+        """Load the planned items and the keys of completed exports.
+
+        Returns:
+            Tuple of (planned items, plan metadata, completed keys)
+
+        Raises:
+            ValueError: If the journal has no plan record
+        """
+        items: Optional[List[Dict[str, Any]]] = None
+        meta: Dict[str, Any] = {}
+        done: Set[str] = set()
+
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write from an interrupted run
+                    continue
+                record_type = record.get("type")
+                if record_type == "plan":
+                    items = record.get("items", [])
+                    meta = record.get("meta", {})
+                elif record_type == "done":
+                    done.add(record["key"])
+
+        if items is None:
+            raise ValueError(f"Journal {self.path} has no plan record")
+
+        return items, meta, done
+
+    def _truncate_torn_tail(self) -> None:
+        """Cut a torn final line so the next record starts on a line of its own.
+
+        Otherwise a record appended after a crash mid-write would be merged
+        into the fragment and discarded as invalid on load.
+        """
+        try:
+            f = open(self.path, "rb+")
+        except FileNotFoundError:
+            return
+        with f:
+            size = f.seek(0, os.SEEK_END)
+            end = size
+            # Scan backwards for the last newline
+            while end > 0:
+                start = max(0, end - 4096)
+                f.seek(start)
+                chunk = f.read(end - start)
+                newline = chunk.rfind(b"\n")
+                if newline != -1:
+                    end = start + newline + 1
+                    break
+                end = start
+            if end < size:
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _append(self, *records: Dict[str, Any]) -> None:
+        """Append records and flush them to disk with one fsync."""
+        with self._lock:
+            if self._file is None:
+                self._truncate_torn_tail()
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write("".join(json.dumps(record) + "\n" for record in records))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def mark_done(self, key: str, output_file: str) -> None:
+        """Record a completed export.
+
+        Args:
+            key: Item key (see item_key)
+            output_file: Path of the written file
+        """
+        self._append({"type": "done", "key": key, "file": output_file, "time": time.time()})
+
+    def mark_done_many(self, entries: List[Tuple[str, str]]) -> None:
+        """Record a batch of completed exports with a single fsync.
+
+        Args:
+            entries: (key, output file) pairs
+        """
+        now = time.time()
+        self._append(
+            *({"type": "done", "key": key, "file": output_file, "time": now} for key, output_file in entries)
+        )
+
+    def mark_failed(self, key: str, error: str) -> None:
+        """Record a failed export (retried on resume).
+
+        Args:
+            key: Item key (see item_key)
+            error: Error description
+        """
+        self._append({"type": "failed", "key": key, "error": error, "time": time.time()})
+
+    def close(self) -> None:
+        """Close the journal file handle."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
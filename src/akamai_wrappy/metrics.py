@@ -0,0 +1,299 @@
+"""Per-request instrumentation and metrics export for the Akamai client."""
+
+import json
+import re
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from tabulate import tabulate
+
+from akamai_wrappy.compression import compression_ratio
+
+# Latency histogram bucket upper bounds in seconds (Prometheus style, +Inf implied)
+LATENCY_BUCKETS: Tuple[float, ...] = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRICS_FORMATS = ("summary", "json", "prometheus")
+
+_API_VERSION_SEGMENT = re.compile(r"^v\d+$")
+
+
+@dataclass
+class RequestRecord:
+    """Measurements for one logical API request (including its retries).
+
+    ``bytes_sent``/``bytes_received`` count uncompressed bodies and the
+    ``wire_`` fields count what was transferred (after content encoding).
+    ``hedged`` is set when a second copy of the request was sent.
+    """
+
+    method: str
+    endpoint: str
+    status: Optional[int]
+    latency: float
+    bytes_sent: int
+    bytes_received: int
+    retries: int = 0
+    sleep_time: float = 0.0
+    error: Optional[str] = None
+    wire_bytes_sent: int = 0
+    wire_bytes_received: int = 0
+    hedged: bool = False
+
+
+RequestHook = Callable[[RequestRecord], None]
+
+
+def endpoint_template(path: str) -> str:
+    """Collapse IDs in an API path so requests group by endpoint.
+
+    Any path segment containing a digit (other than API version segments
+    such as ``v1``) is replaced with ``{id}``, e.g.
+    ``/papi/v1/properties/prp_123/versions/4/rules`` becomes
+    ``/papi/v1/properties/{id}/versions/{id}/rules``.
+
+    Args:
+        path: URL path of the request
+
+    Returns:
+        Endpoint template string
+    """
+    segments = []
+    for segment in path.split("/"):
+        if any(c.isdigit() for c in segment) and not _API_VERSION_SEGMENT.match(segment):
+            segments.append("{id}")
+        else:
+            segments.append(segment)
+    return "/".join(segments)
+
+
+class EndpointStats:
+    """Aggregated counters and latency histogram for one endpoint."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        self.latency_max = 0.0
+        self.bucket_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.wire_bytes_sent = 0
+        self.wire_bytes_received = 0
+        self.retries = 0
+        self.sleep_time = 0.0
+        self.hedged = 0
+        self.status_counts: Dict[str, int] = {}
+
+    def add(self, record: RequestRecord) -> None:
+        """Add a request record to the aggregate."""
+        self.count += 1
+        if record.status is None or record.status >= 400:
+            self.errors += 1
+        self.latency_sum += record.latency
+        self.latency_max = max(self.latency_max, record.latency)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if record.latency <= bound:
+                self.bucket_counts[i] += 1
+                break
+        else:
+            self.bucket_counts[-1] += 1
+        self.bytes_sent += record.bytes_sent
+        self.bytes_received += record.bytes_received
+        self.wire_bytes_sent += record.wire_bytes_sent
+        self.wire_bytes_received += record.wire_bytes_received
+        self.retries += record.retries
+        self.sleep_time += record.sleep_time
+        if record.hedged:
+            self.hedged += 1
+        status = str(record.status) if record.status is not None else "error"
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def percentile(self, q: float) -> float:
+        """Estimate a latency percentile from the histogram.
+
+        Returns the upper bound of the bucket containing the percentile,
+        capped at the observed maximum.
+
+        Args:
+            q: Percentile as a fraction (e.g., 0.95)
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.bucket_counts):
+            cumulative += bucket_count
+            if cumulative >= target:
+                if i < len(LATENCY_BUCKETS):
+                    return min(LATENCY_BUCKETS[i], self.latency_max)
+                break
+        return self.latency_max
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the aggregate as a JSON-serializable dict."""
+        buckets = {str(bound): count for bound, count in zip(LATENCY_BUCKETS, self.bucket_counts)}
+        buckets["+Inf"] = self.bucket_counts[-1]
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "statusCounts": self.status_counts,
+            "latencySum": round(self.latency_sum, 6),
+            "latencyMax": round(self.latency_max, 6),
+            "latencyP50": round(self.percentile(0.5), 6),
+            "latencyP95": round(self.percentile(0.95), 6),
+            "latencyBuckets": buckets,
+            "bytesSent": self.bytes_sent,
+            "bytesReceived": self.bytes_received,
+            "wireBytesSent": self.wire_bytes_sent,
+            "wireBytesReceived": self.wire_bytes_received,
+            "retries": self.retries,
+            "sleepTime": round(self.sleep_time, 6),
+            "hedged": self.hedged,
+        }
+
+
+class MetricsCollector:
+    """Request hook that aggregates records into per-endpoint statistics.
+
+    Register an instance with ``Akamai(hooks=[collector])`` (or append it to
+    ``client.request_hooks``) and export with :meth:`summary`,
+    :meth:`to_json` or :meth:`to_prometheus`.
+    """
+
+    def __init__(self, keep_records: bool = False) -> None:
+        """Initialize collector.
+
+        Args:
+            keep_records: Keep every raw RequestRecord (for JSON export)
+        """
+        self.keep_records = keep_records
+        self.records: List[RequestRecord] = []
+        self.endpoints: Dict[Tuple[str, str], EndpointStats] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, record: RequestRecord) -> None:
+        """Record a completed request."""
+        key = (record.method.upper(), record.endpoint)
+        with self._lock:
+            stats = self.endpoints.get(key)
+            if stats is None:
+                stats = self.endpoints[key] = EndpointStats()
+            stats.add(record)
+            if self.keep_records:
+                self.records.append(record)
+
+    def summary(self, tablefmt: str = "simple") -> str:
+        """Render a human-readable per-endpoint summary table."""
+        rows = []
+        with self._lock:
+            items = sorted(self.endpoints.items(), key=lambda kv: -kv[1].latency_sum)
+            for (method, endpoint), stats in items:
+                rows.append({
+                    "method": method,
+                    "endpoint": endpoint,
+                    "count": stats.count,
+                    "errors": stats.errors,
+                    "mean(s)": round(stats.latency_sum / stats.count, 3),
+                    "p50(s)": round(stats.percentile(0.5), 3),
+                    "p95(s)": round(stats.percentile(0.95), 3),
+                    "max(s)": round(stats.latency_max, 3),
+                    "total(s)": round(stats.latency_sum, 3),
+                    "retries": stats.retries,
+                    "sleep(s)": round(stats.sleep_time, 1),
+                    "hedged": stats.hedged,
+                    "sent": stats.bytes_sent,
+                    "received": stats.bytes_received,
+                    "wire recv": stats.wire_bytes_received,
+                    "ratio": compression_ratio(stats.wire_bytes_received, stats.bytes_received) or "",
+                })
+        if not rows:
+            return "No requests recorded"
+        return tabulate(rows, headers="keys", tablefmt=tablefmt)
+
+    def to_json(self) -> str:
+        """Render metrics as a JSON document."""
+        with self._lock:
+            data: Dict[str, Any] = {
+                "endpoints": [
+                    {"method": method, "endpoint": endpoint, **stats.to_dict()}
+                    for (method, endpoint), stats in sorted(self.endpoints.items())
+                ],
+            }
+            if self.keep_records:
+                data["requests"] = [asdict(r) for r in self.records]
+        return json.dumps(data, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Render metrics in the Prometheus text exposition format."""
+        lines = [
+            "# HELP awp_request_duration_seconds Akamai API request latency",
+            "# TYPE awp_request_duration_seconds histogram",
+        ]
+        counters: Dict[str, List[str]] = {
+            "awp_requests_total": [],
+            "awp_request_errors_total": [],
+            "awp_request_retries_total": [],
+            "awp_request_sleep_seconds_total": [],
+            "awp_request_bytes_sent_total": [],
+            "awp_request_bytes_received_total": [],
+            "awp_request_wire_bytes_sent_total": [],
+            "awp_request_wire_bytes_received_total": [],
+            "awp_request_hedged_total": [],
+        }
+        with self._lock:
+            for (method, endpoint), stats in sorted(self.endpoints.items()):
+                labels = f'method="{method}",endpoint="{endpoint}"'
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.bucket_counts):
+                    cumulative += count
+                    lines.append(
+                        f'awp_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+                    )
+                lines.append(
+                    f'awp_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.count}'
+                )
+                lines.append(f"awp_request_duration_seconds_sum{{{labels}}} {stats.latency_sum:.6f}")
+                lines.append(f"awp_request_duration_seconds_count{{{labels}}} {stats.count}")
+                counters["awp_requests_total"].append(f"{{{labels}}} {stats.count}")
+                counters["awp_request_errors_total"].append(f"{{{labels}}} {stats.errors}")
+                counters["awp_request_retries_total"].append(f"{{{labels}}} {stats.retries}")
+                counters["awp_request_sleep_seconds_total"].append(
+                    f"{{{labels}}} {stats.sleep_time:.6f}"
+                )
+                counters["awp_request_bytes_sent_total"].append(f"{{{labels}}} {stats.bytes_sent}")
+                counters["awp_request_bytes_received_total"].append(
+                    f"{{{labels}}} {stats.bytes_received}"
+                )
+                counters["awp_request_wire_bytes_sent_total"].append(
+                    f"{{{labels}}} {stats.wire_bytes_sent}"
+                )
+                counters["awp_request_wire_bytes_received_total"].append(
+                    f"{{{labels}}} {stats.wire_bytes_received}"
+                )
+                counters["awp_request_hedged_total"].append(f"{{{labels}}} {stats.hedged}")
+        for name, samples in counters.items():
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{sample}" for sample in samples)
+        return "\n".join(lines) + "\n"
+
+    def write(self, fmt: str = "summary", output_file: Optional[str] = None) -> None:
+        """Write metrics in the given format to a file or stderr.
+
+        Args:
+            fmt: One of "summary", "json" or "prometheus"
+            output_file: Output file path (default: stderr)
+        """
+        if fmt == "json":
+            text = self.to_json() + "\n"
+        elif fmt == "prometheus":
+            text = self.to_prometheus()
+        else:
+            text = self.summary() + "\n"
+
+        if output_file:
+            with open(output_file, "w", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            print(text, end="", file=sys.stderr)
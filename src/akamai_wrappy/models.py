@@ -0,0 +1,362 @@
+"""Compact typed models for API entities.
+
+Models use ``__slots__`` and are built from API response items in one
+pass. Scalar fields reference the strings already allocated by the JSON
+decoder (IDs repeated across many entries are interned), and bulky
+optional payloads such as list elements and client-list items are kept
+in their raw form and only decoded when accessed.
+"""
+
+import sys
+from typing import Any, Dict, Iterator, List, Optional
+
+
+def _intern(value: Any) -> Any:
+    """Intern repeated ID strings so entries share one copy."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Group:
+    """PAPI group."""
+
+    __slots__ = ("group_id", "group_name", "parent_group_id", "contract_ids")
+
+    def __init__(
+        self,
+        group_id: str,
+        group_name: str = "Unknown",
+        parent_group_id: Optional[str] = None,
+        contract_ids: Optional[List[str]] = None,
+    ):
+        self.group_id = group_id
+        self.group_name = group_name
+        self.parent_group_id = parent_group_id
+        self.contract_ids = contract_ids or []
+
+    @classmethod
+    def from_api(cls, item: Dict[str, Any]) -> "Group":
+        """Build from a ``/papi/v1/groups`` item."""
+        return cls(
+            group_id=_intern(item.get("groupId")),
+            group_name=item.get("groupName", "Unknown"),
+            parent_group_id=_intern(item.get("parentGroupId")),
+            contract_ids=[_intern(c) for c in item.get("contractIds", [])],
+        )
+
+    @classmethod
+    def list_from_response(cls, response: Dict[str, Any]) -> List["Group"]:
+        """Build all groups from a ``/papi/v1/groups`` response."""
+        return [cls.from_api(item) for item in response.get("groups", {}).get("items", [])]
+
+    def __repr__(self) -> str:
+        return f"Group({self.group_id!r}, {self.group_name!r})"
+
+
+class Property:
+    """PAPI property with its version pointers."""
+
+    __slots__ = (
+        "property_id",
+        "property_name",
+        "contract_id",
+        "group_id",
+        "latest_version",
+        "staging_version",
+        "production_version",
+        "asset_id",
+        "note",
+    )
+
+    def __init__(
+        self,
+        property_id: str,
+        property_name: str,
+        contract_id: Optional[str] = None,
+        group_id: Optional[str] = None,
+        latest_version: Optional[int] = None,
+        staging_version: Optional[int] = None,
+        production_version: Optional[int] = None,
+        asset_id: Optional[str] = None,
+        note: Optional[str] = None,
+    ):
+        self.property_id = property_id
+        self.property_name = property_name
+        self.contract_id = contract_id
+        self.group_id = group_id
+        self.latest_version = latest_version
+        self.staging_version = staging_version
+        self.production_version = production_version
+        self.asset_id = asset_id
+        self.note = note
+
+    @classmethod
+    def from_api(
+        cls,
+        item: Dict[str, Any],
+        contract_id: Optional[str] = None,
+        group_id: Optional[str] = None,
+    ) -> "Property":
+        """Build from a PAPI property item.
+
+        Args:
+            item: Property item (``/papi/v1/properties`` or a single property)
+            contract_id: Contract ID used for the listing (default: from item)
+            group_id: Group ID used for the listing (default: from item)
+        """
+        return cls(
+            property_id=item.get("propertyId"),
+            property_name=item.get("propertyName"),
+            contract_id=_intern(contract_id or item.get("contractId")),
+            group_id=_intern(group_id or item.get("groupId")),
+            latest_version=item.get("latestVersion"),
+            staging_version=item.get("stagingVersion"),
+            production_version=item.get("productionVersion"),
+            asset_id=item.get("assetId"),
+            note=item.get("note"),
+        )
+
+    @property
+    def export_version(self) -> Optional[int]:
+        """Version to export: production if active, otherwise latest."""
+        return self.production_version or self.latest_version
+
+    def to_row(self) -> Dict[str, Any]:
+        """Return the row shown by list-properties."""
+        return {
+            "propertyId": self.property_id,
+            "propertyName": self.property_name,
+            "prodVer": self.production_version,
+            "stgVer": self.staging_version,
+            "latestVer": self.latest_version,
+            "groupId": self.group_id,
+        }
+
+    def __repr__(self) -> str:
+        return f"Property({self.property_id!r}, {self.property_name!r})"
+
+
+class Include:
+    """PAPI include (a rule tree fragment shared by properties)."""
+
+    __slots__ = (
+        "include_id",
+        "include_name",
+        "include_type",
+        "contract_id",
+        "group_id",
+        "latest_version",
+        "staging_version",
+        "production_version",
+    )
+
+    def __init__(
+        self,
+        include_id: str,
+        include_name: str,
+        include_type: Optional[str] = None,
+        contract_id: Optional[str] = None,
+        group_id: Optional[str] = None,
+        latest_version: Optional[int] = None,
+        staging_version: Optional[int] = None,
+        production_version: Optional[int] = None,
+    ):
+        self.include_id = include_id
+        self.include_name = include_name
+        self.include_type = include_type
+        self.contract_id = contract_id
+        self.group_id = group_id
+        self.latest_version = latest_version
+        self.staging_version = staging_version
+        self.production_version = production_version
+
+    @classmethod
+    def from_api(cls, item: Dict[str, Any]) -> "Include":
+        """Build from a ``/papi/v1/includes`` item."""
+        return cls(
+            include_id=item.get("includeId"),
+            include_name=item.get("includeName"),
+            include_type=_intern(item.get("includeType")),
+            contract_id=_intern(item.get("contractId")),
+            group_id=_intern(item.get("groupId")),
+            latest_version=item.get("latestVersion"),
+            staging_version=item.get("stagingVersion"),
+            production_version=item.get("productionVersion"),
+        )
+
+    @property
+    def export_version(self) -> Optional[int]:
+        """Version to export: production if active, otherwise latest."""
+        return self.production_version or self.latest_version
+
+    def __repr__(self) -> str:
+        return f"Include({self.include_id!r}, {self.include_name!r})"
+
+
+class NetworkList:
+    """Network list metadata with lazily exposed elements."""
+
+    __slots__ = ("unique_id", "name", "type", "element_count", "sync_point", "_elements")
+
+    def __init__(
+        self,
+        unique_id: str,
+        name: str,
+        type: str = "IP",
+        element_count: int = 0,
+        sync_point: Optional[int] = None,
+        elements: Optional[List[str]] = None,
+    ):
+        self.unique_id = unique_id
+        self.name = name
+        self.type = type
+        self.element_count = element_count
+        self.sync_point = sync_point
+        self._elements = elements
+
+    @classmethod
+    def from_api(cls, item: Dict[str, Any]) -> "NetworkList":
+        """Build from a ``/network-list/v2/network-lists`` item."""
+        elements = item.get("list")
+        return cls(
+            unique_id=item.get("uniqueId", "unknown"),
+            name=item.get("name", "unknown"),
+            type=_intern(item.get("type", "IP")),
+            element_count=item.get("elementCount", len(elements) if elements else 0),
+            sync_point=item.get("syncPoint"),
+            elements=elements,
+        )
+
+    @classmethod
+    def list_from_response(cls, response: Dict[str, Any]) -> List["NetworkList"]:
+        """Build all network lists from a listing response."""
+        return [cls.from_api(item) for item in response.get("networkLists", [])]
+
+    @property
+    def elements(self) -> List[str]:
+        """Elements (the response list itself, not a copy; empty if not fetched)."""
+        return self._elements or []
+
+    def to_row(self) -> Dict[str, Any]:
+        """Return the row shown by list-networklists."""
+        return {
+            "name": self.name,
+            "uniqueId": self.unique_id,
+            "type": self.type,
+            "elementCount": self.element_count,
+        }
+
+    def __repr__(self) -> str:
+        return f"NetworkList({self.unique_id!r}, {self.name!r})"
+
+
+class ClientListItem:
+    """Single client list entry."""
+
+    __slots__ = ("value", "description", "expiration_date", "tags")
+
+    def __init__(
+        self,
+        value: str,
+        description: str = "",
+        expiration_date: str = "",
+        tags: Optional[List[str]] = None,
+    ):
+        self.value = value
+        self.description = description
+        self.expiration_date = expiration_date
+        self.tags = tags or []
+
+    @classmethod
+    def from_api(cls, item: Any) -> "ClientListItem":
+        """Build from a client list item (a dict, or a bare value)."""
+        if not isinstance(item, dict):
+            return cls(value=str(item))
+        return cls(
+            value=item.get("value", ""),
+            description=item.get("description", "") or "",
+            expiration_date=item.get("expirationDate", "") or "",
+            tags=item.get("tags") or [],
+        )
+
+
+class ClientList:
+    """Client list metadata with lazily decoded items."""
+
+    __slots__ = (
+        "list_id",
+        "name",
+        "type",
+        "items_count",
+        "version",
+        "update_date",
+        "staging_status",
+        "production_status",
+        "_items",
+    )
+
+    def __init__(
+        self,
+        list_id: str,
+        name: str,
+        type: str = "",
+        items_count: int = 0,
+        version: Optional[int] = None,
+        update_date: Optional[str] = None,
+        staging_status: str = "",
+        production_status: str = "",
+        items: Optional[List[Any]] = None,
+    ):
+        self.list_id = list_id
+        self.name = name
+        self.type = type
+        self.items_count = items_count
+        self.version = version
+        self.update_date = update_date
+        self.staging_status = staging_status
+        self.production_status = production_status
+        self._items = items
+
+    @classmethod
+    def from_api(cls, item: Dict[str, Any]) -> "ClientList":
+        """Build from a ``/client-list/v1/lists`` item."""
+        items = item.get("items")
+        return cls(
+            list_id=item.get("listId", "unknown"),
+            name=item.get("name", "unknown"),
+            type=_intern(item.get("type", "")),
+            items_count=item.get("itemsCount", len(items) if items else 0),
+            version=item.get("version"),
+            update_date=item.get("updateDate"),
+            staging_status=_intern(item.get("stagingActivationStatus", "")),
+            production_status=_intern(item.get("productionActivationStatus", "")),
+            items=items,
+        )
+
+    @classmethod
+    def list_from_response(cls, response: Dict[str, Any]) -> List["ClientList"]:
+        """Build all client lists from a listing response."""
+        return [cls.from_api(item) for item in response.get("content", [])]
+
+    @property
+    def raw_item_count(self) -> int:
+        """Number of fetched items (without decoding them)."""
+        return len(self._items) if self._items else 0
+
+    def iter_items(self) -> Iterator[ClientListItem]:
+        """Decode items one at a time as they are consumed."""
+        for item in self._items or ():
+            yield ClientListItem.from_api(item)
+
+    def to_row(self) -> Dict[str, Any]:
+        """Return the row shown by list-clientlists."""
+        return {
+            "name": self.name,
+            "listId": self.list_id,
+            "type": self.type,
+            "itemsCount": self.items_count,
+            "stagingStatus": self.staging_status,
+            "productionStatus": self.production_status,
+        }
+
+    def __repr__(self) -> str:
+        return f"ClientList({self.list_id!r}, {self.name!r})"
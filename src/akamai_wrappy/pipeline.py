@@ -0,0 +1,362 @@
+"""Staged fetch/transform/write pipeline for the download commands.
+
+Each stage runs in its own worker threads and hands items to the next
+stage through a bounded queue, so fetching the next item overlaps with
+serializing and writing the previous ones, and throughput is set by the
+slowest stage instead of the sum of all of them. The bounded queues keep
+memory flat: a fast fetch stage blocks once the writer falls behind.
+
+BatchWriter is the usual last stage. It writes files atomically like
+files.atomic_write, but makes a whole batch durable at once (group
+commit): files written while the previous batch was being synced are
+fsynced, renamed into place and announced together.
+
+Per-stage statistics report how busy each stage was, which tells which
+stage to give more workers.
+
+Exceptions listed in ``stop_on`` (e.g. an expired deadline) stop a
+pipeline instead of failing a single item: no further items are fed,
+the rest of that stage's input is dropped, later stages finish what
+they already hold, and run() raises the exception.
+"""
+
+import os
+import queue
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Iterable, List, Optional, Tuple, Type, Union
+
+DEFAULT_QUEUE_SIZE = 8
+DEFAULT_FSYNC_BATCH = 32
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+class StageStats:
+    """Counters of one pipeline stage."""
+
+    def __init__(self, name: str, workers: int):
+        self.name = name
+        self.workers = workers
+        self.items = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.elapsed = 0.0
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of the pipeline's run time the stage's workers were busy."""
+        if not self.elapsed:
+            return 0.0
+        return min(1.0, self.busy / (self.elapsed * self.workers))
+
+    def describe(self) -> str:
+        """Return e.g. ``fetch 93% (1 worker, 40 items)``."""
+        workers = f"{self.workers} worker{'s' if self.workers != 1 else ''}"
+        errors = f", {self.errors} failed" if self.errors else ""
+        return f"{self.name} {self.utilization:.0%} ({workers}, {self.items} items{errors})"
+
+
+class Stage:
+    """One step of a pipeline.
+
+    ``func`` receives an item and returns the item passed to the next
+    stage. An exception drops the item and is reported to the pipeline's
+    ``on_error``. ``on_idle`` is called whenever the stage has caught up
+    with its input and once more when the input ends (e.g. to flush a
+    batch).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable[[Any], Any],
+        workers: int = 1,
+        on_idle: Optional[Callable[[], None]] = None,
+    ):
+        if workers < 1:
+            raise ValueError(f"Stage {name} needs at least one worker")
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.on_idle = on_idle
+
+
+class Pipeline:
+    """Run items through stages connected by bounded queues."""
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        on_error: Optional[Callable[[Any, str, BaseException], None]] = None,
+        stop_on: Tuple[Type[BaseException], ...] = (),
+    ):
+        """Initialize pipeline.
+
+        Args:
+            stages: Stages in order
+            queue_size: Capacity of the queue in front of each stage
+            on_error: Called with (item, stage name, exception) for a
+                failed item; calls are serialized
+            stop_on: Exception types that stop the whole pipeline
+        """
+        self.stages = stages
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self.stop_on = stop_on
+        self.stats = [StageStats(stage.name, stage.workers) for stage in stages]
+        self._error_lock = threading.Lock()
+        self._failure: Optional[BaseException] = None
+        self._stopped: Optional[BaseException] = None
+
+    def _report_error(self, item: Any, stage: Stage, error: BaseException) -> None:
+        with self._error_lock:
+            if self.on_error is not None:
+                self.on_error(item, stage.name, error)
+
+    def _worker(
+        self,
+        index: int,
+        inbox: "queue.Queue[Any]",
+        outbox: Optional["queue.Queue[Any]"],
+        finished: List[int],
+        lock: threading.Lock,
+    ) -> None:
+        stage = self.stages[index]
+        stats = self.stats[index]
+        try:
+            while True:
+                try:
+                    item = inbox.get_nowait()
+                except queue.Empty:
+                    if stage.on_idle is not None:
+                        start = time.monotonic()
+                        stage.on_idle()
+                        with lock:
+                            stats.busy += time.monotonic() - start
+                    item = inbox.get()
+                if item is _DONE:
+                    break
+
+                start = time.monotonic()
+                try:
+                    result = stage.func(item)
+                except self.stop_on as e:
+                    with lock:
+                        stats.busy += time.monotonic() - start
+                    self._stopped = self._stopped or e
+                    # Drop the rest of the input; the feeder stops too
+                    while inbox.get() is not _DONE:
+                        pass
+                    break
+                except Exception as e:
+                    with lock:
+                        stats.errors += 1
+                        stats.busy += time.monotonic() - start
+                    self._report_error(item, stage, e)
+                    continue
+                with lock:
+                    stats.items += 1
+                    stats.busy += time.monotonic() - start
+                if outbox is not None:
+                    outbox.put(result)
+        except BaseException as e:
+            # Unexpected failure (e.g. in on_idle): stop the whole pipeline,
+            # draining the input so earlier stages never block on a full queue
+            self._failure = self._failure or e
+            while inbox.get() is not _DONE:
+                pass
+        finally:
+            with lock:
+                finished[index] += 1
+                last = finished[index] == stage.workers
+            if last:
+                if stage.on_idle is not None and self._failure is None:
+                    try:
+                        stage.on_idle()
+                    except BaseException as e:
+                        self._failure = self._failure or e
+                if outbox is not None:
+                    for _ in range(self.stages[index + 1].workers):
+                        outbox.put(_DONE)
+
+    def run(self, items: Iterable[Any]) -> List[StageStats]:
+        """Feed items through all stages and wait until they are processed.
+
+        The item source is consumed lazily on a feeder thread, bounded by
+        the first queue.
+
+        Returns:
+            StageStats per stage
+
+        Raises:
+            Exception: An error raised by the item source or an on_idle
+                hook, or the stop_on exception that stopped the pipeline
+        """
+        queues: List["queue.Queue[Any]"] = [queue.Queue(self.queue_size) for _ in self.stages]
+        finished = [0] * len(self.stages)
+        lock = threading.Lock()
+        threads = []
+        for index, stage in enumerate(self.stages):
+            outbox = queues[index + 1] if index + 1 < len(self.stages) else None
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker,
+                    args=(index, queues[index], outbox, finished, lock),
+                    name=f"awp-{stage.name}-{n}",
+                    daemon=True,
+                )
+                thread.start()
+                threads.append(thread)
+
+        def feed() -> None:
+            try:
+                for item in items:
+                    if self._failure is not None or self._stopped is not None:
+                        break
+                    queues[0].put(item)
+            except BaseException as e:
+                self._failure = self._failure or e
+            finally:
+                for _ in range(self.stages[0].workers):
+                    queues[0].put(_DONE)
+
+        feeder = threading.Thread(target=feed, name="awp-feed", daemon=True)
+        start = time.monotonic()
+        feeder.start()
+        # Join with a timeout so Ctrl-C still interrupts the main thread
+        for thread in [feeder] + threads:
+            while thread.is_alive():
+                thread.join(0.2)
+
+        elapsed = time.monotonic() - start
+        for stats in self.stats:
+            stats.elapsed = elapsed
+        if self._failure is not None:
+            raise self._failure
+        if self._stopped is not None:
+            raise self._stopped
+        return self.stats
+
+
+def describe_stats(stats: List[StageStats]) -> str:
+    """Return a one-line utilization summary of all stages."""
+    return "Stage utilization: " + ", ".join(s.describe() for s in stats)
+
+
+class BatchWriter:
+    """Atomic file writer that makes files durable in batches.
+
+    ``add`` writes a file's data to a temporary file next to its target.
+    ``flush`` fsyncs all pending temporary files, renames them over their
+    targets, fsyncs each touched directory once and passes the tags of
+    the batch to ``on_flush``. Nothing is visible under its final name
+    before it is on disk, just like files.atomic_write, but the directory
+    syncs and the callback (e.g. a journal update) happen once per batch.
+
+    Use it as the last pipeline stage with ``on_idle=writer.flush``, so a
+    batch holds whatever arrived while the previous one was syncing.
+    """
+
+    def __init__(
+        self,
+        fsync: bool = True,
+        max_batch: int = DEFAULT_FSYNC_BATCH,
+        on_flush: Optional[Callable[[List[Any]], None]] = None,
+    ):
+        """Initialize writer.
+
+        Args:
+            fsync: Flush files and directories to disk before announcing them
+            max_batch: Flush automatically once this many files are pending
+            on_flush: Called with the tags of each flushed batch
+        """
+        self.fsync = fsync
+        self.max_batch = max_batch
+        self.on_flush = on_flush
+        self.files = 0
+        self.batches = 0
+        self._pending: List[Tuple[Any, str, str, Any]] = []
+        self._lock = threading.Lock()
+
+    def add(self, path: str, data: Union[str, bytes], tag: Any = None) -> None:
+        """Write a file; it appears under ``path`` with the next flush.
+
+        Args:
+            path: Destination file path
+            data: File contents (str is encoded as UTF-8)
+            tag: Value passed to on_flush once the file is in place
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+        f = os.fdopen(fd, "wb")
+        try:
+            f.write(data)
+            f.flush()
+        except BaseException:
+            f.close()
+            os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self._pending.append((f, tmp_path, path, tag))
+            full = len(self._pending) >= self.max_batch
+        if full:
+            self.flush()
+
+    def flush(self) -> None:
+        """Make all pending files durable and move them into place."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if not batch:
+            return
+        try:
+            for f, _, _, _ in batch:
+                if self.fsync:
+                    os.fsync(f.fileno())
+                f.close()
+            for _, tmp_path, path, _ in batch:
+                os.replace(tmp_path, path)
+        except BaseException:
+            self._discard(batch)
+            raise
+        if self.fsync:
+            for directory in {os.path.dirname(os.path.abspath(path)) for _, _, path, _ in batch}:
+                _fsync_directory(directory)
+        self.files += len(batch)
+        self.batches += 1
+        if self.on_flush is not None:
+            self.on_flush([tag for _, _, _, tag in batch])
+
+    def discard(self) -> None:
+        """Drop pending files without writing them (e.g. after an interrupt)."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        self._discard(batch)
+
+    @staticmethod
+    def _discard(batch: List[Tuple[Any, str, str, Any]]) -> None:
+        for f, tmp_path, _, _ in batch:
+            f.close()
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def _fsync_directory(directory: str) -> None:
+    """Persist renames in a directory (not supported on every platform)."""
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -0,0 +1,457 @@
+"""Client-side rate scheduling helpers."""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from akamai_wrappy.timeouts import Deadline
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class IntervalScheduler:
+    """Space operations at least ``interval`` seconds apart.
+
+    Unlike a fixed sleep between operations, the time spent performing the
+    previous operation counts towards the interval, so a 21s spacing with
+    5s exports only sleeps 16s. Thread-safe: concurrent callers are handed
+    consecutive slots.
+    """
+
+    def __init__(self, interval: float, deadline: Optional[Deadline] = None):
+        """Initialize scheduler.
+
+        Args:
+            interval: Minimum seconds between the start of two operations
+            deadline: Deadline of the command (e.g. ``Akamai.deadline``);
+                a slot it would not live to see is not waited for
+        """
+        self.interval = interval
+        self.deadline = deadline
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> float:
+        """Block until the next slot is available and claim it.
+
+        Returns:
+            Seconds slept
+
+        Raises:
+            DeadlineExceeded: If the deadline passes (or was cancelled)
+                before the slot
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_slot)
+            self._next_slot = start + self.interval
+        delay = start - now
+        if self.deadline is not None:
+            self.deadline.sleep(max(0.0, delay))
+        elif delay > 0:
+            time.sleep(delay)
+        return delay
+
+
+# Header names carrying the rate-limit state, in order of preference
+_LIMIT_HEADERS = ("Akamai-RateLimit-Limit", "X-RateLimit-Limit", "RateLimit-Limit")
+_REMAINING_HEADERS = ("Akamai-RateLimit-Remaining", "X-RateLimit-Remaining", "RateLimit-Remaining")
+# Time the next token is available (token bucket)
+_NEXT_HEADERS = ("Akamai-RateLimit-Next", "Retry-After")
+# Time the whole window resets (fixed window)
+_RESET_HEADERS = ("X-RateLimit-Reset", "RateLimit-Reset")
+
+
+def api_family(path: str) -> str:
+    """Return the API family of a path (``/papi/v1/properties`` -> ``papi``)."""
+    return path.lstrip("/").split("/", 1)[0] or "/"
+
+
+def _header(headers: Mapping[str, str], names: Tuple[str, ...]) -> Optional[str]:
+    """Return the first header present among names."""
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def parse_reset(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """Convert a reset header to seconds from now.
+
+    Accepts an ISO 8601 timestamp (``Akamai-RateLimit-Next``), an epoch
+    timestamp or a number of seconds (``X-RateLimit-Reset``, ``Retry-After``).
+
+    Args:
+        value: Raw header value
+        now: Current epoch time (default: time.time())
+
+    Returns:
+        Seconds until the reset (never negative), or None if unparseable
+    """
+    if not value:
+        return None
+    now = time.time() if now is None else now
+    try:
+        number = float(value)
+    except ValueError:
+        try:
+            moment = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        return max(0.0, moment.timestamp() - now)
+    # Large values are epoch timestamps, small ones relative seconds
+    if number > 1e9:
+        number -= now
+    return max(0.0, number)
+
+
+class FamilyBudget:
+    """Rate-limit budget and AIMD concurrency window for one API family.
+
+    The budget follows the limit/remaining/reset headers of every response,
+    minus the requests sent since. While the remaining quota is above a
+    reserve, requests go out freely (up to the concurrency window). Inside
+    the reserve, requests are spread so the quota lasts until a fixed
+    window resets, and with no quota left they wait for the next token
+    (``Akamai-RateLimit-Next``) or the window reset instead of running into
+    a 429 and its long retry backoff.
+
+    The concurrency window grows by about one request per round of
+    responses (additive increase) and halves, at most once per round, when
+    a response shows pressure: a 429 or a remaining quota inside the
+    reserve (multiplicative decrease).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        reserve_ratio: float = 0.1,
+    ):
+        """Initialize budget.
+
+        Args:
+            max_concurrency: Upper bound (and start value) of the window
+            min_concurrency: Lower bound of the window
+            reserve_ratio: Fraction of the limit below which requests are spaced
+        """
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.reserve_ratio = reserve_ratio
+        self.concurrency = float(max_concurrency)
+        self.in_flight = 0
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.next_token_at: Optional[float] = None
+        self.reset_at: Optional[float] = None
+        self.decreases = 0
+        self.throttled_time = 0.0
+        self._sent_since_report = 0
+        self._since_decrease = 0
+        self._next_slot = 0.0
+        self._cond = threading.Condition()
+
+    @property
+    def reserve(self) -> int:
+        """Remaining quota at which spacing starts."""
+        return max(1, int((self.limit or 0) * self.reserve_ratio))
+
+    def _wait_time(self, now: float) -> Optional[float]:
+        """Seconds to wait before the next request may start (caller holds the lock).
+
+        Returns:
+            0 to go now, a positive delay, or None to wait for a response
+        """
+        if self.in_flight >= max(self.min_concurrency, int(self.concurrency)):
+            return None
+        if self.remaining is None:
+            return 0.0
+
+        available = self.remaining - self._sent_since_report
+        if available > self.reserve:
+            return 0.0
+
+        if available >= 1:
+            # Spread what is left of a fixed window over the time to its reset
+            if self.reset_at is not None and self.reset_at > now:
+                return max(0.0, self._next_slot - now)
+            return 0.0
+
+        # Quota used up: wait for the next token or the window reset
+        if self.next_token_at is not None:
+            if self.next_token_at > now:
+                return self.next_token_at - now
+            # One token has been added since the last report
+            self.next_token_at = None
+            self.remaining = self._sent_since_report + 1
+            return 0.0
+        if self.reset_at is not None:
+            if self.reset_at > now:
+                return self.reset_at - now
+            # The window has reset since the last report
+            self.reset_at = None
+            self.remaining = self._sent_since_report + (self.limit or 1)
+            return 0.0
+        # No refill time known: wait for a response, or probe if none is pending
+        if self.in_flight:
+            return None
+        self.remaining = self._sent_since_report + 1
+        return 0.0
+
+    def acquire(self) -> float:
+        """Wait for a concurrency slot and the quota to send a request.
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = self._wait_time(now)
+                if wait == 0:
+                    break
+                # Responses wake waiters early with fresh numbers
+                self._cond.wait(timeout=wait)
+
+            self._take(now)
+            waited = time.monotonic() - started
+            self.throttled_time += waited
+        return waited
+
+    def try_acquire(self) -> bool:
+        """Take a slot only if a request may start right now.
+
+        Returns:
+            True if a slot was taken (release it like one from acquire)
+        """
+        with self._cond:
+            now = time.monotonic()
+            if self._wait_time(now) != 0:
+                return False
+            self._take(now)
+        return True
+
+    def _take(self, now: float) -> None:
+        """Count a request as sent (caller holds the lock)."""
+        self.in_flight += 1
+        self._sent_since_report += 1
+        if self.remaining is not None and self.reset_at is not None and self.reset_at > now:
+            available = self.remaining - self._sent_since_report + 1
+            if available <= self.reserve:
+                self._next_slot = now + (self.reset_at - now) / max(available, 1)
+
+    def release(self, status: Optional[int] = None, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Return the slot and update the budget from a response.
+
+        Args:
+            status: Response status code (None if the request failed)
+            headers: Response headers
+        """
+        headers = headers or {}
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+
+            limit = _to_int(_header(headers, _LIMIT_HEADERS))
+            remaining = _to_int(_header(headers, _REMAINING_HEADERS))
+            next_token = parse_reset(_header(headers, _NEXT_HEADERS))
+            reset = parse_reset(_header(headers, _RESET_HEADERS))
+            if limit is not None:
+                self.limit = limit
+            if remaining is not None or status == 429:
+                self.remaining = 0 if status == 429 else remaining
+                # Requests still in flight were sent after this count
+                self._sent_since_report = self.in_flight
+            if next_token is not None:
+                self.next_token_at = now + next_token
+            if reset is not None:
+                self.reset_at = now + reset
+
+            if status == 429:
+                if self.limit is None:
+                    self.limit = 1
+                self._decrease()
+            elif status is not None and self.remaining is not None and self.limit and self.remaining <= self.reserve:
+                self._decrease()
+            elif status is not None:
+                self.concurrency = min(
+                    float(self.max_concurrency), self.concurrency + 1 / self.concurrency
+                )
+                self._since_decrease += 1
+
+            self._cond.notify_all()
+
+    def _decrease(self) -> None:
+        """Halve the window, at most once per round of responses."""
+        if self._since_decrease >= int(self.concurrency) or self.decreases == 0:
+            self.concurrency = max(float(self.min_concurrency), self.concurrency / 2)
+            self.decreases += 1
+            self._since_decrease = 0
+        else:
+            self._since_decrease += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current budget state."""
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "concurrency": round(self.concurrency, 2),
+                "decreases": self.decreases,
+                "throttledTime": round(self.throttled_time, 3),
+            }
+
+
+class RateLimitThrottle:
+    """Per-API-family budgets shared by all requests of a client."""
+
+    def __init__(self, max_concurrency: int = 16, reserve_ratio: float = 0.1):
+        """Initialize throttle.
+
+        Args:
+            max_concurrency: Maximum concurrent requests per API family
+            reserve_ratio: Fraction of the limit below which requests are spaced
+        """
+        self.max_concurrency = max_concurrency
+        self.reserve_ratio = reserve_ratio
+        self._budgets: Dict[str, FamilyBudget] = {}
+        self._lock = threading.Lock()
+
+    def budget(self, path: str) -> FamilyBudget:
+        """Return the budget for the API family of a path."""
+        family = api_family(path)
+        with self._lock:
+            budget = self._budgets.get(family)
+            if budget is None:
+                budget = FamilyBudget(self.max_concurrency, reserve_ratio=self.reserve_ratio)
+                self._budgets[family] = budget
+            return budget
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the state of every family budget."""
+        with self._lock:
+            budgets = dict(self._budgets)
+        return {family: budget.snapshot() for family, budget in sorted(budgets.items())}
+
+
+class HostRateLimiter:
+    """Token bucket shared by every process on the host through lock files.
+
+    Each key (API host and account switch key) has a small JSON state file
+    under the cache directory, updated under an exclusive ``flock``.
+    Callers reserve a token and sleep outside the lock until it is theirs,
+    so waiting processes are served in arrival order instead of polling.
+    A 429 seen by any process pauses the key for all of them.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, directory: Optional[str] = None):
+        """Initialize limiter.
+
+        Args:
+            rate: Requests per second allowed per key across all processes
+            burst: Bucket size (default: one second worth of requests, at least 1)
+            directory: State directory (default: <cache_dir>/ratelimit)
+
+        Raises:
+            RuntimeError: If file locking is not available on this platform
+        """
+        if fcntl is None:
+            raise RuntimeError("Host-wide rate limiting requires fcntl (not available on this platform)")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        if directory is None:
+            from akamai_wrappy.cache import cache_dir
+
+            directory = os.path.join(cache_dir(), "ratelimit")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _update(self, key: str, change: Callable[[Dict[str, float], float], float]) -> float:
+        """Apply a change to a key's bucket under the file lock.
+
+        Args:
+            key: Limiter key
+            change: Function of (state, now) that mutates state and returns a value
+
+        Returns:
+            The value returned by change
+        """
+        with open(self._path(key), "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                try:
+                    state = json.loads(f.read() or "{}")
+                except ValueError:
+                    state = {}
+                now = time.time()
+                # Refill since the last update (tokens may be negative: reservations)
+                tokens = state.get("tokens", self.burst)
+                elapsed = max(0.0, now - state.get("updated", now))
+                state["tokens"] = min(self.burst, tokens + elapsed * self.rate)
+                state["updated"] = now
+                result = change(state, now)
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return result
+
+    def acquire(self, key: str) -> float:
+        """Reserve one request token for a key and wait until it is due.
+
+        Args:
+            key: Limiter key (e.g. API host and account switch key)
+
+        Returns:
+            Seconds waited
+        """
+
+        def reserve(state: Dict[str, float], now: float) -> float:
+            state["tokens"] -= 1
+            return -state["tokens"] / self.rate if state["tokens"] < 0 else 0.0
+
+        wait = self._update(key, reserve)
+        if wait > 0:
+            time.sleep(wait)
+        return max(0.0, wait)
+
+    def penalize(self, key: str, seconds: float) -> None:
+        """Pause a key for every process (after a 429).
+
+        Args:
+            key: Limiter key
+            seconds: Pause duration
+        """
+
+        def pause(state: Dict[str, float], now: float) -> float:
+            # A debt of `seconds` worth of tokens: requests reserved from now
+            # on resume after the pause, spaced at the steady rate
+            state["tokens"] = min(state["tokens"], -seconds * self.rate)
+            return 0.0
+
+        self._update(key, pause)
@@ -0,0 +1,437 @@
+"""Concurrent JSON Patch roll-outs across property rule trees.
+
+Every patched property gets a new version created from a base version;
+the patch is applied to the new version with PAPI's PATCH rules support
+(``application/json-patch+json``), so only the patch operations travel
+instead of whole rule trees. Nothing is activated: the base version of
+each result is the rollback target.
+
+For very large batches the patches can instead be submitted through the
+asynchronous bulk patch API, in chunks polled until they complete.
+"""
+
+import json
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from akamai_wrappy.activation import AdaptiveBackoff
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.models import Property
+from akamai_wrappy.ratelimit import IntervalScheduler
+from akamai_wrappy.timeouts import DeadlineExceeded
+
+JSON_PATCH_OPS = ("add", "remove", "replace", "move", "copy", "test")
+JSON_PATCH_CONTENT_TYPE = "application/json-patch+json"
+
+BASE_VERSIONS = ("latest", "staging", "production")
+
+# Properties per bulk patch request
+BULK_CHUNK_SIZE = 100
+
+# Bulk request statuses that still need polling
+_BULK_PENDING = {"PENDING", "SUBMITTED", "IN_PROGRESS"}
+
+_VERSION_LINK = re.compile(r"/versions/(\d+)")
+
+
+@dataclass
+class PatchResult:
+    """Outcome of patching one property."""
+
+    property_id: str
+    name: str
+    contract_id: str
+    group_id: str
+    base_version: Optional[int] = None
+    new_version: Optional[int] = None
+    status: str = "PENDING"
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """True if the patch was applied."""
+        return self.status == "PATCHED"
+
+    def to_record(self) -> Dict[str, Any]:
+        """Return the JSON-serializable result, including rollback information."""
+        return {
+            "propertyId": self.property_id,
+            "propertyName": self.name,
+            "contractId": self.contract_id,
+            "groupId": self.group_id,
+            "baseVersion": self.base_version,
+            "newVersion": self.new_version,
+            "status": self.status,
+            "error": self.error,
+            # New versions are never activated; activating baseVersion (or
+            # simply not activating newVersion) undoes the change
+            "rollbackVersion": self.base_version,
+        }
+
+
+def load_patch(path: str) -> List[Dict[str, Any]]:
+    """Load and check a JSON Patch document (RFC 6902).
+
+    Args:
+        path: JSON file with a list of patch operations ("-" for stdin)
+
+    Returns:
+        List of operations
+
+    Raises:
+        ValueError: If the file is not a valid JSON Patch document
+    """
+    if path == "-":
+        patch = json.load(sys.stdin)
+    else:
+        with open(path, encoding="utf-8") as f:
+            patch = json.load(f)
+
+    if not isinstance(patch, list) or not patch:
+        raise ValueError("A JSON Patch must be a non-empty list of operations")
+    for i, op in enumerate(patch):
+        if not isinstance(op, dict) or op.get("op") not in JSON_PATCH_OPS:
+            raise ValueError(f"Operation {i}: op must be one of {', '.join(JSON_PATCH_OPS)}")
+        if not isinstance(op.get("path"), str) or not op["path"].startswith("/"):
+            raise ValueError(f"Operation {i}: path must be a JSON pointer starting with /")
+        if op["op"] in ("add", "replace", "test") and "value" not in op:
+            raise ValueError(f"Operation {i}: {op['op']} requires a value")
+        if op["op"] in ("move", "copy") and not isinstance(op.get("from"), str):
+            raise ValueError(f"Operation {i}: {op['op']} requires from")
+    return patch
+
+
+def base_version(prop: Property, base: str = "latest") -> Optional[int]:
+    """Return the version a new version is created from.
+
+    Args:
+        prop: Listed property
+        base: latest, staging or production (falls back to latest when the
+            property is not active on that network)
+    """
+    if base == "production":
+        return prop.production_version or prop.latest_version
+    if base == "staging":
+        return prop.staging_version or prop.latest_version
+    return prop.latest_version
+
+
+def print_patch_change(result: PatchResult) -> None:
+    """Default callback printing one line per finished property to stderr."""
+    if result.ok:
+        print(f"✓ {result.name} v{result.base_version} -> v{result.new_version}", file=sys.stderr)
+    else:
+        print(f"✗ {result.name}: {result.error}", file=sys.stderr)
+
+
+def _error_text(response: Any) -> str:
+    if isinstance(response, dict):
+        return str(response.get("error", response))
+    return str(response)
+
+
+def _rule_errors(response: Any) -> Optional[str]:
+    """Return a summary of rule validation errors in a rules response."""
+    errors = response.get("errors") if isinstance(response, dict) else None
+    if not errors:
+        return None
+    first = errors[0]
+    if isinstance(first, dict):
+        detail = first.get("detail") or first.get("title") or first.get("type")
+    else:
+        detail = first
+    more = f" (+{len(errors) - 1} more)" if len(errors) > 1 else ""
+    return f"rule validation: {detail}{more}"
+
+
+def create_version(akm_api: Akamai, result: PatchResult) -> bool:
+    """Create a new property version from ``result.base_version``.
+
+    Returns:
+        True if the version was created (``result.new_version`` is set)
+    """
+    response = akm_api.post(
+        f"/papi/v1/properties/{result.property_id}/versions",
+        data={"createFromVersion": result.base_version},
+        params={"contractId": result.contract_id, "groupId": result.group_id},
+    )
+    if isinstance(response, dict) and "error" in response:
+        result.status = "VERSION_FAILED"
+        result.error = _error_text(response)
+        return False
+
+    match = _VERSION_LINK.search(response.get("versionLink", ""))
+    if not match:
+        result.status = "VERSION_FAILED"
+        result.error = f"Unexpected version response: {response}"
+        return False
+    result.new_version = int(match.group(1))
+    return True
+
+
+def patch_property(
+    akm_api: Akamai,
+    result: PatchResult,
+    patch: List[Dict[str, Any]],
+    validate: bool = True,
+) -> PatchResult:
+    """Create a new version of one property and apply a JSON Patch to it.
+
+    If the patch fails, the new version stays behind as an unused draft
+    (PAPI versions cannot be deleted) and the result keeps its number.
+
+    Args:
+        akm_api: Akamai API client
+        result: Result holding the property and its base version
+        patch: JSON Patch operations
+        validate: Ask PAPI to validate the patched rule tree
+
+    Returns:
+        The updated result
+    """
+    try:
+        if not create_version(akm_api, result):
+            return result
+
+        response = akm_api.patch(
+            f"/papi/v1/properties/{result.property_id}/versions/{result.new_version}/rules",
+            data=patch,
+            params={
+                "contractId": result.contract_id,
+                "groupId": result.group_id,
+                "validateRules": "true" if validate else "false",
+            },
+            headers={"Content-Type": JSON_PATCH_CONTENT_TYPE},
+        )
+        if isinstance(response, dict) and "error" in response:
+            result.status = "PATCH_FAILED"
+            result.error = _error_text(response)
+            return result
+
+        invalid = _rule_errors(response) if validate else None
+        if invalid:
+            result.status = "INVALID"
+            result.error = invalid
+        else:
+            result.status = "PATCHED"
+    except Exception as e:
+        result.status = "PATCH_FAILED"
+        result.error = str(e)
+    return result
+
+
+def plan_patches(properties: Iterable[Property], base: str = "latest") -> List[PatchResult]:
+    """Turn selected properties into pending results with their base versions."""
+    results = []
+    for prop in properties:
+        result = PatchResult(
+            property_id=prop.property_id,
+            name=prop.property_name,
+            contract_id=prop.contract_id,
+            group_id=prop.group_id,
+            base_version=base_version(prop, base),
+        )
+        if not result.base_version:
+            result.status = "SKIPPED"
+            result.error = "no version to patch"
+        results.append(result)
+    return results
+
+
+def patch_properties(
+    akm_api: Akamai,
+    results: List[PatchResult],
+    patch: List[Dict[str, Any]],
+    max_workers: int = 4,
+    delay: float = 0,
+    validate: bool = True,
+    on_change: Callable[[PatchResult], None] = print_patch_change,
+) -> List[PatchResult]:
+    """Patch many properties concurrently.
+
+    At most ``max_workers`` properties are in flight, and property starts
+    are spaced ``delay`` seconds apart across all workers.
+
+    Args:
+        akm_api: Akamai API client
+        results: Pending results from plan_patches
+        patch: JSON Patch operations
+        max_workers: Maximum properties patched at once
+        delay: Minimum seconds between the start of two properties
+        validate: Ask PAPI to validate each patched rule tree
+        on_change: Callback invoked with each finished result
+
+    Returns:
+        The results
+    """
+    scheduler = IntervalScheduler(delay, akm_api.deadline)
+
+    def _patch(result: PatchResult) -> None:
+        try:
+            scheduler.wait()
+        except DeadlineExceeded as e:
+            # Not started: no version was created
+            result.status = "SKIPPED"
+            result.error = str(e)
+        else:
+            patch_property(akm_api, result, patch, validate)
+        on_change(result)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        list(executor.map(_patch, [r for r in results if r.status == "PENDING"]))
+
+    return results
+
+
+def _version_etag(akm_api: Akamai, result: PatchResult) -> Optional[str]:
+    """Fetch the etag of a result's new version."""
+    response = akm_api.get(
+        f"/papi/v1/properties/{result.property_id}/versions/{result.new_version}",
+        params={"contractId": result.contract_id, "groupId": result.group_id},
+    )
+    if isinstance(response, dict) and "error" in response:
+        result.status = "VERSION_FAILED"
+        result.error = _error_text(response)
+        return None
+    items = response.get("versions", {}).get("items", [])
+    return items[0].get("etag") if items else None
+
+
+def bulk_patch_properties(
+    akm_api: Akamai,
+    results: List[PatchResult],
+    patch: List[Dict[str, Any]],
+    max_workers: int = 4,
+    chunk_size: int = BULK_CHUNK_SIZE,
+    backoff: Optional[AdaptiveBackoff] = None,
+    max_wait: float = 3600,
+    scheduler: Optional[IntervalScheduler] = None,
+    on_change: Callable[[PatchResult], None] = print_patch_change,
+) -> List[PatchResult]:
+    """Patch many properties through PAPI's asynchronous bulk patch API.
+
+    New versions are created concurrently first; their patches are then
+    submitted ``chunk_size`` properties per bulk request, and all bulk
+    requests are polled together until they finish. Results still
+    submitted when polling gives up are marked ``TIMED_OUT``.
+
+    Args:
+        akm_api: Akamai API client
+        results: Pending results from plan_patches
+        patch: JSON Patch operations
+        max_workers: Maximum concurrent version creations
+        chunk_size: Properties per bulk patch request
+        backoff: Polling interval policy (default: AdaptiveBackoff())
+        max_wait: Give up polling after this many seconds
+        scheduler: Spaces the version creations (rate limit)
+        on_change: Callback invoked with each finished result
+
+    Returns:
+        The results
+    """
+    pending = [r for r in results if r.status == "PENDING"]
+    etags: Dict[str, Optional[str]] = {}
+
+    def _prepare(result: PatchResult) -> None:
+        try:
+            if scheduler is not None:
+                scheduler.wait()
+            if create_version(akm_api, result):
+                etags[result.property_id] = _version_etag(akm_api, result)
+        except Exception as e:
+            # Keep going: the versions created so far must reach the results
+            result.status = "VERSION_FAILED"
+            result.error = str(e)
+        if result.error:
+            on_change(result)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        list(executor.map(_prepare, pending))
+
+    ready = [r for r in pending if r.status == "PENDING"]
+    by_id = {r.property_id: r for r in ready}
+    links: List[str] = []
+    for i in range(0, len(ready), chunk_size):
+        chunk = ready[i:i + chunk_size]
+        response = akm_api.post(
+            "/papi/v1/bulk/rules-patch-requests",
+            data={
+                "patchPropertyVersions": [
+                    {
+                        "propertyId": r.property_id,
+                        "propertyVersion": r.new_version,
+                        "etag": etags.get(r.property_id),
+                        "patches": patch,
+                    }
+                    for r in chunk
+                ]
+            },
+        )
+        if isinstance(response, dict) and "error" in response:
+            for r in chunk:
+                r.status = "PATCH_FAILED"
+                r.error = _error_text(response)
+                on_change(r)
+            continue
+        links.append(response.get("bulkPatchLink", ""))
+        for r in chunk:
+            r.status = "SUBMITTED"
+
+    backoff = backoff or AdaptiveBackoff()
+    deadline = time.monotonic() + max_wait
+    interval = backoff.initial
+    while links:
+        if time.monotonic() + interval > deadline:
+            print(f"Gave up waiting for {len(links)} bulk patch requests", file=sys.stderr)
+            break
+        time.sleep(interval)
+
+        changed = False
+        for link in list(links):
+            response = akm_api.get(link)
+            if isinstance(response, dict) and "error" in response:
+                # Transient poll errors are retried on the next round
+                continue
+            if response.get("bulkPatchStatus") in _BULK_PENDING:
+                continue
+            links.remove(link)
+            changed = True
+            for item in response.get("patchPropertyVersions", []):
+                result = by_id.get(item.get("propertyId"))
+                if result is None:
+                    continue
+                failure = item.get("failureCause") or item.get("failureDetail")
+                if failure or "FAIL" in str(item.get("status", "")):
+                    result.status = "PATCH_FAILED"
+                    result.error = failure or item.get("status")
+                else:
+                    result.status = "PATCHED"
+                on_change(result)
+        interval = backoff.next(changed)
+
+    for result in ready:
+        if result.status == "SUBMITTED":
+            # The bulk request may still finish; the version needs checking
+            result.status = "TIMED_OUT"
+            result.error = "bulk patch still running when polling gave up"
+            on_change(result)
+
+    return results
+
+
+def summarize(results: List[PatchResult]) -> List[Dict[str, Any]]:
+    """Return table rows describing each property's outcome."""
+    return [
+        {
+            "propertyName": r.name,
+            "propertyId": r.property_id,
+            "baseVersion": r.base_version or "",
+            "newVersion": r.new_version or "",
+            "status": r.status,
+        }
+        for r in results
+    ]
@@ -0,0 +1,215 @@
+"""Cross-property rule queries with PAPI's asynchronous bulk rules search.
+
+The server evaluates a JSONPath expression against the rule trees of all
+property versions of the account, so answering "which properties use
+behavior X" takes one job instead of exporting every rule tree at the
+rule tree export rate limit. Matches are yielded as soon as a poll
+reveals them, and completed result sets are cached per query.
+"""
+
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from akamai_wrappy.activation import AdaptiveBackoff
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.cache import JsonCache, client_scope
+from akamai_wrappy.client import ApiError
+
+DEFAULT_CACHE_TTL = 3600  # seconds
+
+VERSION_FILTERS = ("all", "latest", "production", "staging")
+
+# Search statuses after which the job no longer needs polling
+_SEARCH_DONE = {"COMPLETE", "COMPLETED"}
+_SEARCH_FAILED = {"ERROR", "FAILED", "ABORTED"}
+
+
+def search_cache_key(
+    akm_api: Akamai,
+    match: str,
+    qualifiers: Optional[List[str]] = None,
+    contract_id: Optional[str] = None,
+    group_id: Optional[str] = None,
+) -> str:
+    """Return the cache key of a query for the client's account."""
+    parts = [client_scope(akm_api), match, "&".join(qualifiers or []), contract_id or "", group_id or ""]
+    return "|".join(parts)
+
+
+def match_key(result: Dict[str, Any]) -> str:
+    """Return the identity of a search result (property and version)."""
+    return f"{result.get('propertyId')}@{result.get('propertyVersion')}"
+
+
+def wants_version(result: Dict[str, Any], versions: str = "all") -> bool:
+    """Return True if a result's version passes a VERSION_FILTERS filter."""
+    if versions == "latest":
+        return bool(result.get("isLatest"))
+    if versions == "production":
+        return result.get("productionStatus") == "ACTIVE"
+    if versions == "staging":
+        return result.get("stagingStatus") == "ACTIVE"
+    return True
+
+
+def submit_search(
+    akm_api: Akamai,
+    match: str,
+    qualifiers: Optional[List[str]] = None,
+    contract_id: Optional[str] = None,
+    group_id: Optional[str] = None,
+) -> str:
+    """Submit a bulk rules search job.
+
+    Args:
+        akm_api: Akamai API client
+        match: JSONPath expression evaluated against each rule tree
+        qualifiers: Optional JSONPath expressions a rule tree must also match
+        contract_id: Optional contract to search in
+        group_id: Optional group to search in
+
+    Returns:
+        Link of the search job
+
+    Raises:
+        ApiError: If the job could not be submitted
+    """
+    query: Dict[str, Any] = {"syntax": "JSONPATH", "match": match}
+    if qualifiers:
+        query["bulkSearchQualifiers"] = qualifiers
+    params = {}
+    if contract_id:
+        params["contractId"] = contract_id
+    if group_id:
+        params["groupId"] = group_id
+
+    response = akm_api.post(
+        "/papi/v1/bulk/rules-search-requests",
+        data={"bulkSearchQuery": query},
+        params=params,
+    )
+    if isinstance(response, dict) and "error" in response:
+        raise ApiError(f"Error submitting search: {response}", response)
+    link = response.get("bulkSearchLink")
+    if not link:
+        raise ApiError(f"Unexpected search response: {response}", response)
+    return link
+
+
+def poll_search(
+    akm_api: Akamai,
+    link: str,
+    backoff: Optional[AdaptiveBackoff] = None,
+    max_wait: float = 1800,
+    on_status: Optional[Callable[[str], None]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Poll a search job, yielding each result the first time it appears.
+
+    The polling interval resets whenever new results arrive or the status
+    changes, and grows while the job is quiet.
+
+    Args:
+        akm_api: Akamai API client
+        link: Search job link from submit_search
+        backoff: Polling interval policy (default: 2s growing to 30s)
+        max_wait: Give up after this many seconds
+        on_status: Callback invoked with each new job status
+
+    Raises:
+        ApiError: If the job fails or does not finish in time
+    """
+    backoff = backoff or AdaptiveBackoff(initial=2.0, maximum=30.0)
+    deadline = time.monotonic() + max_wait
+    interval = backoff.initial
+    seen: set = set()
+    status = None
+
+    while True:
+        response = akm_api.get(link)
+        changed = False
+        # Transient poll errors are retried on the next round
+        if not (isinstance(response, dict) and "error" in response):
+            for result in response.get("results") or []:
+                key = match_key(result)
+                if key not in seen:
+                    seen.add(key)
+                    changed = True
+                    yield result
+
+            new_status = response.get("searchTargetStatus")
+            if new_status != status:
+                status = new_status
+                changed = True
+                if on_status is not None:
+                    on_status(status)
+            if status in _SEARCH_DONE:
+                return
+            if status in _SEARCH_FAILED:
+                raise ApiError(f"Search {link} ended with status {status}", response)
+
+        interval = backoff.next(changed)
+        if time.monotonic() + interval > deadline:
+            raise ApiError(f"Gave up waiting for search {link} after {max_wait:.0f}s")
+        time.sleep(interval)
+
+
+def search_rules(
+    akm_api: Akamai,
+    match: str,
+    qualifiers: Optional[List[str]] = None,
+    contract_id: Optional[str] = None,
+    group_id: Optional[str] = None,
+    versions: str = "all",
+    use_cache: bool = True,
+    cache_ttl: float = DEFAULT_CACHE_TTL,
+    backoff: Optional[AdaptiveBackoff] = None,
+    max_wait: float = 1800,
+    on_status: Optional[Callable[[str], None]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Run a bulk rules search and yield matching property versions.
+
+    A completed result set is cached under the account and query, so
+    repeating a query within ``cache_ttl`` needs no request at all.
+
+    Args:
+        akm_api: Akamai API client
+        match: JSONPath expression evaluated against each rule tree
+        qualifiers: Optional JSONPath expressions a rule tree must also match
+        contract_id: Optional contract to search in
+        group_id: Optional group to search in
+        versions: Only yield versions passing this VERSION_FILTERS filter
+        use_cache: Read and update the local result cache
+        cache_ttl: Cache entry lifetime in seconds
+        backoff: Polling interval policy
+        max_wait: Give up polling after this many seconds
+        on_status: Callback invoked with each new job status ("CACHED" for
+            cached results)
+
+    Yields:
+        Search results (propertyId, propertyName, propertyVersion,
+        productionStatus, stagingStatus, matchLocations, ...)
+
+    Raises:
+        ApiError: If the search fails or does not finish in time
+    """
+    cache = JsonCache("search-rules", cache_ttl)
+    cache_key = search_cache_key(akm_api, match, qualifiers, contract_id, group_id)
+
+    cached = cache.get(cache_key) if use_cache else None
+    if cached is not None:
+        if on_status is not None:
+            on_status("CACHED")
+        for result in cached:
+            if wants_version(result, versions):
+                yield result
+        return
+
+    link = submit_search(akm_api, match, qualifiers, contract_id, group_id)
+    results = []
+    for result in poll_search(akm_api, link, backoff, max_wait, on_status):
+        results.append(result)
+        if wants_version(result, versions):
+            yield result
+
+    # Only complete result sets are cached (poll_search raised otherwise)
+    cache.set(cache_key, results)
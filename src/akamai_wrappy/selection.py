@@ -0,0 +1,187 @@
+"""Property selection and export ordering."""
+
+import argparse
+import fnmatch
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.models import Property
+
+ORDER_CHOICES = ("listing", "production-first", "recent-first", "name")
+
+_RELATIVE_SINCE = re.compile(r"^(\d+)([mhdw])$")
+_RELATIVE_UNITS = {"m": "minutes", "h": "hours", "d": "days", "w": "weeks"}
+
+
+def parse_since(value: str) -> datetime:
+    """Parse a "changed since" value for argparse.
+
+    Accepts an ISO 8601 date or datetime (UTC assumed if no offset) or a
+    relative age such as ``30m``, ``12h``, ``7d`` or ``2w``.
+
+    Args:
+        value: Raw argument value
+
+    Returns:
+        Timezone-aware datetime
+
+    Raises:
+        argparse.ArgumentTypeError: If the value cannot be parsed
+    """
+    match = _RELATIVE_SINCE.match(value.strip())
+    if match:
+        delta = timedelta(**{_RELATIVE_UNITS[match.group(2)]: int(match.group(1))})
+        return datetime.now(timezone.utc) - delta
+
+    parsed = parse_timestamp(value)
+    if parsed is None:
+        raise argparse.ArgumentTypeError(
+            f"invalid date '{value}' (use YYYY-MM-DD, ISO datetime or e.g. 7d)"
+        )
+    return parsed
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parse an API timestamp (e.g. ``2024-05-01T10:00:00Z``) to a datetime."""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+class PropertySelector:
+    """Filters applied to properties before any rule tree is requested.
+
+    Contract filters are pushed down into the listing (non-matching
+    contracts are never listed), name filters are applied to listing
+    entries, and the "changed since" filter uses version metadata that is
+    only fetched for properties that passed the cheaper filters.
+    """
+
+    def __init__(
+        self,
+        name_patterns: Optional[List[str]] = None,
+        name_regex: Optional[str] = None,
+        contracts: Optional[List[str]] = None,
+        changed_since: Optional[datetime] = None,
+    ):
+        """Initialize selector.
+
+        Args:
+            name_patterns: Property name globs (case-insensitive, any may match)
+            name_regex: Property name regular expression (searched, case-insensitive)
+            contracts: Contract IDs to include
+            changed_since: Only include properties whose version changed after this time
+        """
+        self.name_patterns = [p.lower() for p in name_patterns or []]
+        self.name_regex = re.compile(name_regex, re.IGNORECASE) if name_regex else None
+        self.contracts = set(contracts or [])
+        self.changed_since = changed_since
+
+    def wants_contract(self, contract_id: str) -> bool:
+        """Return True if properties of this contract should be listed."""
+        return not self.contracts or contract_id in self.contracts
+
+    def matches(self, prop: Property) -> bool:
+        """Return True if a listed property passes the name and contract filters."""
+        if not self.wants_contract(prop.contract_id or ""):
+            return False
+
+        name = prop.property_name or ""
+        if self.name_patterns and not any(
+            fnmatch.fnmatchcase(name.lower(), pattern) for pattern in self.name_patterns
+        ):
+            return False
+        if self.name_regex and not self.name_regex.search(name):
+            return False
+        return True
+
+    def describe(self) -> Dict[str, Any]:
+        """Return the selector settings as a JSON-serializable dict."""
+        return {
+            "namePatterns": self.name_patterns,
+            "nameRegex": self.name_regex.pattern if self.name_regex else None,
+            "contracts": sorted(self.contracts),
+            "changedSince": self.changed_since.isoformat() if self.changed_since else None,
+        }
+
+
+def fetch_updated_date(akm_api: Akamai, item: Dict[str, Any]) -> Optional[str]:
+    """Fetch the updatedDate of a work item's property version.
+
+    Args:
+        akm_api: Akamai API client
+        item: Work item with propertyId, version, contractId and groupId
+
+    Returns:
+        updatedDate string, or None if unavailable
+    """
+    response = akm_api.get(
+        f"/papi/v1/properties/{item['propertyId']}/versions/{item['version']}",
+        params={"contractId": item["contractId"], "groupId": item["groupId"]},
+    )
+    if isinstance(response, dict) and "error" in response:
+        print(f"Warning: {response}", file=sys.stderr)
+        return None
+
+    versions = response.get("versions", {}).get("items", [])
+    return versions[0].get("updatedDate") if versions else None
+
+
+def select_and_order(
+    akm_api: Akamai,
+    items: List[Dict[str, Any]],
+    selector: Optional[PropertySelector] = None,
+    order: str = "listing",
+    verbose: bool = False,
+) -> List[Dict[str, Any]]:
+    """Apply version-based filters and priority ordering to work items.
+
+    Version metadata (one lightweight PAPI call per item) is only fetched
+    when the "changed since" filter or ``recent-first`` order needs it.
+
+    Args:
+        akm_api: Akamai API client
+        items: Work items (see properties_download.plan_exports)
+        selector: Optional selector with a changed_since filter
+        order: One of ORDER_CHOICES
+        verbose: Enable verbose output
+
+    Returns:
+        Filtered and ordered work items
+    """
+    changed_since = selector.changed_since if selector else None
+
+    if changed_since or order == "recent-first":
+        if verbose:
+            print(f"Fetching version info for {len(items)} properties...", file=sys.stderr)
+        for item in items:
+            if "updatedDate" not in item:
+                item["updatedDate"] = fetch_updated_date(akm_api, item)
+
+    if changed_since:
+        selected = []
+        for item in items:
+            updated = parse_timestamp(item.get("updatedDate"))
+            # Keep items with unknown dates rather than silently dropping them
+            if updated is None or updated >= changed_since:
+                selected.append(item)
+        items = selected
+
+    # Python's sort is stable, so ties keep listing order
+    if order == "production-first":
+        items = sorted(items, key=lambda item: not item.get("isProduction"))
+    elif order == "recent-first":
+        items = sorted(items, key=lambda item: item.get("updatedDate") or "", reverse=True)
+    elif order == "name":
+        items = sorted(items, key=lambda item: (item.get("propertyName") or "").lower())
+
+    return items
@@ -0,0 +1,377 @@
+"""Incremental mirrors of network lists and client lists.
+
+SyncState records the version every mirrored file was written from.
+sync_lists runs one pass for any kind of list described by a ListMirror
+(listing, fetching and writing a single list), and add_sync_args and
+run_sync give the sync commands their shared options and --watch loop.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from akamai_wrappy.api import Akamai
+from akamai_wrappy.cache import client_scope
+from akamai_wrappy.client import ApiError
+from akamai_wrappy.files import atomic_write
+
+SYNC_STATE_FILENAME = ".awp-sync-state.json"
+DEFAULT_WATCH_INTERVAL = 300
+
+# Failures of one watch pass that the next pass may not hit (network,
+# timeouts and deadlines, failed listings, disk errors)
+WATCH_ERRORS = (requests.exceptions.RequestException, ApiError, OSError)
+
+
+class SyncState:
+    """Version of every mirrored item, stored as JSON in the output directory.
+
+    Entries map an item ID to a dict holding at least the ``version`` the
+    mirrored file was written from and the ``file`` name. The state is
+    rewritten atomically after every change, so an interrupted sync never
+    records a version whose file was not written.
+    """
+
+    def __init__(self, output_dir: str, kind: str, filename: str = SYNC_STATE_FILENAME):
+        """Initialize state.
+
+        Args:
+            output_dir: Mirror directory the state lives in
+            kind: Item kind stored in the state (e.g. networklists)
+            filename: State file name
+        """
+        self.path = os.path.join(output_dir, filename)
+        self.kind = kind
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.scope: Optional[str] = None
+
+    def load(self) -> None:
+        """Load the state; a missing, unreadable or foreign file starts empty."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("kind") != self.kind:
+            return
+        self.scope = data.get("scope")
+        self.items = data.get("items", {})
+
+    def save(self) -> None:
+        """Persist the state atomically."""
+        data = {"kind": self.kind, "scope": self.scope, "updated": time.time(), "items": self.items}
+        atomic_write(self.path, json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+    def version(self, item_id: str) -> Any:
+        """Return the mirrored version of an item, or None."""
+        return self.items.get(item_id, {}).get("version")
+
+    def record(self, item_id: str, version: Any, file: str, **extra: Any) -> None:
+        """Record that an item was mirrored at a version and save."""
+        self.items[item_id] = {"version": version, "file": file, **extra}
+        self.save()
+
+    def forget(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Remove an item and save; returns its old entry."""
+        entry = self.items.pop(item_id, None)
+        if entry is not None:
+            self.save()
+        return entry
+
+
+def plan_sync(
+    state: SyncState,
+    current: Dict[str, Any],
+    output_dir: str,
+    full: bool = False,
+) -> Tuple[List[str], List[str], List[str]]:
+    """Compare upstream versions with the mirror.
+
+    Args:
+        state: Loaded sync state
+        current: Upstream item ID -> version
+        output_dir: Mirror directory (items whose file is missing are refetched)
+        full: Treat every item as changed
+
+    Returns:
+        Tuple of (changed IDs, unchanged IDs, deleted IDs)
+    """
+    changed = []
+    unchanged = []
+    for item_id, version in current.items():
+        entry = state.items.get(item_id)
+        if (
+            full
+            or entry is None
+            or entry.get("version") != version
+            or not os.path.exists(os.path.join(output_dir, entry.get("file", "")))
+        ):
+            changed.append(item_id)
+        else:
+            unchanged.append(item_id)
+    deleted = [item_id for item_id in state.items if item_id not in current]
+    return changed, unchanged, deleted
+
+
+def remove_mirrored_file(output_dir: str, entry: Optional[Dict[str, Any]], keep: Optional[str] = None) -> None:
+    """Delete the file of a state entry (unless it is ``keep``)."""
+    if not entry or not entry.get("file") or entry["file"] == keep:
+        return
+    try:
+        os.remove(os.path.join(output_dir, entry["file"]))
+    except FileNotFoundError:
+        pass
+
+
+def watch(sync_once: Callable[[], Any], interval: float, max_failures: int = 0) -> bool:
+    """Run a sync repeatedly until interrupted.
+
+    Each run starts ``interval`` seconds after the previous one started
+    (immediately if a run took longer). A pass that fails with one of
+    WATCH_ERRORS is reported and the schedule continues.
+
+    Args:
+        sync_once: Function performing one sync pass
+        interval: Seconds between the start of two passes
+        max_failures: Stop after this many consecutive failed passes (0: never)
+
+    Returns:
+        False if it stopped because of max_failures, True if interrupted
+    """
+    failures = 0
+    try:
+        while True:
+            started = time.monotonic()
+            try:
+                sync_once()
+                failures = 0
+            except WATCH_ERRORS as e:
+                failures += 1
+                print(f"✗ Sync failed: {e}", file=sys.stderr)
+                if max_failures and failures >= max_failures:
+                    print(f"Stopping after {failures} consecutive failed syncs", file=sys.stderr)
+                    return False
+            delay = interval - (time.monotonic() - started)
+            if delay > 0:
+                print(f"Next sync in {delay:.0f}s (Ctrl-C to stop)", file=sys.stderr)
+                time.sleep(delay)
+    except KeyboardInterrupt:
+        print("\nStopped", file=sys.stderr)
+    return True
+
+
+class ListMirror:
+    """One kind of list kept up to date by sync_lists.
+
+    Subclasses fetch and write single lists; listings and fetched lists
+    are models with ``name`` and the attributes ``list_id`` and
+    ``version`` read.
+    """
+
+    # Sync state kind, e.g. networklists
+    kind = ""
+    # Plural used in messages, e.g. "network lists"
+    noun = "lists"
+    # Name of the version shown in messages and help, e.g. syncPoint
+    version_label = "version"
+    default_output_dir = "."
+
+    def list(self, akm_api: Akamai, verbose: bool = False) -> List[Any]:
+        """Return the metadata listing of all lists (without their entries)."""
+        raise NotImplementedError
+
+    def list_id(self, item: Any) -> str:
+        """Return the ID of a list."""
+        raise NotImplementedError
+
+    def version(self, item: Any) -> Any:
+        """Return the change-detection key stored in the sync state."""
+        raise NotImplementedError
+
+    def show_version(self, version: Any) -> Any:
+        """Return the part of a version key shown in verbose output."""
+        return version
+
+    def fetch(self, akm_api: Akamai, list_id: str) -> Any:
+        """Fetch one list with its entries; returns the model or an error dict."""
+        raise NotImplementedError
+
+    def write(self, item: Any, output_dir: str) -> str:
+        """Write a fetched list and return its file name."""
+        raise NotImplementedError
+
+    def describe(self, item: Any) -> str:
+        """Return the size summary printed after a list is written."""
+        raise NotImplementedError
+
+
+def sync_lists(
+    akm_api: Akamai,
+    mirror: ListMirror,
+    output_dir: str,
+    full: bool = False,
+    prune: bool = True,
+    verbose: bool = False,
+) -> Dict[str, int]:
+    """Bring a directory of mirrored lists up to date.
+
+    Only the metadata listing is fetched on every run; entries are fetched
+    for lists whose version differs from the sync state, or whose file is
+    missing. The state is saved after every list, so an interrupted run
+    resumes where it stopped.
+
+    Args:
+        akm_api: Akamai API client
+        mirror: Kind of list to mirror
+        output_dir: Mirror directory
+        full: Refetch every list regardless of its version
+        prune: Delete files of lists that no longer exist
+        verbose: Enable verbose output
+
+    Returns:
+        Dict with updated, unchanged, deleted and failed counts
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    counts = {"updated": 0, "unchanged": 0, "deleted": 0, "failed": 0}
+
+    state = SyncState(output_dir, mirror.kind)
+    state.load()
+    scope = client_scope(akm_api)
+    if state.scope is not None and state.scope != scope:
+        print("Sync state belongs to another account, starting over", file=sys.stderr)
+        state.items = {}
+    state.scope = scope
+
+    # Listing without entries: names and versions only
+    listing = mirror.list(akm_api, verbose=verbose)
+    if not listing:
+        print(f"No {mirror.noun} found", file=sys.stderr)
+        return counts
+    by_id = {mirror.list_id(item): item for item in listing}
+
+    changed, unchanged, deleted = plan_sync(
+        state, {list_id: mirror.version(item) for list_id, item in by_id.items()}, output_dir, full=full
+    )
+    counts["unchanged"] = len(unchanged)
+    print(
+        f"{len(listing)} {mirror.noun}: {len(changed)} changed, {len(unchanged)} unchanged",
+        file=sys.stderr,
+    )
+
+    for list_id in changed:
+        item = mirror.fetch(akm_api, list_id)
+        if isinstance(item, dict) and "error" in item:
+            print(f"✗ {by_id[list_id].name}: {item}", file=sys.stderr)
+            counts["failed"] += 1
+            continue
+
+        try:
+            filename = mirror.write(item, output_dir)
+        except OSError as e:
+            print(f"✗ Failed to write {item.name}: {e}", file=sys.stderr)
+            counts["failed"] += 1
+            continue
+
+        previous = state.version(list_id)
+        version = mirror.version(item)
+        # A renamed list gets a new file name; drop the old file
+        remove_mirrored_file(output_dir, state.items.get(list_id), keep=filename)
+        state.record(list_id, version, filename, name=item.name)
+        counts["updated"] += 1
+
+        if verbose:
+            change = (
+                "new"
+                if previous is None
+                else f"{mirror.version_label} {mirror.show_version(previous)} -> {mirror.show_version(version)}"
+            )
+            print(f"✓ {item.name} ({mirror.describe(item)}, {change})", file=sys.stderr)
+        else:
+            print(f"✓ {item.name} ({mirror.describe(item)})", file=sys.stderr)
+
+    if prune:
+        for list_id in deleted:
+            entry = state.forget(list_id)
+            remove_mirrored_file(output_dir, entry)
+            print(f"✗ Removed {entry.get('name', list_id)} (deleted upstream)", file=sys.stderr)
+            counts["deleted"] += 1
+
+    if not changed and not (prune and deleted):
+        # Keep the scope and timestamp current even when nothing changed
+        state.save()
+
+    print(
+        f"\nUpdated {counts['updated']}, unchanged {counts['unchanged']}, "
+        f"removed {counts['deleted']}, failed {counts['failed']}",
+        file=sys.stderr,
+    )
+    return counts
+
+
+def add_sync_args(parser: argparse.ArgumentParser, mirror: ListMirror) -> None:
+    """Add the options shared by the sync commands to parser."""
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=str,
+        default=mirror.default_output_dir,
+        help=f"Mirror directory (default: {mirror.default_output_dir})",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help=f"Refetch every list regardless of its {mirror.version_label}",
+    )
+    parser.add_argument(
+        "--keep-deleted",
+        action="store_true",
+        help="Keep files of lists that were deleted upstream",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep syncing every --interval seconds until interrupted",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=DEFAULT_WATCH_INTERVAL,
+        help=f"Seconds between syncs with --watch (default: {DEFAULT_WATCH_INTERVAL})",
+    )
+    parser.add_argument(
+        "--max-failures",
+        type=int,
+        default=0,
+        help="With --watch, stop after this many consecutive failed syncs (default: 0, never)",
+    )
+
+
+def run_sync(akm_api: Akamai, mirror: ListMirror, options: argparse.Namespace) -> bool:
+    """Run one sync, or keep syncing with --watch, from parsed options.
+
+    Returns:
+        False if a list failed (single sync) or --max-failures was reached
+    """
+    # --full only applies to the first pass of --watch
+    full = {"next": options.full}
+
+    def sync_once() -> Dict[str, int]:
+        counts = sync_lists(
+            akm_api,
+            mirror,
+            output_dir=options.output_dir,
+            full=full["next"],
+            prune=not options.keep_deleted,
+            verbose=options.verbose,
+        )
+        full["next"] = False
+        return counts
+
+    if options.watch:
+        return watch(sync_once, options.interval, options.max_failures)
+    return not sync_once()["failed"]
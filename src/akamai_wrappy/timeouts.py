@@ -0,0 +1,189 @@
+"""Request timeouts, command deadlines and hedged GETs.
+
+Every request gets a (connect, read) timeout pair: the connect timeout is
+short and shared, the read timeout comes from a per-endpoint table (large
+rule trees and list element downloads legitimately take longer than a
+group listing) and falls back to the client's ``timeout``.
+
+A Deadline bounds a whole command: timeouts are capped at the time left,
+sleeps between retries wake up early, and once it expires (or is
+cancelled) every further request raises DeadlineExceeded.
+
+A HedgePolicy sends a second copy of an idempotent GET when the first
+one is slower than a latency percentile observed for its endpoint, and
+uses whichever answers first (see "The Tail at Scale", Dean & Barroso).
+Hedges are capped at a fraction of all requests so they cannot double
+the load on a struggling API.
+"""
+
+import fnmatch
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+import requests
+
+DEFAULT_CONNECT_TIMEOUT = 10  # seconds
+
+# Read timeouts (seconds) by endpoint template glob; first match wins
+DEFAULT_ENDPOINT_TIMEOUTS: Dict[str, float] = {
+    "/papi/v1/properties/{id}/versions/{id}/rules": 120,
+    "/papi/v1/bulk/*": 60,
+    "/network-list/v2/network-lists/{id}": 120,
+    "/client-list/v1/lists/{id}": 120,
+    "/client-list/v1/lists/{id}/items": 120,
+}
+
+
+class DeadlineExceeded(requests.exceptions.Timeout):
+    """Raised when a command's deadline has passed or it was cancelled."""
+
+
+class Deadline:
+    """Overall time budget of a command, cancellable from any thread."""
+
+    def __init__(self, seconds: Optional[float] = None):
+        """Initialize deadline.
+
+        Args:
+            seconds: Time budget from now (None: no limit, only cancellation)
+        """
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds if seconds is not None else None
+        self._cancelled = threading.Event()
+
+    def remaining(self) -> Optional[float]:
+        """Return the seconds left (None without a limit)."""
+        if self.expires is None:
+            return None
+        return self.expires - time.monotonic()
+
+    def cancel(self) -> None:
+        """Cancel the command: sleeping and future requests stop."""
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self) -> None:
+        """Raise DeadlineExceeded if the deadline passed or was cancelled."""
+        if self._cancelled.is_set():
+            raise DeadlineExceeded("Cancelled")
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded(f"Deadline of {self.seconds:g}s exceeded")
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep, waking up early (and raising) on cancellation.
+
+        Raises right away if the sleep would outlast the deadline.
+        """
+        self.check()
+        remaining = self.remaining()
+        if remaining is not None and seconds > remaining:
+            raise DeadlineExceeded(f"Deadline of {self.seconds:g}s exceeded")
+        if self._cancelled.wait(seconds):
+            self.check()
+
+    def cap(self, timeout: Tuple[float, float]) -> Tuple[float, float]:
+        """Cap a (connect, read) timeout at the time left."""
+        self.check()
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        return (min(timeout[0], remaining), min(timeout[1], remaining))
+
+
+def endpoint_timeout(
+    endpoint: str,
+    default: float,
+    table: Optional[Dict[str, float]] = None,
+) -> float:
+    """Return the read timeout of an endpoint template.
+
+    Args:
+        endpoint: Endpoint template (see metrics.endpoint_template)
+        default: Timeout for endpoints not in the table
+        table: Endpoint glob -> seconds (default: DEFAULT_ENDPOINT_TIMEOUTS)
+    """
+    for pattern, seconds in (DEFAULT_ENDPOINT_TIMEOUTS if table is None else table).items():
+        if fnmatch.fnmatchcase(endpoint, pattern):
+            return seconds
+    return default
+
+
+def parse_endpoint_timeout(value: str) -> Tuple[str, float]:
+    """Parse a PATTERN=SECONDS command line value."""
+    pattern, sep, seconds = value.rpartition("=")
+    if not sep or not pattern:
+        raise ValueError(f"Expected PATTERN=SECONDS, got '{value}'")
+    return pattern, float(seconds)
+
+
+class HedgePolicy:
+    """When to send a hedged copy of a GET.
+
+    Latencies are tracked per endpoint over a sliding window. Once an
+    endpoint has ``min_samples`` observations, a request still running
+    after the ``percentile`` latency (at least ``min_delay``) is hedged,
+    as long as hedges stay below ``max_ratio`` of all requests.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        min_delay: float = 0.5,
+        min_samples: int = 20,
+        window: int = 200,
+        max_ratio: float = 0.1,
+    ):
+        """Initialize policy.
+
+        Args:
+            percentile: Latency percentile after which to hedge (fraction)
+            min_delay: Never hedge earlier than this many seconds
+            min_samples: Observations needed before an endpoint is hedged
+            window: Latencies kept per endpoint
+            max_ratio: Maximum hedged requests as a fraction of all requests
+        """
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.window = window
+        self.max_ratio = max_ratio
+        self.requests = 0
+        self.hedges = 0
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, endpoint: str, latency: float) -> None:
+        """Record the latency of a completed request."""
+        with self._lock:
+            samples = self._latencies.get(endpoint)
+            if samples is None:
+                samples = self._latencies[endpoint] = deque(maxlen=self.window)
+            samples.append(latency)
+
+    def delay(self, endpoint: str) -> Optional[float]:
+        """Return how long to wait before hedging, or None to not hedge.
+
+        Also counts the request towards the hedge ratio.
+        """
+        with self._lock:
+            self.requests += 1
+            samples = self._latencies.get(endpoint)
+            if samples is None or len(samples) < self.min_samples:
+                return None
+            ordered = sorted(samples)
+        index = min(len(ordered) - 1, int(self.percentile * len(ordered)))
+        return max(self.min_delay, ordered[index])
+
+    def try_hedge(self) -> bool:
+        """Claim a hedge if the ratio allows it."""
+        with self._lock:
+            if self.hedges + 1 > self.max_ratio * self.requests:
+                return False
+            self.hedges += 1
+            return True
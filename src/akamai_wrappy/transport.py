@@ -0,0 +1,278 @@
+"""Record/replay transports for offline, repeatable runs.
+
+Both classes stand in for the ``requests.Session`` used by the Akamai
+client (only the verb methods are used), so commands run unchanged on top
+of them.
+
+A cassette is a JSON Lines file: a header line followed by one line per
+interaction. Interactions store the request method, path, query (without
+``accountSwitchKey``) and body, and the response status, headers, body
+and elapsed time. The API host, authorization header and account switch
+key are never written, so cassettes can be shared.
+"""
+
+import base64
+import hashlib
+import http
+import json
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlparse
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+CASSETTE_VERSION = 1
+
+# Base URL used while replaying; never resolved because no request leaves the process
+REPLAY_BASE_URL = "https://replay.invalid"
+
+# Query parameters that identify the caller rather than the request
+_SCRUBBED_PARAMS = {"accountSwitchKey"}
+
+# Response headers not worth keeping (or identifying the caller)
+_SCRUBBED_HEADERS = {"set-cookie", "connection", "keep-alive", "transfer-encoding", "content-encoding"}
+
+InteractionKey = Tuple[str, str, str]
+
+
+class CassetteError(ValueError):
+    """Raised when a cassette file cannot be used for replay."""
+
+
+def _query(url: str, params: Optional[Dict[str, Any]]) -> str:
+    """Return a canonical query string (sorted, scrubbed) for a request."""
+    pairs = parse_qsl(urlparse(url).query, keep_blank_values=True)
+    pairs.extend((k, str(v)) for k, v in (params or {}).items() if v is not None)
+    return urlencode(sorted((k, v) for k, v in pairs if k not in _SCRUBBED_PARAMS))
+
+
+def _body_digest(kwargs: Dict[str, Any]) -> Optional[str]:
+    """Return a digest of the request body, or None if there is none."""
+    if kwargs.get("json") is not None:
+        raw = json.dumps(kwargs["json"], sort_keys=True).encode("utf-8")
+    elif kwargs.get("data") is not None:
+        raw = kwargs["data"] if isinstance(kwargs["data"], bytes) else str(kwargs["data"]).encode("utf-8")
+    else:
+        return None
+    return hashlib.sha256(raw).hexdigest()[:16]
+
+
+def _encode_body(content: bytes) -> Dict[str, str]:
+    """Store a response body as text when possible, base64 otherwise."""
+    try:
+        return {"text": content.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"base64": base64.b64encode(content).decode("ascii")}
+
+
+def _decode_body(body: Dict[str, str]) -> bytes:
+    """Inverse of _encode_body."""
+    if "base64" in body:
+        return base64.b64decode(body["base64"])
+    return body.get("text", "").encode("utf-8")
+
+
+class RecordingSession:
+    """Session wrapper that appends every interaction to a cassette."""
+
+    def __init__(self, session: requests.Session, path: str):
+        """Initialize recorder.
+
+        Args:
+            session: Authenticated session that performs the requests
+            path: Cassette file (truncated)
+        """
+        self.session = session
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "w", encoding="utf-8")
+        self._write({"type": "cassette", "version": CASSETTE_VERSION, "recorded": time.time()})
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Perform a request and record it.
+
+        Streamed responses (``stream=True``) are recorded once their body
+        has been read: the chunks are passed on as they arrive and a copy
+        is kept for the cassette.
+        """
+        start = time.monotonic()
+        response = self.session.request(method, url, **kwargs)
+
+        def record(content: bytes) -> None:
+            self._write(
+                {
+                    "type": "interaction",
+                    "method": method.upper(),
+                    "path": urlparse(url).path,
+                    "query": _query(url, kwargs.get("params")),
+                    "body": _body_digest(kwargs),
+                    "status": response.status_code,
+                    "headers": {
+                        k: v for k, v in response.headers.items() if k.lower() not in _SCRUBBED_HEADERS
+                    },
+                    "content": _encode_body(content),
+                    "elapsed": round(time.monotonic() - start, 6),
+                }
+            )
+
+        if not kwargs.get("stream"):
+            record(response.content)
+            return response
+
+        iter_content = response.iter_content
+
+        def tee(chunk_size: Optional[int] = 1, decode_unicode: bool = False) -> Iterator[Any]:
+            chunks = []
+            for chunk in iter_content(chunk_size, decode_unicode):
+                chunks.append(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+                yield chunk
+            # Only complete bodies are recorded
+            record(b"".join(chunks))
+
+        # response.content reads through iter_content too, so both paths are recorded
+        response.iter_content = tee  # type: ignore[method-assign]
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("get", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("post", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("put", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        return self.request("patch", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("delete", url, **kwargs)
+
+    def close(self) -> None:
+        """Close the cassette and the wrapped session."""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+        self.session.close()
+
+
+class ReplaySession:
+    """Session stand-in that answers requests from a cassette.
+
+    Requests are matched on method, path, query and body digest; repeated
+    identical requests get the recorded responses in order, and the last
+    one is reused once they run out (so a replayed run may make more calls
+    than the recorded one, e.g. polling). Requests with no recorded match
+    fail like a connection error.
+    """
+
+    def __init__(self, path: str, latency_scale: float = 1.0):
+        """Load a cassette.
+
+        Args:
+            path: Cassette file written by RecordingSession
+            latency_scale: Multiplier for recorded latencies (1.0 original,
+                0 for none)
+
+        Raises:
+            CassetteError: If the file is not a cassette
+        """
+        self.path = path
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._queues: Dict[InteractionKey, Deque[Dict[str, Any]]] = {}
+        self._last: Dict[InteractionKey, Dict[str, Any]] = {}
+        self._unmatched: List[str] = []
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+        except (OSError, ValueError) as e:
+            raise CassetteError(f"Cannot read cassette {path}: {e}") from e
+        if not lines or lines[0].get("type") != "cassette":
+            raise CassetteError(f"{path} is not an awp cassette")
+        if lines[0].get("version") != CASSETTE_VERSION:
+            raise CassetteError(f"Unsupported cassette version: {lines[0].get('version')}")
+
+        for record in lines[1:]:
+            key = (record["method"], record["path"], record["query"])
+            self._queues.setdefault(key, deque()).append(record)
+
+    @property
+    def unmatched(self) -> List[str]:
+        """Requests that had no recorded interaction."""
+        return list(self._unmatched)
+
+    def _next(self, key: InteractionKey, body: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Pop the next recorded interaction for a request."""
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                # Prefer a recording with the same body, else the oldest one
+                record = next((r for r in queue if r["body"] == body), queue[0])
+                queue.remove(record)
+                self._last[key] = record
+                return record
+            return self._last.get(key)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Return the recorded response for a request."""
+        method = method.upper()
+        key = (method, urlparse(url).path, _query(url, kwargs.get("params")))
+        record = self._next(key, _body_digest(kwargs))
+        if record is None:
+            description = f"{method} {key[1]}{'?' + key[2] if key[2] else ''}"
+            with self._lock:
+                self._unmatched.append(description)
+            raise requests.exceptions.ConnectionError(f"No recorded interaction for {description}")
+
+        if self.latency_scale > 0 and record.get("elapsed"):
+            time.sleep(record["elapsed"] * self.latency_scale)
+
+        response = requests.Response()
+        response.status_code = record["status"]
+        response.headers = CaseInsensitiveDict(record.get("headers", {}))
+        response._content = _decode_body(record.get("content", {}))
+        # Served from memory: iter_content slices _content instead of reading raw
+        response._content_consumed = True
+        response.encoding = "utf-8"
+        response.url = url
+        try:
+            response.reason = http.HTTPStatus(record["status"]).phrase
+        except ValueError:
+            response.reason = ""
+        response.request = requests.Request(
+            method,
+            url,
+            params=kwargs.get("params"),
+            json=kwargs.get("json"),
+            data=kwargs.get("data"),
+            headers=kwargs.get("headers"),
+        ).prepare()
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("get", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("post", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("put", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        return self.request("patch", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("delete", url, **kwargs)
+
+    def close(self) -> None:
+        """Nothing to release; present for Session compatibility."""
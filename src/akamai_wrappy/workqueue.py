@@ -0,0 +1,269 @@
+"""Durable SQLite work queue with leases and a shared rate budget.
+
+A coordinator enqueues tasks once; any number of worker processes (on one
+host, or on several hosts sharing the database file) lease tasks, process
+them and acknowledge them. A lease expires if its worker stops renewing
+it (crash, kill, lost host), and the task becomes available again.
+
+Workers also share a rate budget stored in the same database: every
+request slot is claimed in a transaction, so all workers together stay
+within one interval per budget no matter how many are running.
+
+Uses SQLite's default rollback journal (not WAL) so the file can live on
+a shared filesystem with working POSIX locks.
+"""
+
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_LEASE_SECONDS = 600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state, id);
+CREATE TABLE IF NOT EXISTS budgets (
+    name TEXT PRIMARY KEY,
+    next_slot REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+TASK_STATES = ("pending", "leased", "done", "failed")
+
+
+class Task:
+    """A leased task."""
+
+    __slots__ = ("id", "key", "payload", "attempts")
+
+    def __init__(self, id: int, key: str, payload: Dict[str, Any], attempts: int):
+        self.id = id
+        self.key = key
+        self.payload = payload
+        self.attempts = attempts
+
+    def __repr__(self) -> str:
+        return f"Task({self.id}, {self.key!r})"
+
+
+class WorkQueue:
+    """Task queue stored in a SQLite database file."""
+
+    def __init__(self, path: str, lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        """Open (and create if needed) a queue.
+
+        Args:
+            path: Database file path
+            lease_seconds: How long a lease lasts without renewal
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        conn = self._connect()
+        try:
+            conn.executescript(_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection in autocommit mode (transactions are explicit).
+
+        A connection per operation keeps the queue usable from several
+        threads (e.g. a lease keeper) without sharing connections.
+        """
+        return sqlite3.connect(self.path, timeout=60, isolation_level=None)
+
+    def set_meta(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable queue setting."""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value))
+            )
+        finally:
+            conn.close()
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        """Return a queue setting."""
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else default
+
+    def enqueue(self, tasks: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """Add tasks; tasks whose key is already queued are ignored.
+
+        Args:
+            tasks: (key, payload) pairs
+
+        Returns:
+            Number of tasks added
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO tasks (key, payload, updated) VALUES (?, ?, ?)",
+                [(key, json.dumps(payload), now) for key, payload in tasks],
+            )
+            added = conn.total_changes - before
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return added
+
+    def lease(self, owner: str) -> Optional[Task]:
+        """Lease the oldest available task.
+
+        Pending tasks and tasks whose lease expired are available.
+
+        Args:
+            owner: Worker identifier
+
+        Returns:
+            Leased Task, or None if nothing is available
+        """
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT id, key, payload, attempts FROM tasks "
+                "WHERE state = 'pending' OR (state = 'leased' AND lease_expires < ?) "
+                "ORDER BY id LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE tasks SET state = 'leased', owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated = ? WHERE id = ?",
+                (owner, now + self.lease_seconds, now, row[0]),
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return Task(row[0], row[1], json.loads(row[2]), row[3] + 1)
+
+    def renew(self, task: Task, owner: str) -> bool:
+        """Extend a lease; returns False if the lease was lost."""
+        return self._update_owned(
+            task,
+            owner,
+            "lease_expires = ?",
+            (time.time() + self.lease_seconds,),
+        )
+
+    def ack(self, task: Task, owner: str, result: Any = None) -> bool:
+        """Mark a leased task done; returns False if the lease was lost."""
+        return self._update_owned(
+            task, owner, "state = 'done', result = ?, error = NULL", (json.dumps(result),)
+        )
+
+    def fail(self, task: Task, owner: str, error: str, max_attempts: int = 3) -> bool:
+        """Return a task to the queue, or mark it failed after max_attempts.
+
+        Returns:
+            False if the lease was lost
+        """
+        state = "failed" if task.attempts >= max_attempts else "pending"
+        return self._update_owned(task, owner, "state = ?, error = ?", (state, error))
+
+    def _update_owned(self, task: Task, owner: str, assignments: str, values: Tuple) -> bool:
+        """Update a task only while the caller still holds its lease."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"UPDATE tasks SET {assignments}, updated = ? "
+                "WHERE id = ? AND owner = ? AND state = 'leased'",
+                values + (time.time(), task.id, owner),
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def retry_failed(self) -> int:
+        """Move failed tasks back to pending with a fresh attempt count."""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                "UPDATE tasks SET state = 'pending', attempts = 0, updated = ? WHERE state = 'failed'",
+                (time.time(),),
+            )
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of tasks in each state (expired leases count as pending)."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT CASE WHEN state = 'leased' AND lease_expires < ? THEN 'pending' "
+                "ELSE state END, COUNT(*) FROM tasks GROUP BY 1",
+                (time.time(),),
+            ).fetchall()
+        finally:
+            conn.close()
+        counts = {state: 0 for state in TASK_STATES}
+        counts.update(dict(rows))
+        return counts
+
+    def failures(self, limit: int = 20) -> List[Tuple[str, str]]:
+        """Return (key, error) of failed tasks."""
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT key, error FROM tasks WHERE state = 'failed' ORDER BY id LIMIT ?", (limit,)
+            ).fetchall()
+        finally:
+            conn.close()
+
+    def claim_slot(self, budget: str, interval: float) -> float:
+        """Claim the next request slot of a shared rate budget.
+
+        Slots are handed out ``interval`` seconds apart across all
+        processes using the queue (wall-clock time, so hosts sharing the
+        database need roughly synchronized clocks).
+
+        Args:
+            budget: Budget name (e.g. one per account)
+            interval: Minimum seconds between two slots
+
+        Returns:
+            Seconds until the claimed slot starts (0 if it starts now)
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute("SELECT next_slot FROM budgets WHERE name = ?", (budget,)).fetchone()
+            start = max(now, row[0]) if row else now
+            conn.execute(
+                "INSERT OR REPLACE INTO budgets (name, next_slot) VALUES (?, ?)",
+                (budget, start + interval),
+            )
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return start - now